@@ -0,0 +1,9 @@
+"""Micro-benchmarks for pplx-sdk hot paths.
+
+Each ``bench_*`` module can be run on its own, e.g.::
+
+    python -m benchmarks.bench_sse_parser
+
+or all of them with ``python -m benchmarks``, which saves the results as
+JSON and can compare them with an earlier run (see benchmarks/__main__.py).
+"""
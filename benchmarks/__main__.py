@@ -0,0 +1,85 @@
+"""Run the benchmark suite and save the results as JSON.
+
+Usage::
+
+    python -m benchmarks                                 # every suite
+    python -m benchmarks sse_parser server               # selected suites
+    python -m benchmarks --output results/HEAD.json
+    python -m benchmarks --compare results/main.json --threshold 0.15
+
+``--compare`` prints the change of every case against an earlier results
+file, in rate for throughput cases and in seconds for latency cases, and
+exits with status 1 if any case slowed down by more than ``--threshold``.
+Suites whose optional dependencies are missing (``h2`` for http2, the
+``api`` extra for cassette, server and middleware) are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.harness import BenchResult, compare, save_results
+
+# Suite name -> module, from the parsing layer up to the server
+SUITES = {
+    "sse_parser": "benchmarks.bench_sse_parser",
+    "stream_chunk": "benchmarks.bench_stream_chunk",
+    "json_codec": "benchmarks.bench_json_codec",
+    "cassette": "benchmarks.bench_cassette",
+    "http2": "benchmarks.bench_http2",
+    "server": "benchmarks.bench_server",
+    "middleware": "benchmarks.bench_middleware",
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the selected suites.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Process exit status
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("suites", nargs="*", metavar="suite", help=", ".join(SUITES))
+    parser.add_argument("--output", default="benchmark-results.json", help="results file")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="regression threshold")
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - SUITES.keys()
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    results: dict[str, list[BenchResult]] = {}
+    for name in args.suites or SUITES:
+        try:
+            module = importlib.import_module(SUITES[name])
+        except ImportError as exc:
+            print(f"\nSkipping {name}: {exc}")
+            continue
+        results[name] = module.run()
+
+    document = save_results(args.output, results)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(baseline, document, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""End-to-end answer paths replayed offline from a cassette.
+
+Replays one recorded answer stream (pplx_sdk.testing.cassette) as fast as
+possible through:
+
+- ``SSETransport.stream``: decoding and chunk construction
+- ``EntriesService.ask``: the above plus Entry assembly
+- the OAI server's streaming ``/v1/chat/completions`` path, in process
+  through ``httpx.ASGITransport``
+
+Set ``PPLX_CASSETTE`` to a recorded cassette file to replay a real answer;
+otherwise a synthetic one with ``EVENTS`` answer chunks is used.
+
+Run with::
+
+    python -m benchmarks.bench_cassette
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+import httpx
+
+from benchmarks.harness import BenchResult, measure, report
+from pplx_sdk import AsyncPerplexityClient, PerplexityClient
+from pplx_sdk.api import oai_server
+from pplx_sdk.testing.cassette import Cassette, CassettePlayer, Interaction
+
+EVENTS = 2000
+NETWORK_CHUNK = 4096
+TOKEN = "bench"  # the cassette ignores credentials
+
+
+def synthetic_cassette(events: int = EVENTS) -> Cassette:
+    """Build a cassette holding one answer stream.
+
+    Args:
+        events: Number of answer_chunk events
+
+    Returns:
+        Cassette with a single ``POST /rest/sse/perplexity.ask``
+
+    """
+    frames = [
+        f"event: answer_chunk\ndata: {json.dumps({'text': f'token {i} ', 'cursor': f'c-{i}'})}\n\n"
+        for i in range(events)
+    ]
+    frames.append(
+        'event: final_response\ndata: {"backend_uuid": "b-1", '
+        '"blocks": [{"type": "text", "content": "done"}]}\n\n: [end]\n\n'
+    )
+    body = "".join(frames).encode()
+    chunks = [(0.0, body[i : i + NETWORK_CHUNK]) for i in range(0, len(body), NETWORK_CHUNK)]
+    return Cassette(
+        [
+            Interaction(
+                method="POST",
+                url="https://www.perplexity.ai/rest/sse/perplexity.ask",
+                status_code=200,
+                headers=[("content-type", "text/event-stream")],
+                chunks=chunks,
+            )
+        ]
+    )
+
+
+def load_cassette() -> Cassette:
+    """Load ``PPLX_CASSETTE`` if set, else build the synthetic cassette."""
+    path = os.getenv("PPLX_CASSETTE")
+    return Cassette.load(path) if path else synthetic_cassette()
+
+
+def count_events(cassette: Cassette) -> int:
+    """Count the SSE events in the first interaction."""
+    return cassette.interactions[0].body.count(b"\n\n")
+
+
+def run() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    cassette = load_cassette()
+    events = count_events(cassette)
+    player = CassettePlayer(cassette, loop=True)
+
+    http = httpx.Client(transport=httpx.MockTransport(player))
+    client = PerplexityClient(auth_token=TOKEN, http_client=http)
+    transport = client._sse_transport
+
+    def stream() -> int:
+        return sum(1 for _ in transport.stream("q", "ctx", "f"))
+
+    def ask() -> object:
+        return client.entries.ask("q", context_uuid="ctx")
+
+    loop = asyncio.new_event_loop()
+    async_http = httpx.AsyncClient(transport=httpx.MockTransport(player))
+    oai_server._client = AsyncPerplexityClient(auth_token=TOKEN, http_client=async_http)
+    app = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=oai_server.app), base_url="http://bench"
+    )
+    request = {
+        "model": "pplx-70b-chat",
+        "messages": [{"role": "user", "content": "q"}],
+        "stream": True,
+    }
+
+    async def oai_stream() -> int:
+        async with app.stream("POST", "/v1/chat/completions", json=request) as response:
+            return sum([1 async for _ in response.aiter_bytes()])
+
+    results = [
+        measure("SSETransport.stream", stream, events),
+        measure("EntriesService.ask", ask, events),
+        measure("OAI server stream", lambda: loop.run_until_complete(oai_stream()), events),
+    ]
+    report(f"Cassette replay, {events} events per answer", results)
+
+    loop.run_until_complete(app.aclose())
+    loop.run_until_complete(async_http.aclose())
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+    http.close()
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,123 @@
+"""Concurrent SSE streams over HTTP/1.1 vs one multiplexed HTTP/2 pool.
+
+Runs ``STREAMS`` concurrent ``AsyncConversation.ask_stream`` calls against
+the local stand-in server (benchmarks/h2_standin.py) and reports wall time
+and the number of TCP connections the server accepted:
+
+- one AsyncPerplexityClient per stream (a connection each)
+- AsyncPerplexityClients sharing one HTTP/1.1 ``httpx.AsyncClient``
+- AsyncPerplexityClients sharing one HTTP/2 ``httpx.AsyncClient``
+
+Requires the ``http2`` extra. Local connections skip the TCP/TLS handshake
+round trips a real deployment pays per connection, so the connection count
+is the figure that carries over.
+
+Run with::
+
+    python -m benchmarks.bench_http2
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from benchmarks.h2_standin import StandinServer
+from benchmarks.harness import BenchResult, report
+from pplx_sdk import AsyncPerplexityClient
+
+STREAMS = 100
+EVENTS = 20
+INTERVAL = 0.005
+ROUNDS = 3
+TOKEN = "bench"  # the stand-in ignores credentials
+
+
+def build_events(events: int = EVENTS) -> list[bytes]:
+    """Build the SSE frames of one answer."""
+    frames = [
+        f"event: answer_chunk\ndata: {json.dumps({'text': f'token {i} '})}\n\n".encode()
+        for i in range(events)
+    ]
+    frames.append(b'event: final_response\ndata: {"backend_uuid": "b-1"}\n\n: [end]\n\n')
+    return frames
+
+
+async def consume(client: AsyncPerplexityClient) -> int:
+    """Stream one answer and count its chunks."""
+    conv = client.new_conversation()
+    return sum([1 async for _ in conv.ask_stream("hi")])
+
+
+async def separate_clients(base: str) -> None:
+    """One client, and so one connection pool, per stream."""
+    clients = [AsyncPerplexityClient(api_base=base, auth_token=TOKEN) for _ in range(STREAMS)]
+    try:
+        await asyncio.gather(*(consume(client) for client in clients))
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+
+def shared_pool(http2: bool) -> Callable[[str], Awaitable[None]]:
+    """Clients sharing one injected httpx.AsyncClient."""
+
+    async def run(base: str) -> None:
+        limits = httpx.Limits(max_connections=STREAMS)
+        # Plain-text HTTP/2 needs prior knowledge, hence http1=False
+        async with httpx.AsyncClient(http1=not http2, http2=http2, limits=limits) as shared:
+            clients = [
+                AsyncPerplexityClient(api_base=base, auth_token=f"{TOKEN}-{i}", http_client=shared)
+                for i in range(STREAMS)
+            ]
+            await asyncio.gather(*(consume(client) for client in clients))
+
+    return run
+
+
+async def measure_case(
+    name: str, case: Callable[[str], Awaitable[None]], events: list[bytes]
+) -> tuple[BenchResult, int]:
+    """Run a case ``ROUNDS`` times, each against a fresh server."""
+    best = float("inf")
+    connections = 0
+    for _ in range(ROUNDS):
+        server = StandinServer(events, interval=INTERVAL)
+        port = await server.start()
+        start = time.perf_counter()
+        await case(f"http://127.0.0.1:{port}")
+        best = min(best, time.perf_counter() - start)
+        connections = server.connections
+        await server.stop()
+    return BenchResult(name=name, ops=STREAMS, seconds=best, unit="streams"), connections
+
+
+async def main() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    events = build_events()
+    cases = [
+        ("client per stream (HTTP/1.1)", separate_clients),
+        ("shared pool, HTTP/1.1", shared_pool(http2=False)),
+        ("shared pool, HTTP/2", shared_pool(http2=True)),
+    ]
+
+    results = []
+    for name, case in cases:
+        result, connections = await measure_case(name, case, events)
+        result.name = f"{name} [{connections} conn]"
+        results.append(result)
+
+    report(f"{STREAMS} concurrent streams, {EVENTS} events at {INTERVAL * 1000:.0f} ms", results)
+    return results
+
+
+def run() -> list[BenchResult]:
+    """Entry point used by the benchmark runner."""
+    return asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
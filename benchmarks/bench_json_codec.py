@@ -0,0 +1,148 @@
+"""JSON codec throughput for each installed backend.
+
+Measures the two JSON hot paths: decoding upstream SSE event payloads and
+encoding outgoing ``chat.completion.chunk`` frames. The pydantic
+``model_dump_json()`` path that the server used before the codec layer is
+included as the encoding baseline, next to the per-chunk dict encoding and
+the server's pre-rendered chunk templates (only the delta text is encoded;
+skipped without the ``api`` extra).
+
+Run with::
+
+    python -m benchmarks.bench_json_codec
+"""
+
+from __future__ import annotations
+
+import json
+
+from benchmarks.harness import BenchResult, measure, report
+from pplx_sdk.api.oai_models import (
+    ChatCompletionChunk,
+    ChatCompletionChunkChoice,
+    ChatCompletionChunkDelta,
+)
+from pplx_sdk.shared import codec as server_codec
+from pplx_sdk.shared.codec import available_backends, load_codec
+
+try:
+    from pplx_sdk.api.oai_server import _ChunkEncoder
+except ImportError:  # the api extra is not installed
+    _ChunkEncoder = None  # type: ignore[assignment,misc]
+
+EVENTS = 2000
+
+
+def build_payloads(events: int = EVENTS) -> list[bytes]:
+    """Build representative answer_chunk event payloads.
+
+    Args:
+        events: Number of payloads
+
+    Returns:
+        Raw JSON payloads as they come out of SSEDecoder
+
+    """
+    return [
+        json.dumps(
+            {
+                "text": f"token {i} ",
+                "backend_uuid": "3f2a9c1e-7b4d-4e8a-9f61-2c5d8e0b1a47",
+                "context_uuid": "8d1e6b2a-0c3f-4a9e-b7d5-1f4c2e9a6b30",
+                "cursor": f"c-{i}",
+                "status": "PENDING",
+            }
+        ).encode()
+        for i in range(events)
+    ]
+
+
+def chunk_dict(i: int) -> dict:
+    """Build the dict form of one outgoing chat.completion.chunk."""
+    return {
+        "id": "chatcmpl-1700000000",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "pplx-70b-chat",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"role": None, "content": f"token {i} "},
+                "finish_reason": None,
+            }
+        ],
+    }
+
+
+def pydantic_chunk(i: int) -> bytes:
+    """Encode one chunk the pre-codec way."""
+    return (
+        ChatCompletionChunk(
+            id="chatcmpl-1700000000",
+            created=1700000000,
+            model="pplx-70b-chat",
+            choices=[
+                ChatCompletionChunkChoice(
+                    index=0,
+                    delta=ChatCompletionChunkDelta(content=f"token {i} "),
+                    finish_reason=None,
+                )
+            ],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def run() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    payloads = build_payloads()
+    codecs = [load_codec(name) for name in available_backends()]
+
+    decode_results = [
+        measure("json.loads (stdlib, before)", lambda: [json.loads(p) for p in payloads], EVENTS)
+    ]
+    for codec in codecs:
+        loads = codec.loads
+        decode_results.append(
+            measure(f"{codec.name}.loads", lambda loads=loads: [loads(p) for p in payloads], EVENTS)
+        )
+    report("Decode SSE event payloads", decode_results)
+
+    encode_results = [
+        measure(
+            "ChatCompletionChunk.model_dump_json",
+            lambda: [pydantic_chunk(i) for i in range(EVENTS)],
+            EVENTS,
+            unit="chunks",
+        )
+    ]
+    for codec in codecs:
+        dumps = codec.dumps
+        encode_results.append(
+            measure(
+                f"chunk dict + {codec.name}.dumps",
+                lambda dumps=dumps: [dumps(chunk_dict(i)) for i in range(EVENTS)],
+                EVENTS,
+                unit="chunks",
+            )
+        )
+    for codec in codecs if _ChunkEncoder is not None else []:
+        # The encoder uses the module-level codec, as the server does
+        server_codec.dumps = codec.dumps
+        content = _ChunkEncoder("chatcmpl-1700000000", 1700000000, "pplx-70b-chat").content
+        encode_results.append(
+            measure(
+                f"chunk template + {codec.name}.dumps",
+                lambda content=content: [content(f"token {i} ") for i in range(EVENTS)],
+                EVENTS,
+                unit="chunks",
+            )
+        )
+    server_codec.dumps = server_codec.default_codec.dumps
+    report("Encode chat.completion.chunk frames", encode_results)
+    return decode_results + encode_results
+
+
+if __name__ == "__main__":
+    run()
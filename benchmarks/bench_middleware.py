@@ -0,0 +1,120 @@
+"""Streaming ``/v1/chat/completions`` behind the API middleware.
+
+Serves the OAI server in process through ``httpx.ASGITransport``, with the
+upstream answer replayed from a synthetic cassette, and compares streaming
+requests/sec:
+
+- without middleware
+- behind the former BaseHTTPMiddleware LoggingMiddleware (kept here as the
+  baseline)
+- behind the pure ASGI LoggingMiddleware and AuthMiddleware
+
+Log records are created but dropped by a NullHandler, so the cases measure
+middleware and record overhead rather than terminal output. Requires the
+``api`` extra.
+
+Run with::
+
+    python -m benchmarks.bench_middleware
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from benchmarks.bench_cassette import synthetic_cassette
+from benchmarks.harness import BenchResult, measure, report
+from pplx_sdk import AsyncPerplexityClient
+from pplx_sdk.api import oai_server
+from pplx_sdk.api.middleware import AuthMiddleware, LoggingMiddleware, logger
+from pplx_sdk.testing.cassette import CassettePlayer
+
+EVENTS = 50
+CONCURRENCY = 16
+TOKEN = "bench"  # the cassette ignores credentials
+
+REQUEST = {
+    "model": "pplx-70b-chat",
+    "messages": [{"role": "user", "content": "q"}],
+    "stream": True,
+}
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """LoggingMiddleware as it was before the pure ASGI rewrite."""
+
+    async def dispatch(
+        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        """Log the request and the response headers."""
+        start_time = time.time()
+        logger.info(f"Request: {request.method} {request.url.path}")
+        response = await call_next(request)
+        duration = time.time() - start_time
+        logger.info(
+            f"Response: {request.method} {request.url.path} - "
+            f"Status {response.status_code} - Duration {duration:.3f}s"
+        )
+        return response
+
+
+def run() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    player = CassettePlayer(synthetic_cassette(EVENTS), loop=True)
+    upstream = httpx.AsyncClient(transport=httpx.MockTransport(player))
+    oai_server._client = AsyncPerplexityClient(auth_token=TOKEN, http_client=upstream)
+
+    handlers, propagate = logger.handlers, logger.propagate
+    logger.handlers, logger.propagate = [logging.NullHandler()], False
+    # Importing the middleware sets up INFO logging, which httpx would use too
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    loop = asyncio.new_event_loop()
+    apps: dict[str, ASGIApp] = {
+        "no middleware": oai_server.app,
+        "BaseHTTPMiddleware logging (before)": BaseHTTPLoggingMiddleware(oai_server.app),
+        "ASGI logging + auth (after)": LoggingMiddleware(AuthMiddleware(oai_server.app)),
+    }
+
+    results = []
+    for name, app in apps.items():
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+        async def one(http: httpx.AsyncClient = http) -> None:
+            async with http.stream("POST", "/v1/chat/completions", json=REQUEST) as response:
+                async for _ in response.aiter_bytes():
+                    pass
+
+        async def batch() -> None:
+            await asyncio.gather(*(one() for _ in range(CONCURRENCY)))
+
+        results.append(
+            measure(name, lambda: loop.run_until_complete(batch()), CONCURRENCY, unit="requests")
+        )
+        loop.run_until_complete(http.aclose())
+
+    report(
+        f"Streaming /v1/chat/completions behind middleware, {CONCURRENCY} concurrent, "
+        f"{EVENTS} events per answer",
+        results,
+    )
+
+    logger.handlers, logger.propagate = handlers, propagate
+    loop.run_until_complete(upstream.aclose())
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+    oai_server._client = None
+    return results
+
+
+if __name__ == "__main__":
+    run()
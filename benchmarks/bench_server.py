@@ -0,0 +1,171 @@
+"""End-to-end ``/v1/chat/completions`` against the local stand-in.
+
+Serves the OAI server with uvicorn on localhost, pointed at a
+pplx_sdk.testing StandinServer, and drives it with ``CONCURRENCY``
+concurrent clients over real sockets:
+
+- requests/sec of non-streaming completions
+- requests/sec of streaming completions, read to ``[DONE]``
+- time to first token of streaming completions (first frame with
+  content), with p50/p95/p99 in milliseconds
+
+The stand-in answers without delay, so the figures are the overhead of
+the SDK and server, not of a simulated upstream. Requires the ``api``
+extra.
+
+Run with::
+
+    python -m benchmarks.bench_server
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import httpx
+import uvicorn
+
+from benchmarks.harness import BenchResult, percentile, report
+from pplx_sdk.api import oai_server
+from pplx_sdk.testing import StandinConfig, StandinServer
+
+REQUESTS = 200
+CONCURRENCY = 16
+EVENTS = 50
+CHUNK_SIZE = 16
+TOKEN = "bench"  # the stand-in ignores credentials
+
+
+def free_port() -> int:
+    """Pick a free localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def oai_server_running(upstream: str) -> Iterator[str]:
+    """Serve the OAI server from a background thread.
+
+    Args:
+        upstream: Base URL the server's client talks to
+
+    Yields:
+        Base URL of the OAI server
+
+    """
+    os.environ["PPLX_AUTH_TOKEN"] = TOKEN
+    os.environ["PPLX_API_BASE"] = upstream
+    oai_server._client = None
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(oai_server.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    for _ in range(500):
+        if server.started:
+            break
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def completion_request(stream: bool) -> dict:
+    """Body of one chat completion request."""
+    return {
+        "model": "pplx-70b-chat",
+        "messages": [{"role": "user", "content": "What is AI?"}],
+        "stream": stream,
+    }
+
+
+async def complete(http: httpx.AsyncClient) -> None:
+    """Send one non-streaming completion."""
+    response = await http.post("/v1/chat/completions", json=completion_request(False))
+    response.raise_for_status()
+
+
+async def stream(http: httpx.AsyncClient) -> float:
+    """Stream one completion to the end.
+
+    Returns:
+        Seconds from sending the request to the first content frame
+
+    """
+    start = time.perf_counter()
+    first_token = 0.0
+    async with http.stream("POST", "/v1/chat/completions", json=completion_request(True)) as r:
+        async for line in r.aiter_lines():
+            if first_token or not line.startswith("data: {"):
+                continue
+            if json.loads(line[6:])["choices"][0]["delta"].get("content"):
+                first_token = time.perf_counter() - start
+    return first_token
+
+
+async def load(base: str, streaming: bool) -> tuple[float, list[float]]:
+    """Send ``REQUESTS`` requests, ``CONCURRENCY`` at a time.
+
+    Returns:
+        Wall time in seconds and the time to first token of each stream
+
+    """
+    limits = httpx.Limits(max_connections=CONCURRENCY)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as http:
+        # Warm the connection pools on both sides
+        await asyncio.gather(*(complete(http) for _ in range(CONCURRENCY)))
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        ttft: list[float] = []
+
+        async def one() -> None:
+            async with semaphore:
+                if streaming:
+                    ttft.append(await stream(http))
+                else:
+                    await complete(http)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return time.perf_counter() - start, ttft
+
+
+def run() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    standin = StandinServer(StandinConfig(events=EVENTS, chunk_size=CHUNK_SIZE))
+    with standin.running() as upstream, oai_server_running(upstream) as base:
+        plain, _ = asyncio.run(load(base, streaming=False))
+        streamed, ttft = asyncio.run(load(base, streaming=True))
+
+    results = [
+        BenchResult("completions", REQUESTS, plain, unit="requests"),
+        BenchResult("streaming completions", REQUESTS, streamed, unit="requests"),
+        BenchResult(
+            "time to first token (p50)",
+            1,
+            percentile(ttft, 0.5),
+            unit="seconds",
+            extra={f"p{p}_ms": percentile(ttft, p / 100) * 1000 for p in (50, 95, 99)},
+            latency=True,
+        ),
+    ]
+    report(
+        f"/v1/chat/completions, {REQUESTS} requests, {CONCURRENCY} concurrent, "
+        f"{EVENTS} events per answer",
+        results,
+    )
+    return results
+
+
+if __name__ == "__main__":
+    run()
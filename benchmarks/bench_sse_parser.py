@@ -0,0 +1,127 @@
+"""SSE parsing throughput: line-based loop vs byte-level SSEDecoder.
+
+The line-based loop is the pre-SSEDecoder ``SSETransport.stream`` body: it
+reads ``response.iter_lines()`` and strips, tests and partitions every line.
+
+Run with::
+
+    python -m benchmarks.bench_sse_parser
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+
+import httpx
+
+from benchmarks.harness import BenchResult, measure, report
+from pplx_sdk.transport.sse_decoder import SSEDecoder
+
+EVENTS = 2000
+NETWORK_CHUNK = 4096
+
+
+def build_stream(events: int = EVENTS) -> bytes:
+    """Build a representative answer stream.
+
+    Args:
+        events: Number of answer_chunk events
+
+    Returns:
+        Raw SSE body
+
+    """
+    parts = [
+        'event: query_progress\ndata: {"status": "search_started"}\n\n',
+        'event: search_results\ndata: {"results": [{"url": "https://example.com"}]}\n\n',
+    ]
+    for i in range(events):
+        data = {"text": f"token {i} ", "backend_uuid": "b-123", "cursor": f"c-{i}"}
+        parts.append(f"event: answer_chunk\ndata: {json.dumps(data)}\n\n")
+    parts.append('event: final_response\ndata: {"backend_uuid": "b-123"}\n\n: [end]\n\n')
+    return "".join(parts).encode()
+
+
+def split(body: bytes, size: int = NETWORK_CHUNK) -> list[bytes]:
+    """Split a body into network-sized chunks."""
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def legacy_events(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Reproduce the original line-based SSE loop."""
+    event_type: str | None = None
+    data_buffer: list[str] = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if event_type and data_buffer:
+                yield event_type, "".join(data_buffer)
+                event_type = None
+                data_buffer = []
+            continue
+
+        if line.startswith(":"):
+            if "[end]" in line:
+                break
+            continue
+
+        if ":" in line:
+            field, _, value = line.partition(":")
+            value = value.lstrip()
+            if field == "event":
+                event_type = value
+            elif field == "data":
+                data_buffer.append(value)
+
+    if event_type and data_buffer:
+        yield event_type, "".join(data_buffer)
+
+
+def decoder_events(chunks: Iterable[bytes]) -> int:
+    """Decode chunks with SSEDecoder and count events."""
+    decoder = SSEDecoder()
+    count = 0
+    for chunk in chunks:
+        count += len(decoder.feed(chunk))
+        if decoder.ended:
+            break
+    return count + (decoder.flush() is not None)
+
+
+def run() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    body = build_stream()
+    chunks = split(body)
+    lines = body.decode().splitlines()
+    total = EVENTS + 3
+
+    def response() -> httpx.Response:
+        return httpx.Response(200, content=iter(chunks))
+
+    assert sum(1 for _ in legacy_events(lines)) == total  # noqa: S101
+    assert decoder_events(chunks) == total  # noqa: S101
+
+    transport_results = [
+        measure(
+            "iter_lines + line loop",
+            lambda: sum(1 for _ in legacy_events(response().iter_lines())),
+            total,
+        ),
+        measure("iter_bytes + SSEDecoder", lambda: decoder_events(response().iter_bytes()), total),
+    ]
+    report("SSE parsing through httpx.Response", transport_results)
+
+    parser_results = [
+        measure(
+            "line loop (pre-split str lines)", lambda: sum(1 for _ in legacy_events(lines)), total
+        ),
+        measure("SSEDecoder (raw byte chunks)", lambda: decoder_events(chunks), total),
+    ]
+    report("SSE parsing only", parser_results)
+    return transport_results + parser_results
+
+
+if __name__ == "__main__":
+    run()
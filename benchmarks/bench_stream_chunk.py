@@ -0,0 +1,81 @@
+"""Chunk construction cost: validated MessageChunk vs StreamChunk.
+
+The first two cases start from decoded SSE payloads and copy the same
+fields out, which is what ``SSETransport._parse_event`` does for every
+event. The last two time ``_parse_event`` itself from raw event data,
+JSON decoding included, and with the chunk then validated into a
+MessageChunk.
+
+Run with::
+
+    python -m benchmarks.bench_stream_chunk
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+
+from benchmarks.harness import BenchResult, measure, report
+from pplx_sdk.domain.models import MessageChunk, StreamChunk
+from pplx_sdk.shared import codec
+from pplx_sdk.transport.sse import SSE_ENDPOINT, SSETransport
+
+EVENTS = 2000
+
+
+def build_payloads(events: int = EVENTS) -> list[dict[str, Any]]:
+    """Build decoded answer_chunk payloads."""
+    return [
+        {"text": f"token {i} ", "backend_uuid": "b-123", "cursor": f"c-{i}", "status": "pending"}
+        for i in range(events)
+    ]
+
+
+def message_chunk(data: dict[str, Any]) -> MessageChunk:
+    """Build a chunk the pre-StreamChunk way."""
+    cursor = data.get("cursor")
+    return MessageChunk(
+        type="answer_chunk",
+        status=data.get("status"),
+        data=data,
+        backend_uuid=data.get("backend_uuid"),
+        context_uuid=data.get("context_uuid"),
+        text=data.get("text"),
+        cursor=cursor,
+        reconnectable=cursor is not None,
+    )
+
+
+def run() -> list[BenchResult]:
+    """Run all cases and print a report."""
+    payloads = build_payloads()
+    raw = [codec.dumps(d) for d in payloads]
+    from_event = StreamChunk.from_event
+    parse_event = SSETransport(httpx.Client(), SSE_ENDPOINT)._parse_event
+
+    results = [
+        measure("MessageChunk (validated)", lambda: [message_chunk(d) for d in payloads], EVENTS),
+        measure(
+            "StreamChunk.from_event",
+            lambda: [from_event("answer_chunk", d) for d in payloads],
+            EVENTS,
+        ),
+        measure(
+            "_parse_event (raw bytes)",
+            lambda: [parse_event("answer_chunk", r) for r in raw],
+            EVENTS,
+        ),
+        measure(
+            "_parse_event + to_model",
+            lambda: [parse_event("answer_chunk", r).to_model() for r in raw],
+            EVENTS,
+        ),
+    ]
+    report("Chunk construction", results)
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,162 @@
+"""Local stand-in for the Perplexity SSE endpoint over HTTP/1.1 and HTTP/2.
+
+Serves every POST with the same answer stream, one event every
+``interval`` seconds, and counts accepted TCP connections. HTTP/2 is
+spoken with prior knowledge (h2c), detected from the connection preface,
+so it needs the ``h2`` package; HTTP/1.1 uses chunked responses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import h2.config
+import h2.connection
+import h2.events
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class StandinServer:
+    """Minimal SSE server for transport benchmarks.
+
+    Example:
+        >>> server = StandinServer(events, interval=0.005)
+        >>> port = await server.start()
+        >>> ...
+        >>> await server.stop()
+
+    """
+
+    def __init__(self, events: list[bytes], interval: float = 0.0) -> None:
+        """Initialize server.
+
+        Args:
+            events: Raw SSE frames sent for every request
+            interval: Delay before each frame in seconds
+
+        """
+        self.events = events
+        self.interval = interval
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> int:
+        """Start listening on a free localhost port.
+
+        Returns:
+            Port number
+
+        """
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def stop(self) -> None:
+        """Stop the server and cancel in-flight responses."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+            if head == H2_PREFACE:
+                await self._serve_h2(head, reader, writer)
+            else:
+                await self._serve_http1(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if task is not None:
+                self._tasks.discard(task)
+            writer.close()
+
+    async def _serve_http1(
+        self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        buffer = head
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                buffer += data
+            header_block, _, buffer = buffer.partition(b"\r\n\r\n")
+
+            length = 0
+            for line in header_block.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            while len(buffer) < length:
+                buffer += await reader.readexactly(length - len(buffer))
+            buffer = buffer[length:]
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"content-type: text/event-stream\r\n"
+                b"transfer-encoding: chunked\r\n\r\n"
+            )
+            for event in self.events:
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+                writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+
+    async def _serve_h2(
+        self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        window_open = asyncio.Event()
+        responses: set[asyncio.Task[None]] = set()
+
+        async def respond(stream_id: int) -> None:
+            conn.send_headers(
+                stream_id, [(":status", "200"), ("content-type", "text/event-stream")]
+            )
+            writer.write(conn.data_to_send())
+            for event in self.events:
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+                while conn.local_flow_control_window(stream_id) < len(event):
+                    window_open.clear()
+                    await window_open.wait()
+                conn.send_data(stream_id, event)
+                writer.write(conn.data_to_send())
+            conn.end_stream(stream_id)
+            writer.write(conn.data_to_send())
+
+        data = head
+        try:
+            while data:
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.DataReceived):
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        task = asyncio.create_task(respond(event.stream_id))
+                        responses.add(task)
+                        task.add_done_callback(responses.discard)
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        window_open.set()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(conn.data_to_send())
+                data = await reader.read(65536)
+        finally:
+            for task in responses:
+                task.cancel()
+            with contextlib.suppress(Exception):
+                await asyncio.gather(*responses, return_exceptions=True)
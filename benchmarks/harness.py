@@ -0,0 +1,211 @@
+"""Shared timing helpers for benchmark scripts."""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class BenchResult:
+    """Best-of-N timing for one benchmark case.
+
+    Throughput cases are compared by ``rate``, where higher is better.
+    Latency cases (``latency=True``) are compared by ``seconds``, where
+    lower is better.
+
+    Attributes:
+        name: Case name
+        ops: Operations performed per call (events, chunks, requests, ...)
+        seconds: Best wall-clock time of one call, or the latency itself
+        unit: Name of one operation
+        extra: Further figures of the case, e.g. latency percentiles in
+            milliseconds
+        latency: Whether ``seconds`` is a latency rather than a duration
+
+    """
+
+    name: str
+    ops: int
+    seconds: float
+    unit: str = "events"
+    extra: dict[str, float] = field(default_factory=dict)
+    latency: bool = False
+
+    @property
+    def rate(self) -> float:
+        """Operations per second."""
+        return self.ops / self.seconds if self.seconds else float("inf")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for a results file, rate included."""
+        return {**asdict(self), "rate": self.rate}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        samples: Measurements, in any order
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        Smallest sample with at least ``fraction`` of the samples at or below it
+
+    """
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    ops: int,
+    unit: str = "events",
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> BenchResult:
+    """Time ``func`` and keep the best per-call duration.
+
+    The number of calls per sample is calibrated so that each sample runs for
+    at least ``min_time`` seconds, which keeps timer noise low for fast cases.
+
+    Args:
+        name: Case name
+        func: Zero-argument callable performing ``ops`` operations
+        ops: Operations performed by one call
+        unit: Name of one operation
+        repeat: Number of samples
+        min_time: Minimum duration of one sample in seconds
+
+    Returns:
+        BenchResult with the best per-call time
+
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    return BenchResult(name=name, ops=ops, seconds=best, unit=unit)
+
+
+def report(title: str, results: list[BenchResult]) -> None:
+    """Print results as a table, with speed-up relative to the first case.
+
+    Args:
+        title: Table heading
+        results: Results to print; the first one is the baseline
+
+    """
+    print(f"\n{title}")
+    print("-" * len(title))
+    baseline = results[0].rate if results else 0.0
+    for result in results:
+        extra = "".join(f"  {key} {value:.2f}" for key, value in result.extra.items())
+        if result.latency:
+            print(f"{result.name:<40} {result.seconds * 1000:>14.3f} ms{extra}")
+            continue
+        speedup = result.rate / baseline if baseline else 0.0
+        print(
+            f"{result.name:<40} {result.rate:>14,.0f} {result.unit}/s"
+            f" {result.seconds * 1000:>10.3f} ms  x{speedup:.2f}{extra}"
+        )
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607 - git from PATH
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def save_results(path: str | Path, suites: dict[str, list[BenchResult]]) -> dict[str, Any]:
+    """Write suite results to a JSON file, with the commit and environment.
+
+    Args:
+        path: Destination file
+        suites: Results of each suite, by suite name
+
+    Returns:
+        The saved document
+
+    """
+    document = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "suites": {name: [r.to_dict() for r in results] for name, results in suites.items()},
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n")
+    return document
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1) -> list[str]:
+    """Compare two results documents and print the change of each case.
+
+    Throughput cases report the change in rate, latency cases the change in
+    seconds; a lower rate or a higher latency counts as a slowdown.
+
+    Args:
+        baseline: Document saved by save_results() for the reference commit
+        current: Document for the commit under test
+        threshold: Relative slowdown reported as a regression
+
+    Returns:
+        ``suite/case`` names that regressed by more than ``threshold``
+
+    """
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}")
+    for suite, results in current["suites"].items():
+        before = {r["name"]: r for r in baseline["suites"].get(suite, [])}
+        for result in results:
+            old = before.get(result["name"])
+            latency = result.get("latency", False)
+            if old is None or old.get("latency", False) != latency:
+                continue
+            if latency:
+                if not old["seconds"]:
+                    continue
+                change = result["seconds"] / old["seconds"] - 1
+                slower = change > threshold
+            else:
+                if not old["rate"]:
+                    continue
+                change = result["rate"] / old["rate"] - 1
+                slower = change < -threshold
+            flag = ""
+            if slower:
+                flag = "  REGRESSION"
+                regressions.append(f"{suite}/{result['name']}")
+            print(f"{suite + '/' + result['name']:<60} {change:>+8.1%}{flag}")
+    return regressions
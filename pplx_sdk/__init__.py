@@ -10,30 +10,50 @@ Quick start:
         print(chunk.text, end="", flush=True)
 """
 
-from pplx_sdk.client import Conversation, PerplexityClient
+from pplx_sdk.client import (
+    AsyncConversation,
+    AsyncPerplexityClient,
+    Conversation,
+    PerplexityClient,
+)
 from pplx_sdk.core.exceptions import (
     AuthenticationError,
     PerplexitySDKError,
     RateLimitError,
+    SlowConsumerError,
     StreamingError,
+    StreamTimeoutError,
     TransportError,
     ValidationError,
 )
-from pplx_sdk.domain.models import Entry, MessageChunk, Thread
+from pplx_sdk.domain.cache import AnswerCache
+from pplx_sdk.domain.models import Entry, MessageChunk, StreamChunk, Thread
+from pplx_sdk.shared.metrics import MemoryMetricsSink, MetricsSink, StreamTiming
+from pplx_sdk.transport.timeouts import StreamTimeouts
 
 __version__ = "0.1.0"
 __author__ = "Perplexity AI Reverse Engineers"
 __license__ = "MIT"
 
 __all__ = [
+    "AnswerCache",
+    "AsyncConversation",
+    "AsyncPerplexityClient",
     "AuthenticationError",
     "Conversation",
     "Entry",
+    "MemoryMetricsSink",
     "MessageChunk",
+    "MetricsSink",
     "PerplexityClient",
     # Exceptions
     "PerplexitySDKError",
     "RateLimitError",
+    "SlowConsumerError",
+    "StreamChunk",
+    "StreamTimeoutError",
+    "StreamTimeouts",
+    "StreamTiming",
     "StreamingError",
     "Thread",
     "TransportError",
@@ -0,0 +1,364 @@
+"""Prometheus metrics for the OpenAI-compatible server.
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format, without a ``prometheus_client`` dependency. Updates are lock-free:
+each thread writes its own shard (the server's event loop is one thread,
+the client's threads another) and a scrape sums the shards. Every server
+process keeps its own values, so run one scrape target per worker.
+
+ServerMetrics holds the server's metrics. It is also the MetricsSink of the
+server's client, which reports upstream TTFT, errors, retries and bytes.
+The client reconnects interrupted streams (``PPLX_STREAM_RETRIES``), so the
+retry count is that of real reconnects.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from pplx_sdk.shared.metrics import StreamTiming
+from pplx_sdk.transport.pool import PoolStats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from a cached answer to a slow research answer
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+type Labels = tuple[str, ...]
+type Sample = tuple[str, Sequence[tuple[str, str]], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_family(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> str:
+    """Render one metric family in the text exposition format.
+
+    Args:
+        name: Metric name
+        kind: ``counter``, ``gauge`` or ``histogram``
+        help_text: HELP line
+        samples: (sample name, label pairs, value) triples
+
+    Returns:
+        HELP and TYPE lines followed by one line per sample
+
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for sample, labels, value in samples:
+        if labels:
+            pairs = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+            lines.append(f"{sample}{{{pairs}}} {_number(value)}")
+        else:
+            lines.append(f"{sample} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class _Metric:
+    """Metric whose values are sharded per thread."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards: list[dict[Labels, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict[Labels, Any]:
+        """Values written by the calling thread; the lock is taken once per thread."""
+        try:
+            shard: dict[Labels, Any] = self._local.values
+        except AttributeError:
+            shard = self._local.values = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshots(self) -> list[dict[Labels, Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic under the GIL, so writers need no lock
+        return [shard.copy() for shard in shards]
+
+    def samples(self) -> list[Sample]:
+        """Aggregate the shards into samples."""
+        totals: dict[Labels, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        return [
+            (self.name, list(zip(self.labels, key, strict=True)), value)
+            for key, value in sorted(totals.items())
+        ]
+
+    def render(self) -> str:
+        """Render the metric family."""
+        return render_family(self.name, self.kind, self.help, self.samples())
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Add to the count.
+
+        Args:
+            labels: Label values, in the order of the label names
+            amount: Non-negative increment
+
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. work in progress."""
+
+    kind = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Raise the value.
+
+        Args:
+            labels: Label values, in the order of the label names
+            amount: Increment
+
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        """Lower the value.
+
+        Args:
+            labels: Label values, in the order of the label names
+            amount: Decrement
+
+        """
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            help_text: HELP line
+            labels: Label names
+            buckets: Sorted bucket upper bounds; ``+Inf`` is implied
+
+        """
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value
+            labels: Label values, in the order of the label names
+
+        """
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # Per-bucket counts (not cumulative), then sum
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def samples(self) -> list[Sample]:
+        """Aggregate the shards into bucket, sum and count samples."""
+        totals: dict[Labels, list[float]] = {}
+        for shard in self._snapshots():
+            for key, state in shard.items():
+                total = totals.setdefault(key, [0] * len(state))
+                for i, value in enumerate(state):
+                    total[i] += value
+
+        samples: list[Sample] = []
+        bounds = [*map(_number, self.buckets), "+Inf"]
+        for key, state in sorted(totals.items()):
+            labels = list(zip(self.labels, key, strict=True))
+            cumulative = 0.0
+            for bound, count in zip(bounds, state[:-1], strict=True):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", [*labels, ("le", bound)], cumulative))
+            samples.append((f"{self.name}_sum", labels, state[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class ServerMetrics:
+    """Metrics of the OpenAI-compatible server.
+
+    Downstream metrics are updated by the request handlers, upstream ones
+    through record(), as the MetricsSink of the server's client. Connection
+    pool figures are read when scraped.
+
+    Example:
+        >>> metrics = ServerMetrics()
+        >>> client = AsyncPerplexityClient(auth_token=token, metrics=metrics)
+        >>> metrics.render(client.pool_stats())
+
+    """
+
+    def __init__(self, models: Iterable[str] = ()) -> None:
+        """Initialize metrics.
+
+        Args:
+            models: Model names used as label values; other requested
+                names are counted as ``other`` to bound label cardinality
+
+        """
+        self.models = frozenset(models)
+        request = ("model", "stream")
+        self.requests = Counter(
+            "pplx_requests_total", "Chat completion requests received.", request
+        )
+        self.request_errors = Counter(
+            "pplx_request_errors_total", "Chat completion requests that failed.", request
+        )
+        self.request_duration = Histogram(
+            "pplx_request_duration_seconds",
+            "Time to complete a chat completion, to the end of the streamed body.",
+            request,
+        )
+        self.ttft = Histogram(
+            "pplx_time_to_first_token_seconds",
+            "Time from a streaming request to its first content chunk.",
+            ("model",),
+        )
+        self.streams_in_flight = Gauge("pplx_streams_in_flight", "Streaming responses being sent.")
+        self.chunks = Counter(
+            "pplx_stream_chunks_total", "Chunks sent on streaming responses.", ("model",)
+        )
+        self.bytes_sent = Counter(
+            "pplx_stream_bytes_total", "Bytes sent on streaming responses.", ("model",)
+        )
+        self.upstream_streams = Counter(
+            "pplx_upstream_streams_total",
+            "Upstream answer streams, by source (upstream, cache, leader, coalesced).",
+            ("source",),
+        )
+        self.upstream_errors = Counter(
+            "pplx_upstream_errors_total", "Upstream answer streams that failed.", ("error",)
+        )
+        self.upstream_retries = Counter(
+            "pplx_upstream_retries_total", "Upstream reconnect attempts."
+        )
+        self.upstream_bytes = Counter(
+            "pplx_upstream_bytes_total", "Bytes received from upstream answer streams."
+        )
+        self.upstream_ttft = Histogram(
+            "pplx_upstream_time_to_first_token_seconds",
+            "Time from an upstream request to its first answer chunk.",
+        )
+        self._metrics: list[_Metric] = [
+            self.requests,
+            self.request_errors,
+            self.request_duration,
+            self.ttft,
+            self.streams_in_flight,
+            self.chunks,
+            self.bytes_sent,
+            self.upstream_streams,
+            self.upstream_errors,
+            self.upstream_retries,
+            self.upstream_bytes,
+            self.upstream_ttft,
+        ]
+
+    def model_label(self, model: str) -> str:
+        """Label value for a requested model name."""
+        return model if model in self.models else "other"
+
+    def record(self, timing: StreamTiming) -> None:
+        """Take the timing of a finished upstream stream (MetricsSink)."""
+        self.upstream_streams.inc((timing.source,))
+        if timing.error is not None:
+            self.upstream_errors.inc((timing.error,))
+        if timing.retries:
+            self.upstream_retries.inc(amount=timing.retries)
+        if timing.bytes_received:
+            self.upstream_bytes.inc(amount=timing.bytes_received)
+        if timing.attempts and timing.ttft is not None:
+            self.upstream_ttft.observe(timing.ttft)
+
+    def render(self, pool: PoolStats | None = None) -> str:
+        """Render all metrics for a scrape.
+
+        Args:
+            pool: Connection pool usage of the server's client, if known
+
+        Returns:
+            Text exposition format document
+
+        """
+        families = [metric.render() for metric in self._metrics]
+        if pool is not None:
+            families += [
+                render_family(
+                    "pplx_pool_connections",
+                    "gauge",
+                    "Open upstream connections.",
+                    [
+                        ("pplx_pool_connections", [("state", "idle")], pool.idle),
+                        ("pplx_pool_connections", [("state", "in_use")], pool.in_use),
+                    ],
+                ),
+                render_family(
+                    "pplx_pool_waiting",
+                    "gauge",
+                    "Requests waiting for an upstream connection slot.",
+                    [("pplx_pool_waiting", [], pool.waiting)],
+                ),
+                render_family(
+                    "pplx_pool_requests_total",
+                    "counter",
+                    "Requests sent upstream.",
+                    [("pplx_pool_requests_total", [], pool.requests)],
+                ),
+                render_family(
+                    "pplx_pool_wait_seconds_total",
+                    "counter",
+                    "Time requests spent waiting for an upstream connection slot.",
+                    [("pplx_pool_wait_seconds_total", [], pool.pool_wait_total)],
+                ),
+                render_family(
+                    "pplx_pool_timeouts_total",
+                    "counter",
+                    "Requests that timed out waiting for an upstream connection slot.",
+                    [("pplx_pool_timeouts_total", [], pool.pool_timeouts)],
+                ),
+            ]
+        return "".join(families)
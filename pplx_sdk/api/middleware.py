@@ -1,11 +1,20 @@
+"""Pure ASGI middleware for the OpenAI-compatible server.
+
+The middleware call the wrapped app directly instead of going through
+Starlette's BaseHTTPMiddleware, so streamed responses are passed through
+message by message, with no extra task group or body wrapping.
+
+Example:
+    >>> app.add_middleware(LoggingMiddleware)
+
+"""
+
 from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Awaitable, Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Configure logging
 logging.basicConfig(
@@ -16,68 +25,101 @@ logging.basicConfig(
 logger = logging.getLogger("pplx_sdk.api")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses."""
+class LoggingMiddleware:
+    """Middleware for logging HTTP requests and responses.
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """Process request and log details.
+    The duration runs until the last body message is sent, so streamed
+    responses are timed to completion. When INFO logging is disabled the
+    request and response lines are skipped, but exceptions are still
+    logged at ERROR.
+    """
 
-        Args:
-            request: FastAPI request
-            call_next: Next middleware/handler
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize middleware.
 
-        Returns:
-            Response object
+        Args:
+            app: Wrapped ASGI app
 
         """
-        # Log request
-        start_time = time.time()
-        logger.info(f"Request: {request.method} {request.url.path}")
+        self.app = app
 
-        # Process request
-        try:
-            response = await call_next(request)
-            duration = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request and log details.
 
-            # Log response
-            logger.info(
-                f"Response: {request.method} {request.url.path} - "
-                f"Status {response.status_code} - Duration {duration:.3f}s"
-            )
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
 
-            return response
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        # Log request
+        method, path = scope["method"], scope["path"]
+        start_time = time.perf_counter()
+        verbose = logger.isEnabledFor(logging.INFO)
+        if verbose:
+            logger.info("Request: %s %s", method, path)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Process request; without INFO only failures are logged, so the
+        # send channel is passed through unwrapped
+        try:
+            await self.app(scope, receive, send_with_status if verbose else send)
         except Exception as e:
-            duration = time.time() - start_time
             logger.error(
-                f"Error: {request.method} {request.url.path} - "
-                f"Duration {duration:.3f}s - Error: {e!s}"
+                "Error: %s %s - Duration %.3fs - Error: %s",
+                method,
+                path,
+                time.perf_counter() - start_time,
+                e,
             )
             raise
 
+        # Log response, once the whole body is sent
+        if verbose:
+            logger.info(
+                "Response: %s %s - Status %d - Duration %.3fs",
+                method,
+                path,
+                status_code,
+                time.perf_counter() - start_time,
+            )
+
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """Middleware for authentication (placeholder).
 
     Note: Currently auth is handled via PPLX_AUTH_TOKEN env var.
     This middleware can be extended for request-level auth.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """Process request with auth checks.
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize middleware.
 
         Args:
-            request: FastAPI request
-            call_next: Next middleware/handler
+            app: Wrapped ASGI app
+
+        """
+        self.app = app
 
-        Returns:
-            Response object
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request with auth checks.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
 
         """
         # TODO: Add request-level auth if needed
         # For now, just pass through
-        return await call_next(request)
+        await self.app(scope, receive, send)
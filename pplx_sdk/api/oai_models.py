@@ -16,6 +16,23 @@ class ChatMessage(BaseModel):
     name: str | None = Field(default=None, description="Optional name for the message")
 
 
+class StreamCoalescing(BaseModel):
+    """Delta coalescing options of a streaming request (pplx extension).
+
+    Unset options keep the server's value (``PPLX_COALESCE_DELTAS_*``).
+    """
+
+    max_delay: float | None = Field(
+        default=None, ge=0, description="Seconds a delta may wait to be merged"
+    )
+    max_bytes: int | None = Field(
+        default=None, gt=0, description="Merged size at which a chunk is sent"
+    )
+    flush_first: bool | None = Field(
+        default=None, description="Send the first delta without waiting"
+    )
+
+
 class ChatCompletionRequest(BaseModel):
     """OpenAI chat completion request format.
 
@@ -32,6 +49,13 @@ class ChatCompletionRequest(BaseModel):
     stop: str | list[str] | None = Field(default=None, description="Stop sequences")
     presence_penalty: float | None = Field(default=0.0, description="Presence penalty")
     frequency_penalty: float | None = Field(default=0.0, description="Frequency penalty")
+    coalesce: bool | StreamCoalescing | None = Field(
+        default=None,
+        description=(
+            "Merge small streamed deltas into fewer chunks: true, false, or options; "
+            "unset uses the server default"
+        ),
+    )
 
 
 class ChatCompletionChoice(BaseModel):
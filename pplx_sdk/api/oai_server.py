@@ -3,38 +3,64 @@
 Wraps Perplexity API with OpenAI's /v1/chat/completions format.
 """
 
-import json
+import logging
 import os
 import time
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import asdict, replace
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
+from pplx_sdk.api.metrics import CONTENT_TYPE, ServerMetrics
 from pplx_sdk.api.oai_models import (
     MODEL_MAPPING,
     ChatCompletionChoice,
-    ChatCompletionChunk,
-    ChatCompletionChunkChoice,
-    ChatCompletionChunkDelta,
     ChatCompletionRequest,
     ChatCompletionResponse,
     ChatMessage,
     Model,
     ModelList,
+    StreamCoalescing,
 )
-from pplx_sdk.client import PerplexityClient
+from pplx_sdk.client import AsyncPerplexityClient
+from pplx_sdk.domain.cache import AnswerCache
+from pplx_sdk.shared import codec
+from pplx_sdk.shared.retry import RetryConfig
+from pplx_sdk.streaming.deltas import DeltaCoalescing, acoalesce_deltas
+from pplx_sdk.streaming.types import EventType
+from pplx_sdk.transport.config import TransportConfig
+from pplx_sdk.transport.timeouts import StreamTimeouts
+
+logger = logging.getLogger("pplx_sdk.api")
+
+# Only answer text is rendered; other events are skipped before JSON decoding
+_RENDERED_EVENTS = frozenset({EventType.ANSWER_CHUNK})
+
+_DONE = b"data: [DONE]\n\n"
 
 # Global client instance (initialized on startup)
-_client: PerplexityClient | None = None
+_client: AsyncPerplexityClient | None = None
+
+# Upstream stream limits (read from the environment on first use)
+_stream_timeouts: StreamTimeouts | None = None
 
+# Delta coalescing of streaming responses (read from the environment on first use)
+_delta_coalescing: DeltaCoalescing | None = None
 
-def get_client() -> PerplexityClient:
-    """Get or create Perplexity client.
+# Served on /metrics; also the metrics sink of the client
+_metrics = ServerMetrics(MODEL_MAPPING)
+
+
+def get_client() -> AsyncPerplexityClient:
+    """Get or create the async Perplexity client.
+
+    The server uses the asyncio client so upstream streams never block the
+    event loop.
 
     Returns:
-        PerplexityClient instance
+        AsyncPerplexityClient instance
 
     Raises:
         HTTPException: If client not initialized
@@ -52,11 +78,165 @@ def get_client() -> PerplexityClient:
                 detail="PPLX_AUTH_TOKEN environment variable not set",
             )
 
-        _client = PerplexityClient(api_base=api_base, auth_token=auth_token)
+        # Pool limits and timeouts come from PPLX_MAX_CONNECTIONS & co.;
+        # PPLX_COALESCE_REQUESTS=1 shares streams of identical requests,
+        # PPLX_ANSWER_CACHE enables the answer cache and PPLX_STREAM_RETRIES
+        # bounds reconnects of broken streams
+        retries = int(os.getenv("PPLX_STREAM_RETRIES") or 3)
+        _client = AsyncPerplexityClient(
+            api_base=api_base,
+            auth_token=auth_token,
+            transport_config=TransportConfig.from_env(),
+            coalesce_requests=os.getenv("PPLX_COALESCE_REQUESTS", "").lower() in {"1", "true"},
+            answer_cache=AnswerCache.from_env(),
+            metrics=_metrics,
+            retry_config=RetryConfig(max_retries=retries) if retries > 0 else None,
+        )
 
     return _client
 
 
+def get_stream_timeouts() -> StreamTimeouts:
+    """Get the limits applied to upstream streams.
+
+    Read once from ``PPLX_STREAM_TOTAL``, ``PPLX_STREAM_FIRST_BYTE`` and
+    ``PPLX_STREAM_IDLE``. A stalled upstream is cut off when one passes,
+    releasing its connection and ending the client response with an
+    error frame.
+
+    Returns:
+        StreamTimeouts instance
+
+    """
+    global _stream_timeouts
+    if _stream_timeouts is None:
+        _stream_timeouts = StreamTimeouts.from_env()
+    return _stream_timeouts
+
+
+def get_delta_coalescing() -> DeltaCoalescing:
+    """Get the server's default delta coalescing.
+
+    Read once from ``PPLX_COALESCE_DELTAS`` (off unless ``1``) and
+    ``PPLX_COALESCE_DELTAS_MAX_DELAY``, ``_MAX_BYTES`` and ``_FLUSH_FIRST``.
+    Requests override it with their ``coalesce`` field.
+
+    Returns:
+        DeltaCoalescing instance
+
+    """
+    global _delta_coalescing
+    if _delta_coalescing is None:
+        _delta_coalescing = DeltaCoalescing.from_env()
+    return _delta_coalescing
+
+
+def _request_coalescing(option: bool | StreamCoalescing | None) -> DeltaCoalescing:
+    """Apply a request's ``coalesce`` field to the server default.
+
+    Args:
+        option: None for the default, a bool to switch coalescing on or off,
+            or options overriding the default limits
+
+    Returns:
+        DeltaCoalescing for the request
+
+    """
+    default = get_delta_coalescing()
+    if option is None:
+        return default
+    if isinstance(option, bool):
+        return replace(default, enabled=option)
+    return replace(default, enabled=True, **option.model_dump(exclude_none=True))
+
+
+def _encode_chunk(
+    completion_id: str,
+    created: int,
+    model: str,
+    role: str | None = None,
+    content: str | None = None,
+    finish_reason: str | None = None,
+) -> bytes:
+    """Encode one chat.completion.chunk as an SSE frame.
+
+    Builds the plain dict a ChatCompletionChunk dumps to (same keys, same
+    order) and encodes it with the JSON codec, so no model is validated per
+    token. The payload is byte-identical to ``model_dump_json()``.
+
+    Args:
+        completion_id: Completion ID shared by all chunks
+        created: Unix timestamp of the completion
+        model: Requested model name
+        role: Delta role (first chunk only)
+        content: Delta content
+        finish_reason: Finish reason (last chunk only)
+
+    Returns:
+        ``data: {...}`` SSE frame
+
+    """
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"role": role, "content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+    }
+    return b"data: " + codec.dumps(payload) + b"\n\n"
+
+
+class _ChunkEncoder:
+    """Encode the content chunks of one completion from pre-rendered bytes.
+
+    Everything but the delta content is constant within a completion, so the
+    frame around it is rendered once and each chunk only JSON-encodes its
+    text. Frames are byte-identical to _encode_chunk() and thus to
+    ``model_dump_json()``.
+    """
+
+    __slots__ = ("_prefix", "_suffix")
+
+    def __init__(self, completion_id: str, created: int, model: str) -> None:
+        """Render the constant parts of the completion's frames.
+
+        Args:
+            completion_id: Completion ID shared by all chunks
+            created: Unix timestamp of the completion
+            model: Requested model name
+
+        """
+        dumps = codec.dumps
+        self._prefix = (
+            b'data: {"id":'
+            + dumps(completion_id)
+            + b',"object":"chat.completion.chunk","created":'
+            + dumps(created)
+            + b',"model":'
+            + dumps(model)
+            + b',"choices":[{"index":0,"delta":{"role":null,"content":'
+        )
+        self._suffix = b'},"finish_reason":null}]}\n\n'
+
+    def content(self, text: str) -> bytes:
+        """Encode a content delta as an SSE frame.
+
+        Args:
+            text: Delta content
+
+        Returns:
+            ``data: {...}`` SSE frame
+
+        """
+        return b"".join((self._prefix, codec.dumps(text), self._suffix))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage application lifespan.
@@ -66,16 +246,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     global _client
     try:
-        get_client()
+        client = get_client()
     except Exception:
         # Allow startup even if client fails (will error on first request)
-        pass
+        client = None
+
+    # Open upstream connections now so the first request skips DNS, TCP and
+    # TLS setup; a failure only costs the first request that latency
+    warmup_connections = int(os.getenv("PPLX_WARMUP_CONNECTIONS", "1"))
+    if client is not None and warmup_connections > 0:
+        try:
+            await client.warmup(warmup_connections)
+        except Exception as e:
+            logger.warning("Connection warm-up failed: %r", e)
 
     yield
 
     # Shutdown
     if _client:
-        _client.close()
+        await _client.aclose()
         _client = None
 
 
@@ -92,11 +281,38 @@ app = FastAPI(
 async def health_check() -> dict:
     """Health check endpoint.
 
+    Includes upstream connection pool statistics once the client exists,
+    for sizing ``PPLX_MAX_CONNECTIONS`` and friends, and answer cache
+    counters when the cache is enabled.
+
     Returns:
         Health status
 
     """
-    return {"status": "healthy", "service": "pplx-sdk-oai-adapter"}
+    health: dict = {"status": "healthy", "service": "pplx-sdk-oai-adapter"}
+    stats = _client.pool_stats() if _client else None
+    if stats is not None:
+        health["pool"] = {**asdict(stats), "pool_wait_avg": stats.pool_wait_avg}
+    cache = _client.entries.cache if _client else None
+    if cache is not None:
+        health["answer_cache"] = cache.stats()
+    return health
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics endpoint.
+
+    Request counts, latency and TTFT histograms, in-flight streams, chunk
+    and byte throughput, upstream errors and retries, and connection pool
+    usage, in the Prometheus text exposition format.
+
+    Returns:
+        Metrics of this server process
+
+    """
+    pool = _client.pool_stats() if _client else None
+    return PlainTextResponse(_metrics.render(pool), media_type=CONTENT_TYPE)
 
 
 @app.get("/v1/models")
@@ -122,7 +338,7 @@ async def list_models() -> ModelList:
     return ModelList(data=models)
 
 
-@app.post("/v1/chat/completions")
+@app.post("/v1/chat/completions", response_model=None)
 async def chat_completions(
     request: ChatCompletionRequest,
     req: Request,
@@ -140,9 +356,14 @@ async def chat_completions(
         HTTPException: On errors
 
     """
+    started = time.perf_counter()
+    labels = (_metrics.model_label(request.model), "true" if request.stream else "false")
+    _metrics.requests.inc(labels)
+
     try:
         client = get_client()
     except Exception as e:
+        _metrics.request_errors.inc(labels)
         raise HTTPException(status_code=500, detail=str(e)) from e
 
     # Get model configuration
@@ -174,64 +395,60 @@ async def chat_completions(
     if request.stream:
         # Streaming response
 
-        async def generate_stream() -> AsyncGenerator[str, None]:
+        async def generate_stream() -> AsyncGenerator[bytes, None]:
             """Generate SSE stream."""
+            # Throughput is counted locally and added to the metrics once
+            chunks = sent = 0
+            model = labels[0]
+            encoder = _ChunkEncoder(completion_id, timestamp, request.model)
+            coalescing = _request_coalescing(request.coalesce)
+            _metrics.streams_in_flight.inc()
             try:
                 # Send initial chunk with role
-                initial_chunk = ChatCompletionChunk(
-                    id=completion_id,
-                    created=timestamp,
-                    model=request.model,
-                    choices=[
-                        ChatCompletionChunkChoice(
-                            index=0,
-                            delta=ChatCompletionChunkDelta(role="assistant"),
-                            finish_reason=None,
-                        )
-                    ],
-                )
-                yield f"data: {initial_chunk.model_dump_json()}\n\n"
+                frame = _encode_chunk(completion_id, timestamp, request.model, role="assistant")
+                sent += len(frame)
+                yield frame
 
-                # Stream content
-                for chunk in conv.ask_stream(
+                # Stream content; closing the stream releases the upstream
+                # response when the client goes away or sending fails
+                stream = conv.ask_stream(
                     query=query,
                     mode=model_config["mode"],
                     model_preference=model_config["pplx_model"],
-                ):
-                    if chunk.text:
-                        content_chunk = ChatCompletionChunk(
-                            id=completion_id,
-                            created=timestamp,
-                            model=request.model,
-                            choices=[
-                                ChatCompletionChunkChoice(
-                                    index=0,
-                                    delta=ChatCompletionChunkDelta(content=chunk.text),
-                                    finish_reason=None,
-                                )
-                            ],
-                        )
-                        yield f"data: {content_chunk.model_dump_json()}\n\n"
+                    events=_RENDERED_EVENTS,
+                    timeouts=get_stream_timeouts(),
+                )
+                async with aclosing(stream):
+                    texts: AsyncGenerator[str, None] = (
+                        chunk.text async for chunk in stream if chunk.text
+                    )
+                    if coalescing.enabled:
+                        texts = acoalesce_deltas(texts, coalescing)
+                    async with aclosing(texts):
+                        async for text in texts:
+                            if not chunks:
+                                _metrics.ttft.observe(time.perf_counter() - started, (model,))
+                            frame = encoder.content(text)
+                            chunks += 1
+                            sent += len(frame)
+                            yield frame
 
                 # Send final chunk
-                final_chunk = ChatCompletionChunk(
-                    id=completion_id,
-                    created=timestamp,
-                    model=request.model,
-                    choices=[
-                        ChatCompletionChunkChoice(
-                            index=0,
-                            delta=ChatCompletionChunkDelta(),
-                            finish_reason="stop",
-                        )
-                    ],
-                )
-                yield f"data: {final_chunk.model_dump_json()}\n\n"
-                yield "data: [DONE]\n\n"
+                frame = _encode_chunk(completion_id, timestamp, request.model, finish_reason="stop")
+                sent += len(frame) + len(_DONE)
+                yield frame
+                yield _DONE
 
             except Exception as e:
+                _metrics.request_errors.inc(labels)
                 error_data = {"error": {"message": str(e), "type": "server_error"}}
-                yield f"data: {json.dumps(error_data)}\n\n"
+                yield b"data: " + codec.dumps(error_data) + b"\n\n"
+
+            finally:
+                _metrics.streams_in_flight.dec()
+                _metrics.chunks.inc((model,), chunks)
+                _metrics.bytes_sent.inc((model,), sent)
+                _metrics.request_duration.observe(time.perf_counter() - started, labels)
 
         return StreamingResponse(
             generate_stream(),
@@ -245,10 +462,11 @@ async def chat_completions(
     else:
         # Non-streaming response
         try:
-            entry = conv.ask(
+            entry = await conv.ask(
                 query=query,
                 mode=model_config["mode"],
                 model_preference=model_config["pplx_model"],
+                timeouts=get_stream_timeouts(),
             )
 
             # Build text from entry blocks
@@ -273,8 +491,12 @@ async def chat_completions(
             return JSONResponse(content=response.model_dump())
 
         except Exception as e:
+            _metrics.request_errors.inc(labels)
             raise HTTPException(status_code=500, detail=str(e)) from e
 
+        finally:
+            _metrics.request_duration.observe(time.perf_counter() - started, labels)
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,20 +3,184 @@
 Provides high-level interfaces for interacting with Perplexity API.
 """
 
+import asyncio
+import hashlib
+import threading
 import uuid
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 
 from pplx_sdk.domain.articles import ArticlesService
+from pplx_sdk.domain.cache import AnswerCache
 from pplx_sdk.domain.collections import CollectionsService
-from pplx_sdk.domain.entries import EntriesService
+from pplx_sdk.domain.entries import AsyncEntriesService, EntriesService
 from pplx_sdk.domain.memories import MemoriesService
-from pplx_sdk.domain.models import Entry, MessageChunk, Thread, ThreadAccess
+from pplx_sdk.domain.models import Entry, StreamChunk, Thread, ThreadAccess
 from pplx_sdk.domain.threads import ThreadsService
-from pplx_sdk.transport.sse import SSETransport
+from pplx_sdk.shared.metrics import MetricsSink
+from pplx_sdk.shared.retry import RetryConfig
+from pplx_sdk.streaming.manager import AsyncStreamManager, StreamManager
+from pplx_sdk.transport.config import TransportConfig
+from pplx_sdk.transport.pool import PoolStats, pool_stats
+from pplx_sdk.transport.sse import SSE_ENDPOINT, AsyncSSETransport, SSETransport
+from pplx_sdk.transport.timeouts import StreamTimeouts
+
+
+def _build_default_headers(
+    auth_token: str | None, default_headers: dict[str, str]
+) -> dict[str, str]:
+    """Build default headers shared by sync and async clients.
+
+    Args:
+        auth_token: Authentication token (session ID from cookies)
+        default_headers: Additional headers for all requests
+
+    Returns:
+        Dictionary of default headers
+
+    """
+    headers = {
+        "User-Agent": "pplx-sdk/0.1.0",
+        "X-Client-Name": "web",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+
+    if auth_token:
+        headers["Authorization"] = f"Bearer {auth_token}"
+
+    headers.update(default_headers)
+    return headers
+
+
+def _new_thread(title: str | None) -> Thread:
+    """Create a fresh private thread for a new conversation.
+
+    Args:
+        title: Optional conversation title
+
+    Returns:
+        Thread object with a new context UUID
+
+    """
+    context_uuid = str(uuid.uuid4())
+    return Thread(
+        context_uuid=context_uuid,
+        title=title,
+        slug=f"conv-{context_uuid[:8]}",
+        access=ThreadAccess.PRIVATE,
+    )
+
+
+def _fork_thread(thread: Thread) -> Thread:
+    """Create the thread for a fork of an existing conversation.
+
+    Args:
+        thread: Thread being forked
+
+    Returns:
+        New Thread object with a new context UUID
+
+    """
+    new_context_uuid = str(uuid.uuid4())
+    return Thread(
+        context_uuid=new_context_uuid,
+        title=f"{thread.title} (fork)" if thread.title else "Forked conversation",
+        slug=f"fork-{new_context_uuid[:8]}",
+        access=thread.access,
+    )
+
+
+def _cache_scope(auth_token: str | None) -> str:
+    """Scope answer cache keys to the account of a token.
+
+    Args:
+        auth_token: Authentication token, if any
+
+    Returns:
+        Digest of the token; empty for anonymous clients
+
+    """
+    if not auth_token:
+        return ""
+    return hashlib.sha256(auth_token.encode()).hexdigest()
+
+
+def _parent_entry_uuid(entries: list[Entry]) -> str | None:
+    """Select the parent of the next question in a conversation.
+
+    Snapshots (answers replayed from the cache or another request's
+    stream) live in another thread and are skipped.
+
+    Args:
+        entries: Conversation history
+
+    Returns:
+        Backend UUID of the last entry of this thread, or None
+
+    """
+    for entry in reversed(entries):
+        if not entry.snapshot:
+            return entry.backend_uuid
+    return None
+
+
+def _fork_entries(entries: list[Entry], from_entry: Entry | None) -> list[Entry]:
+    """Select the entries carried over into a fork.
+
+    Args:
+        entries: Conversation history
+        from_entry: Entry to fork from (default: last entry)
+
+    Returns:
+        Entries up to and including the fork point
+
+    """
+    if from_entry is None:
+        return entries.copy()
+
+    try:
+        fork_idx = entries.index(from_entry)
+    except ValueError:
+        return []
+    return entries[: fork_idx + 1]
+
+
+def _warmup_url(api_base: str, path: str) -> str:
+    """Build the absolute URL used for connection warm-up.
+
+    Args:
+        api_base: Base URL for API requests
+        path: Path requested to open a connection
+
+    Returns:
+        Absolute URL
+
+    """
+    return api_base.rstrip("/") + "/" + path.lstrip("/")
+
+
+def _warmup_error(errors: list[BaseException]) -> BaseException:
+    """Pick the error to report from failed warm-up requests.
+
+    A failed request breaks the barrier the other requests wait on, so
+    prefer the original failure over the resulting broken-barrier errors.
+
+    Args:
+        errors: Exceptions raised by warm-up requests
+
+    Returns:
+        Exception to raise
+
+    """
+    for error in errors:
+        if not isinstance(error, threading.BrokenBarrierError | asyncio.BrokenBarrierError):
+            return error
+    return errors[0]
 
 
 class PerplexityClient:
@@ -37,6 +201,13 @@ class PerplexityClient:
         auth_token: str | None = None,
         timeout: float = 30.0,
         default_headers: dict[str, str] | None = None,
+        http2: bool = False,
+        http_client: httpx.Client | None = None,
+        transport_config: TransportConfig | None = None,
+        coalesce_requests: bool = False,
+        answer_cache: AnswerCache | None = None,
+        metrics: MetricsSink | None = None,
+        retry_config: RetryConfig | None = None,
     ) -> None:
         """Initialize Perplexity client.
 
@@ -45,6 +216,24 @@ class PerplexityClient:
             auth_token: Authentication token (session ID from cookies)
             timeout: Request timeout in seconds
             default_headers: Additional headers for all requests
+            http2: Negotiate HTTP/2 so concurrent streams share connections
+                (requires the ``h2`` package, see the ``http2`` extra)
+            http_client: Shared httpx.Client to use instead of creating one.
+                It is not closed by this client; ``api_base`` becomes the
+                absolute request URL and auth headers are sent per request,
+                so clients with different tokens can share one pool.
+                ``timeout`` and ``http2`` come from the shared client
+            transport_config: Pool limits, keepalive and per-phase
+                timeouts for the created client (ignored with http_client)
+            coalesce_requests: Let identical concurrent questions share
+                one upstream stream (see EntriesService)
+            answer_cache: Cache answering repeat first questions without
+                going upstream
+            metrics: Sink receiving the StreamTiming (connect, headers,
+                time to first token, ...) of every answer stream
+            retry_config: Reconnect interrupted answer streams from their
+                cursor with this backoff policy (see StreamManager); None
+                streams without retries
 
         """
         self.api_base = api_base
@@ -52,23 +241,45 @@ class PerplexityClient:
         self.timeout = timeout
         self.default_headers = default_headers or {}
 
-        # Create HTTP client
-        self._http_client = httpx.Client(
-            base_url=api_base,
-            timeout=timeout,
-            headers=self._build_headers(),
-            follow_redirects=True,
-        )
+        # Create HTTP client, unless a shared one is injected
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            config = transport_config or TransportConfig()
+            http_client = config.create_client(
+                timeout=timeout,
+                http2=http2,
+                base_url=api_base,
+                headers=self._build_headers(),
+                follow_redirects=True,
+            )
+            endpoint = SSE_ENDPOINT
+            request_headers = None
+        else:
+            # The shared client may serve other bases and tokens
+            endpoint = api_base.rstrip("/") + SSE_ENDPOINT
+            request_headers = self._build_headers()
+        self._http_client = http_client
 
         # Initialize transport layers
         self._sse_transport = SSETransport(
             client=self._http_client,
-            endpoint="/rest/sse/perplexity.ask",
+            endpoint=endpoint,
+            headers=request_headers,
         )
 
         # Initialize domain services
         self._threads_service = ThreadsService()
-        self._entries_service = EntriesService(self._sse_transport)
+        stream_manager = None
+        if retry_config is not None:
+            stream_manager = StreamManager(self._sse_transport, retry_config=retry_config)
+        self._entries_service = EntriesService(
+            self._sse_transport,
+            coalesce_requests,
+            answer_cache,
+            metrics,
+            _cache_scope(auth_token),
+            stream_manager,
+        )
         self._memories_service = MemoriesService()
         self._collections_service = CollectionsService()
         self._articles_service = ArticlesService()
@@ -80,18 +291,7 @@ class PerplexityClient:
             Dictionary of default headers
 
         """
-        headers = {
-            "User-Agent": "pplx-sdk/0.1.0",
-            "X-Client-Name": "web",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
-
-        if self.auth_token:
-            headers["Authorization"] = f"Bearer {self.auth_token}"
-
-        headers.update(self.default_headers)
-        return headers
+        return _build_default_headers(self.auth_token, self.default_headers)
 
     @property
     def threads(self) -> ThreadsService:
@@ -153,18 +353,7 @@ class PerplexityClient:
             Conversation instance
 
         """
-        # Generate new context UUID
-        context_uuid = str(uuid.uuid4())
-
-        # Create thread object
-        thread = Thread(
-            context_uuid=context_uuid,
-            title=title,
-            slug=f"conv-{context_uuid[:8]}",
-            access=ThreadAccess.PRIVATE,
-        )
-
-        return Conversation(client=self, thread=thread, entries=[])
+        return Conversation(client=self, thread=_new_thread(title), entries=[])
 
     def conversation_from_thread(self, slug_or_uuid: str) -> "Conversation":
         """Load an existing conversation from a thread.
@@ -187,9 +376,68 @@ class PerplexityClient:
 
         return Conversation(client=self, thread=thread, entries=[])
 
+    def warmup(self, n_connections: int = 1, path: str = "/") -> int:
+        """Open pooled connections ahead of the first request.
+
+        Sends ``n_connections`` concurrent HEAD requests and holds every
+        response open until all are connected. The pool then keeps that many
+        distinct connections with DNS, TCP and TLS setup already done. They
+        stay ready for ``keepalive_expiry`` seconds, and at most
+        ``max_keepalive_connections`` are kept (see TransportConfig).
+
+        Args:
+            n_connections: Number of connections to open
+            path: Path requested; the response status is ignored
+
+        Returns:
+            Number of connections opened
+
+        Raises:
+            httpx.HTTPError: If a warm-up request fails
+            threading.BrokenBarrierError: If the connections could not all be
+                open at once within ``timeout`` (e.g. pool limit too low)
+
+        """
+        if n_connections <= 0:
+            return 0
+
+        url = _warmup_url(self.api_base, path)
+        barrier = threading.Barrier(n_connections)
+
+        def hold() -> None:
+            try:
+                with self._http_client.stream("HEAD", url) as response:
+                    barrier.wait(timeout=self.timeout)
+                    # Finish the response so the connection returns to the pool
+                    response.read()
+            except BaseException:
+                barrier.abort()
+                raise
+
+        with ThreadPoolExecutor(max_workers=n_connections) as executor:
+            futures = [executor.submit(hold) for _ in range(n_connections)]
+
+        errors = [error for future in futures if (error := future.exception()) is not None]
+        if errors:
+            raise _warmup_error(errors)
+        return n_connections
+
+    def pool_stats(self) -> PoolStats | None:
+        """Report connection pool usage.
+
+        Returns:
+            PoolStats, or None for an injected client that was not built
+            with TransportConfig
+
+        """
+        return pool_stats(self._http_client)
+
     def close(self) -> None:
-        """Close HTTP client and cleanup resources."""
-        if self._http_client:
+        """Close HTTP client and cleanup resources.
+
+        An injected shared client is left open for its other users.
+        """
+        if self._http_client and self._owns_http_client:
             self._http_client.close()
 
     def __enter__(self) -> "PerplexityClient":
@@ -236,8 +484,11 @@ class Conversation:
         mode: str = "concise",
         model_preference: str = "pplx-70b-chat",
         sources: list[str] | None = None,
+        events: Iterable[str] | None = None,
+        exclude_events: Iterable[str] | None = None,
+        timeouts: StreamTimeouts | None = None,
         **kwargs: Any,
-    ) -> Generator[MessageChunk, None, None]:
+    ) -> Generator[StreamChunk, None, None]:
         """Ask a question and stream the response.
 
         Args:
@@ -245,16 +496,19 @@ class Conversation:
             mode: Query mode (concise, research, etc.)
             model_preference: Model to use
             sources: List of source types
+            events: Event types to yield (EventType members or strings);
+                others are skipped before JSON decoding. None yields all
+            exclude_events: Event types to skip before JSON decoding
+            timeouts: Total deadline, first-byte and idle timeouts; a
+                passed limit raises StreamTimeoutError
             **kwargs: Additional parameters
 
         Yields:
-            MessageChunk objects from SSE stream
+            StreamChunk objects from SSE stream
 
         """
         # Get parent entry UUID if we have entries
-        parent_entry_uuid = None
-        if self.entries:
-            parent_entry_uuid = self.entries[-1].backend_uuid
+        parent_entry_uuid = _parent_entry_uuid(self.entries)
 
         # Stream from entries service
         yield from self.client.entries.stream_ask(
@@ -264,6 +518,10 @@ class Conversation:
             model_preference=model_preference,
             sources=sources,
             parent_entry_uuid=parent_entry_uuid,
+            share=not self.entries,
+            events=events,
+            exclude_events=exclude_events,
+            timeouts=timeouts,
             **kwargs,
         )
 
@@ -273,17 +531,22 @@ class Conversation:
         mode: str = "concise",
         model_preference: str = "pplx-70b-chat",
         sources: list[str] | None = None,
+        timeouts: StreamTimeouts | None = None,
         **kwargs: Any,
     ) -> Entry:
         """Ask a question and return the complete entry.
 
-        The entry is automatically added to the conversation history.
+        The entry is automatically added to the conversation history. A
+        snapshot (an answer replayed from the cache or another request's
+        stream) never becomes a parent: the next question is asked
+        upstream in this conversation's own thread.
 
         Args:
             query: Question to ask
             mode: Query mode
             model_preference: Model to use
             sources: List of source types
+            timeouts: Total deadline, first-byte and idle timeouts
             **kwargs: Additional parameters
 
         Returns:
@@ -291,9 +554,7 @@ class Conversation:
 
         """
         # Get parent entry UUID if we have entries
-        parent_entry_uuid = None
-        if self.entries:
-            parent_entry_uuid = self.entries[-1].backend_uuid
+        parent_entry_uuid = _parent_entry_uuid(self.entries)
 
         # Get full entry
         entry = self.client.entries.ask(
@@ -303,6 +564,8 @@ class Conversation:
             model_preference=model_preference,
             sources=sources,
             parent_entry_uuid=parent_entry_uuid,
+            share=not self.entries,
+            timeouts=timeouts,
             **kwargs,
         )
 
@@ -323,28 +586,12 @@ class Conversation:
             New Conversation instance
 
         """
-        # Determine fork point
-        if from_entry is None:
-            fork_entries = self.entries.copy()
-        else:
-            # Find entry index
-            try:
-                fork_idx = self.entries.index(from_entry)
-                fork_entries = self.entries[: fork_idx + 1]
-            except ValueError:
-                fork_entries = []
-
-        # Create new thread
-        new_context_uuid = str(uuid.uuid4())
-        new_thread = Thread(
-            context_uuid=new_context_uuid,
-            title=f"{self.thread.title} (fork)" if self.thread.title else "Forked conversation",
-            slug=f"fork-{new_context_uuid[:8]}",
-            access=self.thread.access,
+        return Conversation(
+            client=self.client,
+            thread=_fork_thread(self.thread),
+            entries=_fork_entries(self.entries, from_entry),
         )
 
-        return Conversation(client=self.client, thread=new_thread, entries=fork_entries)
-
     def save_to_collection(self, collection_id: str) -> None:
         """Save conversation to a collection.
 
@@ -362,3 +609,413 @@ class Conversation:
 
         """
         return self.client.articles.from_thread(self.context_uuid)
+
+
+class AsyncPerplexityClient:
+    """Asyncio client for Perplexity API.
+
+    Async twin of PerplexityClient built on httpx.AsyncClient. Streams are
+    consumed with ``async for``, so one event loop can keep many answers in
+    flight without a thread per request.
+
+    Example:
+        >>> async with AsyncPerplexityClient(auth_token="session-token") as client:
+        ...     conv = client.new_conversation(title="Research")
+        ...     async for chunk in conv.ask_stream("What is quantum computing?"):
+        ...         print(chunk.text, end="")
+
+    """
+
+    def __init__(
+        self,
+        api_base: str = "https://www.perplexity.ai",
+        auth_token: str | None = None,
+        timeout: float = 30.0,
+        default_headers: dict[str, str] | None = None,
+        http2: bool = False,
+        http_client: httpx.AsyncClient | None = None,
+        transport_config: TransportConfig | None = None,
+        coalesce_requests: bool = False,
+        answer_cache: AnswerCache | None = None,
+        metrics: MetricsSink | None = None,
+        retry_config: RetryConfig | None = None,
+    ) -> None:
+        """Initialize async Perplexity client.
+
+        Args:
+            api_base: Base URL for API requests
+            auth_token: Authentication token (session ID from cookies)
+            timeout: Request timeout in seconds
+            default_headers: Additional headers for all requests
+            http2: Negotiate HTTP/2 so concurrent streams share connections
+                (requires the ``h2`` package, see the ``http2`` extra)
+            http_client: Shared httpx.AsyncClient to use instead of creating one.
+                It is not closed by this client; ``api_base`` becomes the
+                absolute request URL and auth headers are sent per request,
+                so clients with different tokens can share one pool.
+                ``timeout`` and ``http2`` come from the shared client
+            transport_config: Pool limits, keepalive and per-phase
+                timeouts for the created client (ignored with http_client)
+            coalesce_requests: Let identical concurrent questions share
+                one upstream stream (see EntriesService)
+            answer_cache: Cache answering repeat first questions without
+                going upstream
+            metrics: Sink receiving the StreamTiming (connect, headers,
+                time to first token, ...) of every answer stream
+            retry_config: Reconnect interrupted answer streams from their
+                cursor with this backoff policy (see StreamManager); None
+                streams without retries
+
+        """
+        self.api_base = api_base
+        self.auth_token = auth_token
+        self.timeout = timeout
+        self.default_headers = default_headers or {}
+
+        # Create HTTP client, unless a shared one is injected
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            config = transport_config or TransportConfig()
+            http_client = config.create_async_client(
+                timeout=timeout,
+                http2=http2,
+                base_url=api_base,
+                headers=self._build_headers(),
+                follow_redirects=True,
+            )
+            endpoint = SSE_ENDPOINT
+            request_headers = None
+        else:
+            # The shared client may serve other bases and tokens
+            endpoint = api_base.rstrip("/") + SSE_ENDPOINT
+            request_headers = self._build_headers()
+        self._http_client = http_client
+
+        # Initialize transport layers
+        self._sse_transport = AsyncSSETransport(
+            client=self._http_client,
+            endpoint=endpoint,
+            headers=request_headers,
+        )
+
+        # Initialize domain services
+        self._threads_service = ThreadsService()
+        stream_manager = None
+        if retry_config is not None:
+            stream_manager = AsyncStreamManager(self._sse_transport, retry_config=retry_config)
+        self._entries_service = AsyncEntriesService(
+            self._sse_transport,
+            coalesce_requests,
+            answer_cache,
+            metrics,
+            _cache_scope(auth_token),
+            stream_manager,
+        )
+        self._memories_service = MemoriesService()
+        self._collections_service = CollectionsService()
+        self._articles_service = ArticlesService()
+
+    def _build_headers(self) -> dict[str, str]:
+        """Build default headers for requests.
+
+        Returns:
+            Dictionary of default headers
+
+        """
+        return _build_default_headers(self.auth_token, self.default_headers)
+
+    @property
+    def threads(self) -> ThreadsService:
+        """Access threads service.
+
+        Returns:
+            ThreadsService instance
+
+        """
+        return self._threads_service
+
+    @property
+    def entries(self) -> AsyncEntriesService:
+        """Access async entries service.
+
+        Returns:
+            AsyncEntriesService instance
+
+        """
+        return self._entries_service
+
+    @property
+    def memories(self) -> MemoriesService:
+        """Access memories service.
+
+        Returns:
+            MemoriesService instance
+
+        """
+        return self._memories_service
+
+    @property
+    def collections(self) -> CollectionsService:
+        """Access collections service.
+
+        Returns:
+            CollectionsService instance
+
+        """
+        return self._collections_service
+
+    @property
+    def articles(self) -> ArticlesService:
+        """Access articles service.
+
+        Returns:
+            ArticlesService instance
+
+        """
+        return self._articles_service
+
+    def new_conversation(self, title: str | None = None) -> "AsyncConversation":
+        """Create a new conversation.
+
+        Args:
+            title: Optional conversation title
+
+        Returns:
+            AsyncConversation instance
+
+        """
+        return AsyncConversation(client=self, thread=_new_thread(title), entries=[])
+
+    def conversation_from_thread(self, slug_or_uuid: str) -> "AsyncConversation":
+        """Load an existing conversation from a thread.
+
+        Args:
+            slug_or_uuid: Thread slug or UUID
+
+        Returns:
+            AsyncConversation instance
+
+        Raises:
+            ValueError: If thread not found
+
+        """
+        thread = self._threads_service.get(slug_or_uuid)
+
+        if not thread:
+            raise ValueError(f"Thread not found: {slug_or_uuid}")
+
+        return AsyncConversation(client=self, thread=thread, entries=[])
+
+    async def warmup(self, n_connections: int = 1, path: str = "/") -> int:
+        """Open pooled connections ahead of the first request.
+
+        Async twin of PerplexityClient.warmup: ``n_connections`` concurrent
+        HEAD requests are held open until all are connected, leaving that
+        many ready connections in the pool for ``keepalive_expiry`` seconds.
+
+        Args:
+            n_connections: Number of connections to open
+            path: Path requested; the response status is ignored
+
+        Returns:
+            Number of connections opened
+
+        Raises:
+            httpx.HTTPError: If a warm-up request fails
+            asyncio.BrokenBarrierError: If the connections could not all be
+                open at once within ``timeout`` (e.g. pool limit too low)
+
+        """
+        if n_connections <= 0:
+            return 0
+
+        url = _warmup_url(self.api_base, path)
+        barrier = asyncio.Barrier(n_connections)
+
+        async def hold() -> None:
+            try:
+                async with self._http_client.stream("HEAD", url) as response:
+                    try:
+                        async with asyncio.timeout(self.timeout):
+                            await barrier.wait()
+                    except TimeoutError:
+                        raise asyncio.BrokenBarrierError from None
+                    # Finish the response so the connection returns to the pool
+                    await response.aread()
+            except BaseException:
+                await barrier.abort()
+                raise
+
+        results = await asyncio.gather(
+            *(hold() for _ in range(n_connections)), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise _warmup_error(errors)
+        return n_connections
+
+    def pool_stats(self) -> PoolStats | None:
+        """Report connection pool usage.
+
+        Returns:
+            PoolStats, or None for an injected client that was not built
+            with TransportConfig
+
+        """
+        return pool_stats(self._http_client)
+
+    async def aclose(self) -> None:
+        """Close HTTP client and cleanup resources.
+
+        An injected shared client is left open for its other users.
+        """
+        if self._http_client and self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncPerplexityClient":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.aclose()
+
+
+@dataclass
+class AsyncConversation:
+    """Stateful asyncio conversation wrapper.
+
+    Async twin of Conversation with automatic parent tracking.
+
+    Example:
+        >>> conv = client.new_conversation(title="Research")
+        >>> async for chunk in conv.ask_stream("What is AI?"):
+        ...     print(chunk.text, end="")
+        >>> entry = await conv.ask("Tell me more")
+
+    """
+
+    client: AsyncPerplexityClient
+    thread: Thread
+    entries: list[Entry] = field(default_factory=list)
+
+    @property
+    def context_uuid(self) -> str:
+        """Get conversation context UUID.
+
+        Returns:
+            Context UUID string
+
+        """
+        return self.thread.context_uuid
+
+    async def ask_stream(
+        self,
+        query: str,
+        mode: str = "concise",
+        model_preference: str = "pplx-70b-chat",
+        sources: list[str] | None = None,
+        events: Iterable[str] | None = None,
+        exclude_events: Iterable[str] | None = None,
+        timeouts: StreamTimeouts | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Ask a question and stream the response.
+
+        Args:
+            query: Question to ask
+            mode: Query mode (concise, research, etc.)
+            model_preference: Model to use
+            sources: List of source types
+            events: Event types to yield (EventType members or strings);
+                others are skipped before JSON decoding. None yields all
+            exclude_events: Event types to skip before JSON decoding
+            timeouts: Total deadline, first-byte and idle timeouts; a
+                passed limit raises StreamTimeoutError
+            **kwargs: Additional parameters
+
+        Yields:
+            StreamChunk objects from SSE stream
+
+        """
+        # Get parent entry UUID if we have entries
+        parent_entry_uuid = _parent_entry_uuid(self.entries)
+
+        async for chunk in self.client.entries.stream_ask(
+            query=query,
+            context_uuid=self.context_uuid,
+            mode=mode,
+            model_preference=model_preference,
+            sources=sources,
+            parent_entry_uuid=parent_entry_uuid,
+            share=not self.entries,
+            events=events,
+            exclude_events=exclude_events,
+            timeouts=timeouts,
+            **kwargs,
+        ):
+            yield chunk
+
+    async def ask(
+        self,
+        query: str,
+        mode: str = "concise",
+        model_preference: str = "pplx-70b-chat",
+        sources: list[str] | None = None,
+        timeouts: StreamTimeouts | None = None,
+        **kwargs: Any,
+    ) -> Entry:
+        """Ask a question and return the complete entry.
+
+        The entry is automatically added to the conversation history. A
+        snapshot (an answer replayed from the cache or another request's
+        stream) never becomes a parent: the next question is asked
+        upstream in this conversation's own thread.
+
+        Args:
+            query: Question to ask
+            mode: Query mode
+            model_preference: Model to use
+            sources: List of source types
+            timeouts: Total deadline, first-byte and idle timeouts
+            **kwargs: Additional parameters
+
+        Returns:
+            Complete Entry object
+
+        """
+        # Get parent entry UUID if we have entries
+        parent_entry_uuid = _parent_entry_uuid(self.entries)
+
+        entry = await self.client.entries.ask(
+            query=query,
+            context_uuid=self.context_uuid,
+            mode=mode,
+            model_preference=model_preference,
+            sources=sources,
+            parent_entry_uuid=parent_entry_uuid,
+            share=not self.entries,
+            timeouts=timeouts,
+            **kwargs,
+        )
+
+        # Add to conversation history
+        self.entries.append(entry)
+
+        return entry
+
+    def fork(self, from_entry: Entry | None = None) -> "AsyncConversation":
+        """Fork the conversation at a specific entry.
+
+        Args:
+            from_entry: Entry to fork from (default: last entry)
+
+        Returns:
+            New AsyncConversation instance
+
+        """
+        return AsyncConversation(
+            client=self.client,
+            thread=_fork_thread(self.thread),
+            entries=_fork_entries(self.entries, from_entry),
+        )
@@ -4,7 +4,9 @@ from pplx_sdk.core.exceptions import (
     AuthenticationError,
     PerplexitySDKError,
     RateLimitError,
+    SlowConsumerError,
     StreamingError,
+    StreamTimeoutError,
     TransportError,
     ValidationError,
 )
@@ -34,7 +36,9 @@ __all__ = [
     "RateLimitError",
     "SSEEventType",
     "SearchFocus",
+    "SlowConsumerError",
     "StreamParser",
+    "StreamTimeoutError",
     "StreamingError",
     # Protocols
     "Transport",
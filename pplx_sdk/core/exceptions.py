@@ -55,3 +55,35 @@ class ValidationError(PerplexitySDKError):
     """Request/response validation errors."""
 
     pass
+
+
+class StreamTimeoutError(StreamingError, TimeoutError):
+    """A stream exceeded its total deadline, first-byte or idle timeout.
+
+    Also a builtin ``TimeoutError``, so ``except TimeoutError`` keeps working.
+
+    Attributes:
+        kind: Limit that was exceeded: ``total``, ``first_byte`` or ``idle``
+        timeout: The limit in seconds
+
+    """
+
+    def __init__(self, message: str, kind: str, timeout: float) -> None:
+        """Initialize stream timeout error with the exceeded limit."""
+        super().__init__(message, {"kind": kind, "timeout": timeout})
+        self.kind = kind
+        self.timeout = timeout
+
+
+class SlowConsumerError(StreamingError):
+    """A broadcast subscriber fell too far behind and was disconnected.
+
+    Attributes:
+        max_queue: Chunks the subscriber was allowed to fall behind
+
+    """
+
+    def __init__(self, message: str, max_queue: int) -> None:
+        """Initialize slow consumer error with the queue limit."""
+        super().__init__(message, {"max_queue": max_queue})
+        self.max_queue = max_queue
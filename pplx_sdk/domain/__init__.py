@@ -1,19 +1,38 @@
 """Domain models and services for Perplexity API."""
 
 from pplx_sdk.domain.articles import ArticlesService
+from pplx_sdk.domain.cache import (
+    AnswerCache,
+    AnswerCacheBackend,
+    CachedAnswer,
+    FileCacheBackend,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    entry_chunks,
+)
 from pplx_sdk.domain.collections import CollectionsService
-from pplx_sdk.domain.entries import EntriesService
+from pplx_sdk.domain.entries import AsyncEntriesService, EntriesService, EntryAssembler
 from pplx_sdk.domain.memories import MemoriesService
-from pplx_sdk.domain.models import Entry, MessageChunk, Thread
+from pplx_sdk.domain.models import Entry, MessageChunk, StreamChunk, Thread
 from pplx_sdk.domain.threads import ThreadsService
 
 __all__ = [
+    "AnswerCache",
+    "AnswerCacheBackend",
     "ArticlesService",
+    "AsyncEntriesService",
+    "CachedAnswer",
     "CollectionsService",
     "EntriesService",
     "Entry",
+    "EntryAssembler",
+    "FileCacheBackend",
     "MemoriesService",
+    "MemoryCacheBackend",
     "MessageChunk",
+    "SQLiteCacheBackend",
+    "StreamChunk",
     "Thread",
     "ThreadsService",
+    "entry_chunks",
 ]
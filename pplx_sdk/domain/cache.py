@@ -0,0 +1,637 @@
+"""Answer cache for repeat questions.
+
+AnswerCache stores completed entries keyed on the normalized query plus
+mode, model and sources, so a repeated question is answered without going
+upstream. Keys are scoped by account (the clients pass a digest of their
+auth token), so a shared backend never replays one account's thread to
+another. Each mode has its own time to live; past it, an entry may still
+be served for ``stale_while_revalidate`` seconds while a fresh answer is
+fetched in the background.
+
+Cached entries are replayed as a synthetic stream (see entry_chunks()),
+so streaming callers see the same event sequence as for a live answer:
+one ``answer_chunk`` with the full text, then ``final_response``. The
+replayed entry lives in the thread that first asked the question, so it
+is marked as a snapshot and never becomes the parent of a follow-up.
+
+Backends store opaque bytes and implement the AnswerCacheBackend
+protocol. Three are provided:
+
+- MemoryCacheBackend: LRU dict bounded by the total size of the entries
+- SQLiteCacheBackend: a SQLite file that survives restarts
+- FileCacheBackend: one JSON file per answer in a directory
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from pplx_sdk.domain.models import Entry, StreamChunk
+from pplx_sdk.shared import codec
+
+logger = logging.getLogger("pplx_sdk.cache")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups.
+
+    Args:
+        query: Question as asked
+
+    Returns:
+        Case-folded query with whitespace collapsed
+
+    """
+    return " ".join(query.split()).casefold()
+
+
+def entry_chunks(entry: Entry) -> list[StreamChunk]:
+    """Build the synthetic stream replaying an entry.
+
+    Args:
+        entry: Completed entry
+
+    Returns:
+        An ``answer_chunk`` with the full text (if any) followed by the
+        ``final_response``; EntryAssembler rebuilds the entry from them
+
+    """
+    data = entry.model_dump(
+        mode="json", include={"backend_uuid", "display_model", "cursor", "blocks", "sources"}
+    )
+    chunks = []
+    text = "\n".join(block.content for block in entry.blocks)
+    if text:
+        chunks.append(
+            StreamChunk(
+                type="answer_chunk",
+                data={"text": text},
+                backend_uuid=entry.backend_uuid,
+                context_uuid=entry.context_uuid,
+                text=text,
+            )
+        )
+    chunks.append(
+        StreamChunk(
+            type="final_response",
+            status="completed",
+            data=data,
+            backend_uuid=entry.backend_uuid,
+            context_uuid=entry.context_uuid,
+            cursor=entry.cursor,
+        )
+    )
+    return chunks
+
+
+@dataclass
+class CachedAnswer:
+    """A cached entry and its freshness.
+
+    Attributes:
+        entry: The completed entry
+        stored_at: Unix time the entry was cached
+        fresh_until: Unix time after which the entry is stale
+        stale_until: Unix time after which the entry is no longer served
+
+    """
+
+    entry: Entry
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry is within its time to live."""
+        return time.time() < self.fresh_until
+
+    def to_json(self) -> bytes:
+        """Serialize the cached answer.
+
+        Returns:
+            JSON document as UTF-8 bytes
+
+        """
+        return codec.dumps(
+            {
+                "entry": self.entry.model_dump(mode="json"),
+                "stored_at": self.stored_at,
+                "fresh_until": self.fresh_until,
+                "stale_until": self.stale_until,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> CachedAnswer:
+        """Deserialize a cached answer written by to_json().
+
+        Args:
+            data: JSON document
+
+        Returns:
+            CachedAnswer instance
+
+        Raises:
+            ValueError: If the document is not a valid cached answer
+
+        """
+        try:
+            fields = codec.loads(data)
+            fields["entry"] = Entry.model_validate(fields["entry"])
+            return cls(**fields)
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid cached answer: {exc!r}") from exc
+
+
+@runtime_checkable
+class AnswerCacheBackend(Protocol):
+    """Storage backend for cached answers."""
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under a key, or None."""
+        ...
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        """Store a value; it may be discarded after ``expires_at``."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove a key, if present."""
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache bounded by the total size of its values.
+
+    Example:
+        >>> cache = AnswerCache(MemoryCacheBackend(max_bytes=16 * 1024 * 1024))
+
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """Initialize empty cache.
+
+        Args:
+            max_bytes: Total size of values kept; least recently used
+                values are evicted beyond it
+
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._values: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under a key and mark it recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored bytes, or None
+
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        """Store a value, evicting least recently used ones to fit.
+
+        Values larger than ``max_bytes`` are not stored.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+            expires_at: Unused; expiry is checked by AnswerCache
+
+        """
+        with self._lock:
+            self._pop(key)
+            if len(value) > self.max_bytes:
+                return
+            self._values[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._values.popitem(last=False)
+                self.size -= len(evicted)
+
+    def delete(self, key: str) -> None:
+        """Remove a key, if present.
+
+        Args:
+            key: Cache key
+
+        """
+        with self._lock:
+            self._pop(key)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _pop(self, key: str) -> None:
+        value = self._values.pop(key, None)
+        if value is not None:
+            self.size -= len(value)
+
+
+class SQLiteCacheBackend:
+    """Cache in a SQLite file.
+
+    Uses WAL journaling with ``synchronous=NORMAL`` like
+    SQLiteCheckpointStore. Expired rows are removed by purge().
+
+    Example:
+        >>> cache = AnswerCache(SQLiteCacheBackend("~/.cache/pplx/answers.db"))
+
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path: Database file path; ``:memory:`` for a private in-memory
+                database
+
+        """
+        path = str(path) if str(path) == ":memory:" else str(Path(path).expanduser())
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored bytes, or None
+
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM answers WHERE key = ?", (key,)).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        """Insert or replace a value.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+            expires_at: Unix time after which purge() removes the row
+
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?)", (key, value, expires_at)
+            )
+
+    def delete(self, key: str) -> None:
+        """Remove a key, if present.
+
+        Args:
+            key: Cache key
+
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+
+    def purge(self) -> int:
+        """Remove expired rows.
+
+        Returns:
+            Number of rows removed
+
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM answers WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class FileCacheBackend:
+    """Cache as one file per key in a directory.
+
+    Files are written to a temporary name and renamed into place, so
+    readers in other processes never see a partial value. Expired files
+    are removed by purge().
+
+    Example:
+        >>> cache = AnswerCache(FileCacheBackend("~/.cache/pplx/answers"))
+
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        """Create the cache directory if needed.
+
+        Args:
+            directory: Directory holding the cache files
+
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored bytes, or None
+
+        """
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        """Write a value atomically.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+            expires_at: Unix time after which purge() removes the file; kept
+                as the file's modification time
+
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(value)
+            os.utime(tmp, (expires_at, expires_at))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        """Remove a key, if present.
+
+        Args:
+            key: Cache key
+
+        """
+        self._path(key).unlink(missing_ok=True)
+
+    def purge(self) -> int:
+        """Remove expired files.
+
+        Returns:
+            Number of files removed
+
+        """
+        now = time.time()
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime <= now:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+
+class AnswerCache:
+    """Cache of completed entries with per-mode TTLs.
+
+    Attributes:
+        backend: Where cached answers are stored
+        ttl: Seconds an answer stays fresh, for modes without their own TTL
+        mode_ttls: TTL per mode; 0 disables caching for a mode
+        stale_while_revalidate: Seconds a stale answer may still be served
+            while a fresh one is fetched
+        hits: Lookups answered with a fresh entry
+        stale_hits: Lookups answered with a stale entry
+        misses: Lookups that found nothing servable
+
+    Example:
+        >>> cache = AnswerCache(ttl=600, mode_ttls={"research": 3600}, stale_while_revalidate=60)
+        >>> client = PerplexityClient(auth_token=token, answer_cache=cache)
+
+    """
+
+    def __init__(
+        self,
+        backend: AnswerCacheBackend | None = None,
+        ttl: float = 300.0,
+        mode_ttls: dict[str, float] | None = None,
+        stale_while_revalidate: float = 0.0,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            backend: Storage backend (default: MemoryCacheBackend)
+            ttl: Default seconds an answer stays fresh
+            mode_ttls: TTL per mode, overriding ``ttl``
+            stale_while_revalidate: Seconds a stale answer may be served
+
+        """
+        self.backend: AnswerCacheBackend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.mode_ttls = dict(mode_ttls or {})
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._revalidating: set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix: str = "PPLX_ANSWER_CACHE") -> AnswerCache | None:
+        """Build a cache from environment variables.
+
+        ``<prefix>`` selects the backend: ``memory``, ``sqlite:<path>`` or
+        ``files:<directory>``. ``<prefix>_TTL``, ``<prefix>_STALE`` and
+        ``<prefix>_MAX_BYTES`` set the default TTL, the stale window and
+        the memory bound; ``<prefix>_TTL_<MODE>`` the TTL of one mode,
+        e.g. ``PPLX_ANSWER_CACHE_TTL_RESEARCH``.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            AnswerCache, or None if ``<prefix>`` is unset
+
+        Raises:
+            ValueError: If the backend is unknown or a number is invalid
+
+        """
+        spec = os.getenv(prefix)
+        if not spec:
+            return None
+        kind, _, location = spec.partition(":")
+        backend: AnswerCacheBackend
+        if kind == "memory":
+            max_bytes = os.getenv(f"{prefix}_MAX_BYTES")
+            backend = MemoryCacheBackend(int(max_bytes)) if max_bytes else MemoryCacheBackend()
+        elif kind == "sqlite" and location:
+            backend = SQLiteCacheBackend(location)
+        elif kind == "files" and location:
+            backend = FileCacheBackend(location)
+        else:
+            raise ValueError(f"Unknown answer cache backend: {spec!r}")
+
+        ttl_prefix = f"{prefix}_TTL_"
+        mode_ttls = {
+            name[len(ttl_prefix) :].lower(): float(value)
+            for name, value in os.environ.items()
+            if name.startswith(ttl_prefix) and value
+        }
+        return cls(
+            backend,
+            ttl=float(os.getenv(f"{prefix}_TTL") or 300.0),
+            mode_ttls=mode_ttls,
+            stale_while_revalidate=float(os.getenv(f"{prefix}_STALE") or 0.0),
+        )
+
+    @staticmethod
+    def key(
+        query: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None = None,
+        scope: str = "",
+    ) -> str:
+        """Build the cache key of a question.
+
+        Args:
+            query: Question; normalized with normalize_query()
+            mode: Query mode
+            model_preference: Model
+            sources: Source types, in any order
+            scope: Account the answer belongs to; answers are never
+                shared across scopes
+
+        Returns:
+            Hex digest identifying the question
+
+        """
+        document = [scope, normalize_query(query), mode, model_preference, sorted(sources or ())]
+        return hashlib.sha256(codec.dumps(document)).hexdigest()
+
+    def ttl_for(self, mode: str) -> float:
+        """Seconds an answer in a mode stays fresh.
+
+        Args:
+            mode: Query mode
+
+        Returns:
+            TTL in seconds; 0 when the mode is not cached
+
+        """
+        return self.mode_ttls.get(mode, self.ttl)
+
+    def get(self, key: str) -> CachedAnswer | None:
+        """Look up an answer that may still be served.
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            CachedAnswer (check ``fresh``), or None when there is no
+            answer, it is past its stale window or it cannot be decoded
+
+        """
+        data = self.backend.get(key)
+        try:
+            cached = None if data is None else CachedAnswer.from_json(data)
+        except ValueError:
+            # Corrupt or written by an incompatible version; drop it
+            logger.warning("Dropping an undecodable cached answer", exc_info=True)
+            self.backend.delete(key)
+            cached = None
+        if cached is not None and time.time() >= cached.stale_until:
+            self.backend.delete(key)
+            cached = None
+
+        # Lookups may run in worker threads (see AsyncEntriesService)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            elif cached.fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return cached
+
+    def put(self, key: str, entry: Entry, mode: str) -> None:
+        """Cache a completed entry.
+
+        Args:
+            key: Cache key from key()
+            entry: Entry to cache
+            mode: Query mode, selecting the TTL
+
+        """
+        ttl = self.ttl_for(mode)
+        if ttl <= 0:
+            return
+        now = time.time()
+        cached = CachedAnswer(entry, now, now + ttl, now + ttl + self.stale_while_revalidate)
+        self.backend.set(key, cached.to_json(), cached.stale_until)
+
+    def claim_revalidation(self, key: str) -> bool:
+        """Reserve the refresh of a stale answer.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the caller should refresh the answer; False if a
+            refresh is already running
+
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def release_revalidation(self, key: str) -> None:
+        """Mark the refresh of an answer as finished.
+
+        Args:
+            key: Cache key
+
+        """
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def stats(self) -> dict[str, Any]:
+        """Lookup counters.
+
+        Returns:
+            Dictionary with hits, stale_hits and misses
+
+        """
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
@@ -5,18 +5,296 @@ Provides high-level API for asking questions and streaming responses.
 
 from __future__ import annotations
 
+import asyncio
+import io
+import logging
+import threading
 import uuid
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator, Iterable
+from contextlib import aclosing, closing
+from functools import partial
 from typing import Any
 
-from pplx_sdk.domain.models import Entry, MessageChunk, StreamStatus
-from pplx_sdk.transport.sse import SSETransport
+from pplx_sdk.domain.cache import AnswerCache, entry_chunks
+from pplx_sdk.domain.models import Block, Entry, Source, StreamChunk, StreamStatus
+from pplx_sdk.shared.metrics import MetricsSink, StreamTiming, atimed, timed
+from pplx_sdk.streaming.coalesce import AsyncStreamCoalescer, StreamCoalescer
+from pplx_sdk.streaming.manager import AsyncStreamManager, StreamManager
+from pplx_sdk.transport.sse import AsyncSSETransport, SSETransport, event_filter
+
+# Events ask() folds into the Entry; everything else is skipped undecoded
+_ASK_EVENTS = frozenset({"answer_chunk", "final_response", "error"})
+
+# Request options that do not change the answer
+_SHAREABLE_EXTRA = frozenset({"timeouts"})
+
+logger = logging.getLogger("pplx_sdk.cache")
+
+
+def _shareable(parent_entry_uuid: str | None, extra: dict[str, Any]) -> bool:
+    """Whether the answer to a request depends only on the question.
+
+    Follow-up questions and requests with extra parameters are never
+    coalesced or cached. The thread (``context_uuid``) does not matter: a
+    shared answer keeps the thread it was created in, see _flight().
+
+    """
+    return parent_entry_uuid is None and _SHAREABLE_EXTRA.issuperset(extra)
+
+
+def _flight_key(
+    query: str,
+    mode: str,
+    model_preference: str,
+    sources: list[str] | None,
+    events: Iterable[str] | None,
+    exclude_events: Iterable[str] | None,
+) -> tuple[Any, ...]:
+    """Key under which identical requests share one upstream stream."""
+    return (
+        query,
+        mode,
+        model_preference,
+        frozenset(sources or ()),
+        None if events is None else frozenset(events),
+        None if exclude_events is None else frozenset(exclude_events),
+    )
+
+
+def _with_ask_events(
+    events: Iterable[str] | None, exclude_events: Iterable[str] | None
+) -> tuple[frozenset[str] | None, frozenset[str]]:
+    """Widen an event filter to the events an Entry is assembled from."""
+    return (
+        None if events is None else _ASK_EVENTS.union(events),
+        frozenset(exclude_events or ()).difference(_ASK_EVENTS),
+    )
+
+
+def _flight(
+    open_stream: Callable[..., Generator[StreamChunk, None, None]],
+    context_uuid: str,
+    metrics: MetricsSink | None,
+) -> Generator[StreamChunk, None, None]:
+    """Run the upstream stream of a coalesced flight.
+
+    The upstream gets its own StreamTiming, recorded once when it ends,
+    however many callers joined or left; callers time only what they
+    receive. Chunks are stamped with the leader's thread: callers joining
+    the stream asked in other threads, and the stamp on the final response
+    makes their entries snapshots of the leader's.
+    """
+    timing = None if metrics is None else StreamTiming()
+    upstream = open_stream(timing=timing)
+    chunks = upstream if timing is None else timed(upstream, timing, metrics)
+    with closing(upstream), closing(chunks):
+        for chunk in chunks:
+            if chunk.context_uuid is None:
+                chunk.context_uuid = context_uuid
+            yield chunk
+
+
+async def _aflight(
+    open_stream: Callable[..., AsyncGenerator[StreamChunk, None]],
+    context_uuid: str,
+    metrics: MetricsSink | None,
+) -> AsyncGenerator[StreamChunk, None]:
+    """Run the upstream stream of a coalesced async flight, as _flight() does."""
+    timing = None if metrics is None else StreamTiming()
+    chunks = open_stream(timing=timing)
+    if timing is not None:
+        chunks = atimed(chunks, timing, metrics)
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            if chunk.context_uuid is None:
+                chunk.context_uuid = context_uuid
+            yield chunk
+
+
+def _join_flight(timing: StreamTiming | None, leader: bool) -> None:
+    """Record a caller's role in a coalesced flight as its timing source."""
+    if timing is not None:
+        timing.source = "leader" if leader else "coalesced"
+
+
+class EntryAssembler:
+    """Fold streamed chunks into an Entry as they arrive.
+
+    The current text, blocks and sources can be read at any point, so
+    callers can render partial answers. Answer text accumulates in a
+    StringIO; when the final response carries blocks they replace it and
+    the buffer is released. If the final response has no blocks, the
+    streamed text becomes a single text block.
+
+    A final response stamped with another thread's context UUID (a cached
+    answer, or one shared with an identical request) is a snapshot: the
+    entry keeps that thread's context UUID, so its backend and context
+    UUIDs belong together, and ``snapshot`` is set.
+
+    Example:
+        >>> assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        >>> for chunk in entries.stream_ask(query, context_uuid=context_uuid):
+        ...     if assembler.feed(chunk):
+        ...         break
+        ...     print(assembler.text)
+        >>> entry = assembler.build()
+
+    """
+
+    def __init__(self, query: str, context_uuid: str, frontend_uuid: str) -> None:
+        """Initialize an empty entry.
+
+        Args:
+            query: Question being asked
+            context_uuid: Thread context UUID
+            frontend_uuid: Client-generated entry UUID
+
+        """
+        self.query = query
+        self.context_uuid = context_uuid
+        self.frontend_uuid = frontend_uuid
+        self.status = StreamStatus.PENDING
+        self.backend_uuid: str | None = None
+        self.display_model: str | None = None
+        self.cursor: str | None = None
+        self.snapshot = False
+        self.complete = False
+
+        self._text: io.StringIO | None = io.StringIO()
+        self._blocks: list[dict[str, Any]] = []
+        self._sources: list[dict[str, Any]] = []
+
+    def feed(self, chunk: StreamChunk) -> bool:
+        """Fold one chunk into the entry.
+
+        Args:
+            chunk: Chunk received from the stream
+
+        Returns:
+            True once the final response has been received
+
+        """
+        if chunk.type == "answer_chunk":
+            if chunk.text and self._text is not None:
+                self._text.write(chunk.text)
+            if chunk.backend_uuid:
+                self.backend_uuid = chunk.backend_uuid
+
+        elif chunk.type == "final_response":
+            data = chunk.data
+            self.backend_uuid = data.get("backend_uuid", "")
+            if chunk.context_uuid and chunk.context_uuid != self.context_uuid:
+                self.context_uuid = chunk.context_uuid
+                self.snapshot = True
+            self.display_model = data.get("display_model")
+            self.cursor = data.get("cursor")
+            self.status = StreamStatus.COMPLETED
+            self.complete = True
+
+            if "sources" in data:
+                self._sources = data["sources"]
+
+            if data.get("blocks"):
+                # The blocks carry the full answer; drop the streamed copy
+                self._blocks = data["blocks"]
+                self._text = None
+            elif self._text is not None and self._text.tell():
+                self._blocks = [{"type": "text", "content": self._text.getvalue()}]
+
+        elif chunk.type == "error":
+            self.status = StreamStatus.FAILED
+
+        return self.complete
+
+    @property
+    def text(self) -> str:
+        """Answer text received so far."""
+        if self._text is not None:
+            return self._text.getvalue()
+        return "\n".join(str(block.get("content", "")) for block in self._blocks)
+
+    @property
+    def blocks(self) -> list[Block]:
+        """Answer blocks; a single text block while the answer streams."""
+        if not self.complete:
+            text = self.text
+            return [Block(type="text", content=text)] if text else []
+        return [Block.model_validate(block) for block in self._blocks]
+
+    @property
+    def sources(self) -> list[Source]:
+        """Citation sources from the final response."""
+        return [Source.model_validate(source) for source in self._sources]
+
+    def partial(self) -> Entry:
+        """Snapshot the entry as it stands, without validation.
+
+        Returns:
+            Entry built with model_construct; fields not yet received are
+            None or empty
+
+        """
+        return Entry.model_construct(
+            backend_uuid=self.backend_uuid,
+            frontend_uuid=self.frontend_uuid,
+            context_uuid=self.context_uuid,
+            status=self.status,
+            text_completed=self.complete,
+            blocks=self.blocks,
+            sources=self.sources,
+            query=self.query,
+            display_model=self.display_model,
+            cursor=self.cursor,
+            snapshot=self.snapshot,
+        )
+
+    def build(self) -> Entry:
+        """Validate the assembled fields into an Entry.
+
+        Returns:
+            Complete Entry object
+
+        Raises:
+            ValueError: If no final response was received
+
+        """
+        if not self.complete:
+            raise ValueError("No final_response received from stream")
+
+        return Entry.model_validate(
+            {
+                "backend_uuid": self.backend_uuid,
+                "frontend_uuid": self.frontend_uuid,
+                "context_uuid": self.context_uuid,
+                "status": self.status,
+                "text_completed": True,
+                "blocks": self._blocks,
+                "sources": self._sources,
+                "query": self.query,
+                "display_model": self.display_model,
+                "cursor": self.cursor,
+                "snapshot": self.snapshot,
+            }
+        )
 
 
 class EntriesService:
     """Service for managing entries (Q&A pairs).
 
     Handles question-asking with SSE streaming and synchronous wrappers.
+    With ``coalesce=True``, identical concurrent first questions (same
+    query, mode, model, sources and event filter) share one upstream
+    stream and every caller gets its own replay of it, including the
+    leader's context and backend UUIDs.
+
+    With an AnswerCache, completed answers to first questions are cached
+    and repeats are replayed from the cache as a synthetic stream; a stale
+    answer is served while a background thread fetches a fresh one. Cache
+    keys are scoped by ``cache_scope``, so one backend can serve several
+    accounts without replaying one account's threads to another.
+
+    Entries built from another caller's stream or from the cache are
+    snapshots (``Entry.snapshot``) of an answer in another thread.
 
     Example:
         >>> entries = EntriesService(transport)
@@ -27,14 +305,37 @@ class EntriesService:
 
     """
 
-    def __init__(self, sse_transport: SSETransport) -> None:
+    def __init__(
+        self,
+        sse_transport: SSETransport,
+        coalesce: bool = False,
+        cache: AnswerCache | None = None,
+        metrics: MetricsSink | None = None,
+        cache_scope: str = "",
+        stream_manager: StreamManager | None = None,
+    ) -> None:
         """Initialize entries service.
 
         Args:
             sse_transport: SSETransport instance for streaming
+            coalesce: Share one upstream stream between identical
+                concurrent requests
+            cache: Cache answering repeat questions
+            metrics: Sink receiving the StreamTiming of every stream
+            cache_scope: Account the cached answers belong to, e.g. a
+                digest of the auth token; answers are only replayed to
+                requests of the same scope
+            stream_manager: Reconnects interrupted upstream streams from
+                their cursor, counting the retries in their StreamTiming;
+                None streams straight from the transport
 
         """
         self.transport = sse_transport
+        self.coalescer = StreamCoalescer() if coalesce else None
+        self.cache = cache
+        self.metrics = metrics
+        self.cache_scope = cache_scope
+        self.stream_manager = stream_manager
 
     def stream_ask(
         self,
@@ -45,8 +346,12 @@ class EntriesService:
         sources: list[str] | None = None,
         parent_entry_uuid: str | None = None,
         frontend_uuid: str | None = None,
+        events: Iterable[str] | None = None,
+        exclude_events: Iterable[str] | None = None,
+        timing: StreamTiming | None = None,
+        share: bool = True,
         **extra: Any,
-    ) -> Generator[MessageChunk, None, None]:
+    ) -> Generator[StreamChunk, None, None]:
         """Stream a question and yield SSE events.
 
         Args:
@@ -57,10 +362,18 @@ class EntriesService:
             sources: List of source types
             parent_entry_uuid: Parent entry for threaded queries
             frontend_uuid: Client-generated entry UUID (auto-generated if not provided)
+            events: Event types to yield (EventType members or strings);
+                others are skipped before JSON decoding. None yields all
+            exclude_events: Event types to skip before JSON decoding
+            timing: Latency breakdown to fill; one is created when the
+                service has a metrics sink. It is finished and sent to the
+                sink when the stream ends
+            share: Allow a first question to be answered from the answer
+                cache or a coalesced stream; follow-ups are never shared
             **extra: Additional parameters
 
         Yields:
-            MessageChunk objects from SSE stream
+            StreamChunk objects from SSE stream
 
         Raises:
             httpx.HTTPError: On HTTP errors
@@ -70,8 +383,63 @@ class EntriesService:
         if not frontend_uuid:
             frontend_uuid = str(uuid.uuid4())
 
-        # Stream from transport
-        yield from self.transport.stream(
+        if timing is None and self.metrics is not None:
+            timing = StreamTiming()
+        chunks = self._stream_ask(
+            query,
+            context_uuid,
+            mode,
+            model_preference,
+            sources,
+            parent_entry_uuid,
+            frontend_uuid,
+            events,
+            exclude_events,
+            timing,
+            share,
+            extra,
+        )
+        if timing is None:
+            yield from chunks
+        else:
+            yield from timed(chunks, timing, self.metrics)
+
+    def _stream_ask(
+        self,
+        query: str,
+        context_uuid: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        parent_entry_uuid: str | None,
+        frontend_uuid: str,
+        events: Iterable[str] | None,
+        exclude_events: Iterable[str] | None,
+        timing: StreamTiming | None,
+        share: bool,
+        extra: dict[str, Any],
+    ) -> Generator[StreamChunk, None, None]:
+        """Serve stream_ask() from the cache, a shared stream or upstream."""
+        shareable = share and _shareable(parent_entry_uuid, extra)
+        cache_key = None
+        if self.cache is not None and shareable:
+            cache_key = self.cache.key(query, mode, model_preference, sources, self.cache_scope)
+            cached = self.cache.get(cache_key)
+            keep = event_filter(events, exclude_events)
+            if cached is not None:
+                if timing is not None:
+                    timing.source = "cache"
+                if not cached.fresh:
+                    self._revalidate(cache_key, query, mode, model_preference, sources, extra)
+                for chunk in entry_chunks(cached.entry):
+                    if keep is None or keep(chunk.type):
+                        yield chunk
+                return
+            # Whatever the caller filters, the answer is assembled for the cache
+            events, exclude_events = _with_ask_events(events, exclude_events)
+
+        stream = partial(
+            self.transport.stream if self.stream_manager is None else self.stream_manager.stream,
             query=query,
             context_uuid=context_uuid,
             frontend_uuid=frontend_uuid,
@@ -79,8 +447,82 @@ class EntriesService:
             model_preference=model_preference,
             sources=sources,
             parent_entry_uuid=parent_entry_uuid,
+            events=events,
+            exclude_events=exclude_events,
+            timing=timing,
             **extra,
         )
+        if self.coalescer is not None and shareable:
+            # Share the stream of an identical request in flight
+            key = _flight_key(query, mode, model_preference, sources, events, exclude_events)
+            stream = partial(
+                self.coalescer.stream,
+                key,
+                partial(_flight, stream, context_uuid, self.metrics),
+                partial(_join_flight, timing),
+            )
+
+        if self.cache is None or cache_key is None:
+            yield from stream()
+            return
+
+        assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        for chunk in stream():
+            # Cache before yielding; callers may stop at the final response
+            if not assembler.complete and assembler.feed(chunk):
+                self.cache.put(cache_key, assembler.build(), mode)
+            if keep is None or keep(chunk.type):
+                yield chunk
+
+    def _revalidate(
+        self,
+        cache_key: str,
+        query: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        extra: dict[str, Any],
+    ) -> None:
+        """Refresh a stale cached answer in a background thread."""
+        cache = self.cache
+        if cache is None or not cache.claim_revalidation(cache_key):
+            return
+
+        def refresh() -> None:
+            try:
+                entry = self._fetch(query, mode, model_preference, sources, extra)
+                cache.put(cache_key, entry, mode)
+            except Exception:
+                logger.warning("Refreshing a cached answer failed", exc_info=True)
+            finally:
+                cache.release_revalidation(cache_key)
+
+        threading.Thread(target=refresh, name="pplx-cache-refresh", daemon=True).start()
+
+    def _fetch(
+        self,
+        query: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        extra: dict[str, Any],
+    ) -> Entry:
+        """Ask a first question upstream in a new thread, bypassing the cache."""
+        context_uuid, frontend_uuid = str(uuid.uuid4()), str(uuid.uuid4())
+        assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        for chunk in self.transport.stream(
+            query=query,
+            context_uuid=context_uuid,
+            frontend_uuid=frontend_uuid,
+            mode=mode,
+            model_preference=model_preference,
+            sources=sources,
+            events=_ASK_EVENTS,
+            **extra,
+        ):
+            if assembler.feed(chunk):
+                break
+        return assembler.build()
 
     def ask(
         self,
@@ -91,6 +533,7 @@ class EntriesService:
         sources: list[str] | None = None,
         parent_entry_uuid: str | None = None,
         frontend_uuid: str | None = None,
+        share: bool = True,
         **extra: Any,
     ) -> Entry:
         """Ask a question and return the complete entry.
@@ -105,10 +548,13 @@ class EntriesService:
             sources: List of source types
             parent_entry_uuid: Parent entry for threaded queries
             frontend_uuid: Client-generated entry UUID
+            share: Allow a first question to be answered from the answer
+                cache or a coalesced stream
             **extra: Additional parameters
 
         Returns:
-            Complete Entry object
+            Complete Entry object; its ``timing`` holds the latency
+            breakdown of the stream
 
         Raises:
             httpx.HTTPError: On HTTP errors
@@ -119,60 +565,339 @@ class EntriesService:
         if not frontend_uuid:
             frontend_uuid = str(uuid.uuid4())
 
-        # Collect stream
-        entry_data: dict[str, Any] = {
-            "frontend_uuid": frontend_uuid,
-            "context_uuid": context_uuid,
-            "query": query,
-            "status": StreamStatus.PENDING,
-            "text_completed": False,
-            "blocks": [],
-            "sources": [],
-        }
+        assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        timing = StreamTiming()
+
+        stream = self.stream_ask(
+            query=query,
+            context_uuid=context_uuid,
+            mode=mode,
+            model_preference=model_preference,
+            sources=sources,
+            parent_entry_uuid=parent_entry_uuid,
+            frontend_uuid=frontend_uuid,
+            events=_ASK_EVENTS,
+            timing=timing,
+            share=share,
+            **extra,
+        )
+        with closing(stream):
+            for chunk in stream:
+                if assembler.feed(chunk):
+                    # Stop reading at the final response; the stream is closed
+                    break
+
+        entry = assembler.build()
+        entry.timing = timing
+        return entry
 
-        text_chunks: list[str] = []
 
-        for chunk in self.stream_ask(
+class AsyncEntriesService:
+    """Asyncio service for managing entries (Q&A pairs).
+
+    Async twin of EntriesService backed by AsyncSSETransport, with the
+    same ``coalesce`` and ``cache`` options; stale answers are refreshed
+    in a background task.
+
+    Example:
+        >>> entries = AsyncEntriesService(transport)
+        >>> async for chunk in entries.stream_ask("What is AI?", context_uuid="uuid"):
+        ...     print(chunk.text, end="")
+        >>> entry = await entries.ask("What is AI?", context_uuid="uuid")
+
+    """
+
+    def __init__(
+        self,
+        sse_transport: AsyncSSETransport,
+        coalesce: bool = False,
+        cache: AnswerCache | None = None,
+        metrics: MetricsSink | None = None,
+        cache_scope: str = "",
+        stream_manager: AsyncStreamManager | None = None,
+    ) -> None:
+        """Initialize async entries service.
+
+        Args:
+            sse_transport: AsyncSSETransport instance for streaming
+            coalesce: Share one upstream stream between identical
+                concurrent requests
+            cache: Cache answering repeat questions
+            metrics: Sink receiving the StreamTiming of every stream
+            cache_scope: Account the cached answers belong to, e.g. a
+                digest of the auth token; answers are only replayed to
+                requests of the same scope
+            stream_manager: Reconnects interrupted upstream streams from
+                their cursor, counting the retries in their StreamTiming;
+                None streams straight from the transport
+
+        """
+        self.transport = sse_transport
+        self.coalescer = AsyncStreamCoalescer() if coalesce else None
+        self.cache = cache
+        self.metrics = metrics
+        self.cache_scope = cache_scope
+        self.stream_manager = stream_manager
+        # Background refreshes of stale answers
+        self._refreshes: set[asyncio.Task[None]] = set()
+
+    async def stream_ask(
+        self,
+        query: str,
+        context_uuid: str,
+        mode: str = "concise",
+        model_preference: str = "pplx-70b-chat",
+        sources: list[str] | None = None,
+        parent_entry_uuid: str | None = None,
+        frontend_uuid: str | None = None,
+        events: Iterable[str] | None = None,
+        exclude_events: Iterable[str] | None = None,
+        timing: StreamTiming | None = None,
+        share: bool = True,
+        **extra: Any,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream a question and yield SSE events.
+
+        Args:
+            query: Question to ask
+            context_uuid: Thread context UUID
+            mode: Query mode (concise, research, etc.)
+            model_preference: Model to use
+            sources: List of source types
+            parent_entry_uuid: Parent entry for threaded queries
+            frontend_uuid: Client-generated entry UUID (auto-generated if not provided)
+            events: Event types to yield (EventType members or strings);
+                others are skipped before JSON decoding. None yields all
+            exclude_events: Event types to skip before JSON decoding
+            timing: Latency breakdown to fill; one is created when the
+                service has a metrics sink. It is finished and sent to the
+                sink when the stream ends
+            share: Allow a first question to be answered from the answer
+                cache or a coalesced stream; follow-ups are never shared
+            **extra: Additional parameters
+
+        Yields:
+            StreamChunk objects from SSE stream
+
+        Raises:
+            httpx.HTTPError: On HTTP errors
+
+        """
+        # Generate frontend UUID if not provided
+        if not frontend_uuid:
+            frontend_uuid = str(uuid.uuid4())
+
+        if timing is None and self.metrics is not None:
+            timing = StreamTiming()
+        chunks = self._stream_ask(
+            query,
+            context_uuid,
+            mode,
+            model_preference,
+            sources,
+            parent_entry_uuid,
+            frontend_uuid,
+            events,
+            exclude_events,
+            timing,
+            share,
+            extra,
+        )
+        if timing is not None:
+            chunks = atimed(chunks, timing, self.metrics)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+
+    async def _stream_ask(
+        self,
+        query: str,
+        context_uuid: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        parent_entry_uuid: str | None,
+        frontend_uuid: str,
+        events: Iterable[str] | None,
+        exclude_events: Iterable[str] | None,
+        timing: StreamTiming | None,
+        share: bool,
+        extra: dict[str, Any],
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Serve stream_ask() from the cache, a shared stream or upstream."""
+        shareable = share and _shareable(parent_entry_uuid, extra)
+        cache_key = None
+        if self.cache is not None and shareable:
+            cache_key = self.cache.key(query, mode, model_preference, sources, self.cache_scope)
+            # Backends may read files or SQLite; keep that off the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            keep = event_filter(events, exclude_events)
+            if cached is not None:
+                if timing is not None:
+                    timing.source = "cache"
+                if not cached.fresh:
+                    self._revalidate(cache_key, query, mode, model_preference, sources, extra)
+                for chunk in entry_chunks(cached.entry):
+                    if keep is None or keep(chunk.type):
+                        yield chunk
+                return
+            # Whatever the caller filters, the answer is assembled for the cache
+            events, exclude_events = _with_ask_events(events, exclude_events)
+
+        stream = partial(
+            self.transport.stream if self.stream_manager is None else self.stream_manager.stream,
             query=query,
             context_uuid=context_uuid,
+            frontend_uuid=frontend_uuid,
             mode=mode,
             model_preference=model_preference,
             sources=sources,
             parent_entry_uuid=parent_entry_uuid,
+            events=events,
+            exclude_events=exclude_events,
+            timing=timing,
+            **extra,
+        )
+        if self.coalescer is not None and shareable:
+            # Share the stream of an identical request in flight
+            key = _flight_key(query, mode, model_preference, sources, events, exclude_events)
+            stream = partial(
+                self.coalescer.stream,
+                key,
+                partial(_aflight, stream, context_uuid, self.metrics),
+                partial(_join_flight, timing),
+            )
+
+        if self.cache is None or cache_key is None:
+            async with aclosing(stream()) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+            return
+
+        assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        async with aclosing(stream()) as chunks:
+            async for chunk in chunks:
+                # Cache before yielding; callers may stop at the final response
+                if not assembler.complete and assembler.feed(chunk):
+                    await asyncio.to_thread(self.cache.put, cache_key, assembler.build(), mode)
+                if keep is None or keep(chunk.type):
+                    yield chunk
+
+    def _revalidate(
+        self,
+        cache_key: str,
+        query: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        extra: dict[str, Any],
+    ) -> None:
+        """Refresh a stale cached answer in a background task."""
+        cache = self.cache
+        if cache is None or not cache.claim_revalidation(cache_key):
+            return
+
+        async def refresh() -> None:
+            try:
+                entry = await self._fetch(query, mode, model_preference, sources, extra)
+                await asyncio.to_thread(cache.put, cache_key, entry, mode)
+            except Exception:
+                logger.warning("Refreshing a cached answer failed", exc_info=True)
+            finally:
+                cache.release_revalidation(cache_key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _fetch(
+        self,
+        query: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        extra: dict[str, Any],
+    ) -> Entry:
+        """Ask a first question upstream in a new thread, bypassing the cache."""
+        context_uuid, frontend_uuid = str(uuid.uuid4()), str(uuid.uuid4())
+        assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        stream = self.transport.stream(
+            query=query,
+            context_uuid=context_uuid,
             frontend_uuid=frontend_uuid,
+            mode=mode,
+            model_preference=model_preference,
+            sources=sources,
+            events=_ASK_EVENTS,
             **extra,
-        ):
-            # Accumulate text chunks
-            if chunk.text:
-                text_chunks.append(chunk.text)
-
-            # Update from final_response
-            if chunk.type == "final_response":
-                entry_data.update(
-                    {
-                        "backend_uuid": chunk.data.get("backend_uuid", ""),
-                        "status": StreamStatus.COMPLETED,
-                        "text_completed": True,
-                        "display_model": chunk.data.get("display_model"),
-                        "cursor": chunk.data.get("cursor"),
-                    }
-                )
-
-                # Extract blocks if present
-                if "blocks" in chunk.data:
-                    entry_data["blocks"] = chunk.data["blocks"]
-
-                # Extract sources if present
-                if "sources" in chunk.data:
-                    entry_data["sources"] = chunk.data["sources"]
-
-            # Handle error
-            if chunk.type == "error":
-                entry_data["status"] = StreamStatus.FAILED
-
-        # Ensure backend_uuid is present
-        if "backend_uuid" not in entry_data:
-            raise ValueError("No final_response received from stream")
+        )
+        async with aclosing(stream):
+            async for chunk in stream:
+                if assembler.feed(chunk):
+                    break
+        return assembler.build()
 
-        # Create and return entry
-        return Entry(**entry_data)
+    async def ask(
+        self,
+        query: str,
+        context_uuid: str,
+        mode: str = "concise",
+        model_preference: str = "pplx-70b-chat",
+        sources: list[str] | None = None,
+        parent_entry_uuid: str | None = None,
+        frontend_uuid: str | None = None,
+        share: bool = True,
+        **extra: Any,
+    ) -> Entry:
+        """Ask a question and return the complete entry.
+
+        Args:
+            query: Question to ask
+            context_uuid: Thread context UUID
+            mode: Query mode
+            model_preference: Model to use
+            sources: List of source types
+            parent_entry_uuid: Parent entry for threaded queries
+            frontend_uuid: Client-generated entry UUID
+            share: Allow a first question to be answered from the answer
+                cache or a coalesced stream
+            **extra: Additional parameters
+
+        Returns:
+            Complete Entry object; its ``timing`` holds the latency
+            breakdown of the stream
+
+        Raises:
+            httpx.HTTPError: On HTTP errors
+            ValueError: If stream fails or no final response received
+
+        """
+        # Generate frontend UUID if not provided
+        if not frontend_uuid:
+            frontend_uuid = str(uuid.uuid4())
+
+        assembler = EntryAssembler(query, context_uuid, frontend_uuid)
+        timing = StreamTiming()
+
+        stream = self.stream_ask(
+            query=query,
+            context_uuid=context_uuid,
+            mode=mode,
+            model_preference=model_preference,
+            sources=sources,
+            parent_entry_uuid=parent_entry_uuid,
+            frontend_uuid=frontend_uuid,
+            events=_ASK_EVENTS,
+            timing=timing,
+            share=share,
+            **extra,
+        )
+        async with aclosing(stream):
+            async for chunk in stream:
+                if assembler.feed(chunk):
+                    # Stop reading at the final response; the stream is closed
+                    break
+
+        entry = assembler.build()
+        entry.timing = timing
+        return entry
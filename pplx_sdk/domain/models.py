@@ -8,11 +8,15 @@ This module contains Pydantic models representing core entities:
 - Source: Citation sources
 """
 
+from __future__ import annotations
+
 from datetime import datetime
 from enum import StrEnum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from pplx_sdk.shared.metrics import StreamTiming
 
 
 class StreamStatus(StrEnum):
@@ -89,6 +93,8 @@ class Entry(BaseModel):
     Represents a single Q&A exchange with sources and structured content.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     backend_uuid: str = Field(description="Server-generated entry ID")
     frontend_uuid: str = Field(description="Client-generated entry ID")
     context_uuid: str = Field(description="Parent thread UUID")
@@ -102,6 +108,19 @@ class Entry(BaseModel):
         default=None, description="Parent entry for threaded queries"
     )
     cursor: str | None = Field(default=None, description="Resume cursor for reconnection")
+    snapshot: bool = Field(
+        default=False,
+        description=(
+            "Replayed from the answer cache or another request's stream; it belongs to "
+            "another thread and cannot be the parent of a follow-up"
+        ),
+    )
+    timing: StreamTiming | None = Field(
+        default=None,
+        exclude=True,
+        repr=False,
+        description="Latency breakdown of the stream that produced the entry",
+    )
 
 
 class MessageChunk(BaseModel):
@@ -118,3 +137,140 @@ class MessageChunk(BaseModel):
     text: str | None = Field(default=None, description="Text content for answer chunks")
     cursor: str | None = Field(default=None, description="Resume cursor")
     reconnectable: bool = Field(default=False, description="Whether stream can be reconnected")
+
+
+class StreamChunk:
+    """Unvalidated SSE event chunk for the streaming hot path.
+
+    Transports yield these instead of MessageChunk: one answer produces
+    thousands of ``answer_chunk`` events and pydantic validation dominated
+    the cost of each. StreamChunk exposes the same attributes as
+    MessageChunk as plain slots; call ``to_model()`` for a validated
+    MessageChunk when one is needed.
+
+    Example:
+        >>> chunk = StreamChunk.from_event("answer_chunk", {"text": "Hi"})
+        >>> chunk.text
+        'Hi'
+        >>> chunk.to_model()
+        MessageChunk(type='answer_chunk', ...)
+
+    """
+
+    __slots__ = (
+        "backend_uuid",
+        "context_uuid",
+        "cursor",
+        "data",
+        "reconnectable",
+        "status",
+        "text",
+        "type",
+    )
+
+    def __init__(
+        self,
+        type: str,
+        status: str | None = None,
+        data: dict[str, Any] | None = None,
+        backend_uuid: str | None = None,
+        context_uuid: str | None = None,
+        text: str | None = None,
+        cursor: str | None = None,
+        reconnectable: bool = False,
+    ) -> None:
+        """Initialize chunk without validation.
+
+        Args:
+            type: Event type (query_progress, answer_chunk, etc.)
+            status: Status value
+            data: Event-specific payload
+            backend_uuid: Entry backend UUID
+            context_uuid: Thread context UUID
+            text: Text content for answer chunks
+            cursor: Resume cursor
+            reconnectable: Whether stream can be reconnected
+
+        """
+        self.type = type
+        self.status = status
+        self.data = {} if data is None else data
+        self.backend_uuid = backend_uuid
+        self.context_uuid = context_uuid
+        self.text = text
+        self.cursor = cursor
+        self.reconnectable = reconnectable
+
+    @classmethod
+    def from_event(cls, event_type: str, data: dict[str, Any]) -> StreamChunk:
+        """Build a chunk from a decoded SSE event payload.
+
+        Args:
+            event_type: SSE event type
+            data: Decoded JSON payload
+
+        Returns:
+            StreamChunk with the common fields copied out of ``data``
+
+        """
+        get = data.get
+        cursor = get("cursor")
+        return cls(
+            event_type,
+            get("status"),
+            data,
+            get("backend_uuid"),
+            get("context_uuid"),
+            get("text"),
+            cursor,
+            cursor is not None,
+        )
+
+    def to_model(self) -> MessageChunk:
+        """Validate into a MessageChunk.
+
+        Returns:
+            Equivalent MessageChunk
+
+        Raises:
+            pydantic.ValidationError: If a field has an invalid type
+
+        """
+        return MessageChunk(
+            type=self.type,
+            status=self.status,
+            data=self.data,
+            backend_uuid=self.backend_uuid,
+            context_uuid=self.context_uuid,
+            text=self.text,
+            cursor=self.cursor,
+            reconnectable=self.reconnectable,
+        )
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        """Dump as MessageChunk.model_dump() would.
+
+        Args:
+            **kwargs: Passed to MessageChunk.model_dump()
+
+        Returns:
+            Dictionary of chunk fields
+
+        """
+        return self.to_model().model_dump(**kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field with another StreamChunk."""
+        if not isinstance(other, StreamChunk):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Show the chunk like a pydantic model."""
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _CHUNK_FIELDS)
+        return f"StreamChunk({fields})"
+
+
+_CHUNK_FIELDS = tuple(MessageChunk.model_fields)
@@ -1,13 +1,20 @@
 """Shared utilities across SDK."""
 
 from pplx_sdk.shared.auth import extract_token_from_cookies, get_token_from_env
+from pplx_sdk.shared.codec import JSONCodec, load_codec
 from pplx_sdk.shared.logging import get_logger
+from pplx_sdk.shared.metrics import MemoryMetricsSink, MetricsSink, StreamTiming
 from pplx_sdk.shared.retry import RetryConfig, retry_with_backoff
 
 __all__ = [
+    "JSONCodec",
+    "MemoryMetricsSink",
+    "MetricsSink",
     "RetryConfig",
+    "StreamTiming",
     "extract_token_from_cookies",
     "get_logger",
     "get_token_from_env",
+    "load_codec",
     "retry_with_backoff",
 ]
@@ -0,0 +1,138 @@
+"""Pluggable JSON codec.
+
+Every SSE event the SDK receives is decoded from JSON and every chunk the
+OpenAI-compatible server sends is encoded to JSON, so the JSON library sits
+on the hottest path. This module picks the fastest installed backend:
+
+1. ``msgspec``
+2. ``orjson``
+3. the standard library ``json`` module
+
+Set ``PPLX_JSON_BACKEND`` (``msgspec``, ``orjson`` or ``json``) to force one.
+``benchmarks/bench_json_codec.py`` measures them; msgspec comes first as it
+was the fastest on both SSE event payloads and chunk frames.
+
+All backends share one contract: ``loads`` accepts ``bytes`` or ``str`` and
+raises ``ValueError`` on invalid input; ``dumps`` returns compact UTF-8
+``bytes`` without ASCII escaping, the same output as pydantic's
+``model_dump_json()``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+BACKENDS = ("msgspec", "orjson", "json")
+
+
+@dataclass(frozen=True, slots=True)
+class JSONCodec:
+    """A JSON backend.
+
+    Attributes:
+        name: Backend name (msgspec, orjson or json)
+        loads: Decode ``bytes``/``str``; raises ``ValueError`` on bad input
+        dumps: Encode to compact UTF-8 ``bytes``
+
+    """
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+
+    # orjson.JSONDecodeError is a ValueError subclass
+    return JSONCodec(name="orjson", loads=orjson.loads, dumps=orjson.dumps)
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+
+    decode = msgspec.json.Decoder().decode
+    decode_error = msgspec.DecodeError
+
+    def loads(data: bytes | str) -> Any:
+        try:
+            return decode(data)
+        except decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+    return JSONCodec(name="msgspec", loads=loads, dumps=msgspec.json.Encoder().encode)
+
+
+def _json_codec() -> JSONCodec:
+    encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def dumps(obj: Any) -> bytes:
+        return encode(obj).encode()
+
+    # json.JSONDecodeError and UnicodeDecodeError are ValueError subclasses
+    return JSONCodec(name="json", loads=json.loads, dumps=dumps)
+
+
+_FACTORIES: dict[str, Callable[[], JSONCodec]] = {
+    "msgspec": _msgspec_codec,
+    "orjson": _orjson_codec,
+    "json": _json_codec,
+}
+
+
+def load_codec(backend: str | None = None) -> JSONCodec:
+    """Load a JSON codec.
+
+    Args:
+        backend: Backend name, or None to use ``PPLX_JSON_BACKEND`` if set
+            and otherwise the first installed backend in ``BACKENDS`` order
+
+    Returns:
+        JSONCodec for the selected backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If an explicitly requested backend is not installed
+
+    """
+    backend = backend or os.getenv("PPLX_JSON_BACKEND") or None
+    if backend is not None:
+        factory = _FACTORIES.get(backend)
+        if factory is None:
+            raise ValueError(f"Unknown JSON backend {backend!r}, expected one of {BACKENDS}")
+        return factory()
+
+    for name in BACKENDS[:-1]:
+        try:
+            return _FACTORIES[name]()
+        except ImportError:
+            continue
+    return _json_codec()
+
+
+def available_backends() -> list[str]:
+    """List the installed backends, fastest first.
+
+    Returns:
+        Backend names usable with load_codec()
+
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+default_codec = load_codec()
+
+# Module-level shortcuts to the selected backend
+loads = default_codec.loads
+dumps = default_codec.dumps
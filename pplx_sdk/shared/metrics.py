@@ -0,0 +1,357 @@
+"""Per-stream latency breakdown and metrics sinks.
+
+The SSE transports fill a StreamTiming while a stream runs: connection
+setup, time to the response headers, time to the first event of each type
+(``query_progress``, ``search_results``, ``answer_chunk``,
+``final_response``, ...), gaps between events, bytes received and the
+number of attempts. The layer that started the stream (EntriesService,
+StreamManager) finishes it, attaches it to the Entry built from the
+stream and hands it to a MetricsSink, e.g. to build time-to-first-token
+histograms.
+
+Times are seconds since the stream started, from ``time.perf_counter()``.
+
+Example:
+    >>> sink = MemoryMetricsSink()
+    >>> client = PerplexityClient(auth_token=token, metrics=sink)
+    >>> entry = client.new_conversation().ask("What is AI?")
+    >>> entry.timing.ttft, entry.timing.headers
+    (0.412, 0.108)
+    >>> sink.percentile("ttft", 0.95)
+
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterator
+from contextlib import aclosing
+from typing import Any, Protocol, runtime_checkable
+
+from pplx_sdk.shared.logging import get_logger
+
+logger = get_logger("pplx_sdk.metrics")
+
+# Phases named by attribute rather than by event type
+_PHASES = ("connect", "headers", "total")
+
+
+class StreamTiming:
+    """Latency breakdown of one logical stream, retries included.
+
+    Attributes:
+        source: ``upstream``; ``cache`` when answered from the answer
+            cache; ``leader`` or ``coalesced`` for a request that started,
+            or joined, a coalesced stream. Such requests time only what
+            they receive (``attempts`` is 0); the shared upstream stream
+            is timed and recorded once, as ``upstream``
+        connect: Seconds spent opening the connection (TCP and TLS) of
+            the first attempt that opened one; None when every attempt
+            reused a pooled connection
+        headers: Time to the first response headers
+        first_event: Time to the first event of each type
+        events: Events received, keep-alive comments excluded
+        bytes_received: Raw body bytes received
+        gap_count: Number of gaps between consecutive events; gaps across
+            a reconnect are not counted
+        gap_total: Sum of those gaps
+        max_gap: Longest of those gaps
+        attempts: Requests sent upstream
+        total: Time until the stream ended, once finished
+        error: Exception type name if the stream failed
+
+    """
+
+    __slots__ = (
+        "_connecting",
+        "_last",
+        "attempts",
+        "bytes_received",
+        "connect",
+        "error",
+        "events",
+        "first_event",
+        "gap_count",
+        "gap_total",
+        "headers",
+        "max_gap",
+        "source",
+        "started",
+        "total",
+    )
+
+    def __init__(self, source: str = "upstream") -> None:
+        """Start timing a stream.
+
+        Args:
+            source: Where the stream is served from
+
+        """
+        self.started = time.perf_counter()
+        self.source = source
+        self.connect: float | None = None
+        self.headers: float | None = None
+        self.first_event: dict[str, float] = {}
+        self.events = 0
+        self.bytes_received = 0
+        self.gap_count = 0
+        self.gap_total = 0.0
+        self.max_gap = 0.0
+        self.attempts = 0
+        self.total: float | None = None
+        self.error: str | None = None
+        self._last: float | None = None
+        self._connecting: float | None = None
+
+    @property
+    def ttft(self) -> float | None:
+        """Time to the first answer chunk."""
+        return self.first_event.get("answer_chunk")
+
+    @property
+    def retries(self) -> int:
+        """Attempts after the first one."""
+        return max(self.attempts - 1, 0)
+
+    @property
+    def mean_gap(self) -> float | None:
+        """Mean gap between consecutive events."""
+        return self.gap_total / self.gap_count if self.gap_count else None
+
+    def phase(self, name: str) -> float | None:
+        """Look up a phase by name.
+
+        Args:
+            name: ``connect``, ``headers``, ``total``, ``ttft`` or an event
+                type
+
+        Returns:
+            Seconds since the start of the stream, or None if not reached
+
+        """
+        if name in _PHASES:
+            value: float | None = getattr(self, name)
+            return value
+        if name == "ttft":
+            return self.ttft
+        return self.first_event.get(name)
+
+    # Recording, called by the transports
+
+    def attempt(self) -> None:
+        """Start an attempt; the gap chain restarts after a reconnect."""
+        self.attempts += 1
+        self._last = None
+
+    def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """Httpcore trace hook timing connection setup (sync clients)."""
+        if event_name == "connection.connect_tcp.started":
+            self._connecting = time.perf_counter()
+        elif self._connecting is not None and event_name in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            if self.connect is None or event_name == "connection.start_tls.complete":
+                self.connect = time.perf_counter() - self._connecting
+
+    async def atrace(self, event_name: str, info: dict[str, Any]) -> None:
+        """Httpcore trace hook timing connection setup (async clients)."""
+        self.trace(event_name, info)
+
+    def response_started(self) -> None:
+        """Record the arrival of response headers."""
+        if self.headers is None:
+            self.headers = time.perf_counter() - self.started
+
+    def count(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass raw body chunks through, counting their bytes."""
+        for raw in chunks:
+            self.bytes_received += len(raw)
+            yield raw
+
+    async def acount(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Pass raw body chunks through, counting their bytes."""
+        async for raw in chunks:
+            self.bytes_received += len(raw)
+            yield raw
+
+    def event(self, event_type: str) -> None:
+        """Record an event."""
+        now = time.perf_counter()
+        if event_type not in self.first_event:
+            self.first_event[event_type] = now - self.started
+        self.events += 1
+        if self._last is not None:
+            gap = now - self._last
+            self.gap_count += 1
+            self.gap_total += gap
+            if gap > self.max_gap:
+                self.max_gap = gap
+        self._last = now
+
+    def finish(self, error: BaseException | None = None) -> None:
+        """Stop the clock; later calls are ignored.
+
+        Args:
+            error: Exception that ended the stream, if any
+
+        """
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+            if error is not None:
+                self.error = type(error).__name__
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain-data view, e.g. for logging."""
+        return {
+            "source": self.source,
+            "connect": self.connect,
+            "headers": self.headers,
+            "ttft": self.ttft,
+            "first_event": dict(self.first_event),
+            "events": self.events,
+            "bytes_received": self.bytes_received,
+            "mean_gap": self.mean_gap,
+            "max_gap": self.max_gap,
+            "retries": self.retries,
+            "total": self.total,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"StreamTiming(source={self.source!r}, headers={self.headers}, ttft={self.ttft}, "
+            f"total={self.total}, events={self.events}, retries={self.retries})"
+        )
+
+
+@runtime_checkable
+class MetricsSink(Protocol):
+    """Receiver of finished stream timings."""
+
+    def record(self, timing: StreamTiming) -> None:
+        """Take the timing of a finished stream; must not block for long."""
+        ...
+
+
+class MemoryMetricsSink:
+    """Keeps the timings of the most recent streams in memory.
+
+    Example:
+        >>> sink = MemoryMetricsSink(maxlen=10_000)
+        >>> client = AsyncPerplexityClient(auth_token=token, metrics=sink)
+        >>> sink.percentile("ttft", 0.99)
+
+    """
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        """Initialize sink.
+
+        Args:
+            maxlen: Timings kept; older ones are dropped
+
+        """
+        self.timings: deque[StreamTiming] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, timing: StreamTiming) -> None:
+        """Keep a finished timing."""
+        with self._lock:
+            self.timings.append(timing)
+
+    def percentile(self, phase: str, fraction: float) -> float | None:
+        """Nearest-rank percentile of a phase over the kept timings.
+
+        Args:
+            phase: Phase name, see StreamTiming.phase()
+            fraction: Percentile as a fraction, e.g. 0.95
+
+        Returns:
+            Seconds, or None if no kept stream reached the phase
+
+        """
+        with self._lock:
+            values = sorted(
+                value for timing in self.timings if (value := timing.phase(phase)) is not None
+            )
+        if not values:
+            return None
+        return values[max(math.ceil(fraction * len(values)) - 1, 0)]
+
+
+def record_timing(sink: MetricsSink | None, timing: StreamTiming) -> None:
+    """Hand a timing to a sink; sink errors are logged, never raised."""
+    if sink is None:
+        return
+    try:
+        sink.record(timing)
+    except Exception:
+        logger.warning("Metrics sink failed to record a stream timing", exc_info=True)
+
+
+def timed[T](
+    chunks: Iterator[T], timing: StreamTiming, sink: MetricsSink | None
+) -> Generator[T, None, None]:
+    """Finish and record ``timing`` when a stream ends.
+
+    Streams served without an upstream request of their own (answer cache,
+    coalesced requests) have their events timed here, as delivered.
+
+    Args:
+        chunks: Stream to pass through
+        timing: Timing of the stream
+        sink: Sink receiving the finished timing, or None
+
+    Yields:
+        The chunks of ``chunks``
+
+    """
+    error: BaseException | None = None
+    try:
+        for chunk in chunks:
+            if not timing.attempts:
+                timing.event(getattr(chunk, "type", ""))
+            yield chunk
+    except GeneratorExit:
+        # The consumer stopped reading, e.g. at the final response
+        raise
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        timing.finish(error)
+        record_timing(sink, timing)
+
+
+async def atimed[T](
+    chunks: AsyncGenerator[T, None], timing: StreamTiming, sink: MetricsSink | None
+) -> AsyncGenerator[T, None]:
+    """Async twin of timed().
+
+    Args:
+        chunks: Async generator to pass through; it is closed on exit
+        timing: Timing of the stream
+        sink: Sink receiving the finished timing, or None
+
+    Yields:
+        The chunks of ``chunks``
+
+    """
+    error: BaseException | None = None
+    try:
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                if not timing.attempts:
+                    timing.event(getattr(chunk, "type", ""))
+                yield chunk
+    except GeneratorExit:
+        raise
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        timing.finish(error)
+        record_timing(sink, timing)
@@ -1,7 +1,43 @@
 """Streaming utilities for retry, reconnection, and event management."""
 
-from pplx_sdk.streaming.manager import StreamManager
-from pplx_sdk.streaming.parser import parse_sse_line
+from pplx_sdk.streaming.broadcast import (
+    AsyncStreamBroadcast,
+    SlowConsumerPolicy,
+    StreamBroadcast,
+    Subscription,
+)
+from pplx_sdk.streaming.checkpoint import (
+    CheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+    StreamCheckpoint,
+)
+from pplx_sdk.streaming.coalesce import AsyncStreamCoalescer, StreamCoalescer
+from pplx_sdk.streaming.deltas import DeltaCoalescing, acoalesce_deltas
+from pplx_sdk.streaming.manager import AsyncStreamManager, StreamManager
+from pplx_sdk.streaming.parser import aiter_sse_events, iter_sse_events, parse_sse_line
 from pplx_sdk.streaming.types import EventType
+from pplx_sdk.transport.sse_decoder import SSEDecoder, SSEEvent
 
-__all__ = ["EventType", "StreamManager", "parse_sse_line"]
+__all__ = [
+    "AsyncStreamBroadcast",
+    "AsyncStreamCoalescer",
+    "AsyncStreamManager",
+    "CheckpointStore",
+    "DeltaCoalescing",
+    "EventType",
+    "MemoryCheckpointStore",
+    "SQLiteCheckpointStore",
+    "SSEDecoder",
+    "SSEEvent",
+    "SlowConsumerPolicy",
+    "StreamBroadcast",
+    "StreamCheckpoint",
+    "StreamCoalescer",
+    "StreamManager",
+    "Subscription",
+    "acoalesce_deltas",
+    "aiter_sse_events",
+    "iter_sse_events",
+    "parse_sse_line",
+]
@@ -0,0 +1,417 @@
+"""Fan one upstream answer stream out to many subscribers.
+
+A broadcast reads a single upstream stream (``Conversation.ask_stream``,
+``StreamManager.stream``, a transport, ...) and hands every chunk to each
+subscriber. Chunks are kept in one shared history, so each subscriber is
+just a read position into it:
+
+- late joiners replay the chunks received before they subscribed; with
+  ``max_history`` set, only the newest ``max_history`` of them are kept
+  for replay, and ``Subscription.missed`` counts the trimmed ones
+- each subscriber may fall at most ``max_queue`` live chunks behind; what
+  happens then is set by SlowConsumerPolicy
+- an upstream error is raised in every subscriber after the chunks that
+  preceded it
+
+AsyncStreamBroadcast pumps an async source in an asyncio task for async
+subscribers; StreamBroadcast pumps a sync source in a thread for
+subscribers in other threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, AsyncIterable, Generator, Iterable
+from enum import StrEnum
+from typing import Any
+
+from pplx_sdk.core.exceptions import SlowConsumerError
+from pplx_sdk.domain.models import StreamChunk
+
+
+class SlowConsumerPolicy(StrEnum):
+    """What happens when a subscriber falls ``max_queue`` chunks behind."""
+
+    # Hold the upstream until the subscriber catches up
+    BLOCK = "block"
+    # Skip the subscriber's oldest unread chunks
+    DROP = "drop"
+    # Raise SlowConsumerError in the subscriber and unsubscribe it
+    DISCONNECT = "disconnect"
+
+
+class Subscription:
+    """A subscriber's read position in a broadcast.
+
+    Attributes:
+        position: Index of the next chunk to read, counted over every chunk
+            published, trimmed ones included
+        floor: Chunks published when the subscriber joined; chunks before
+            it are replay and do not count towards ``max_queue``
+        dropped: Chunks skipped under the drop policy
+        missed: Replay chunks trimmed from the history before joining
+        error: Error ending this subscription, if any
+        closed: Whether the subscriber has left
+
+    """
+
+    __slots__ = ("_broadcast", "closed", "dropped", "error", "floor", "missed", "position")
+
+    def __init__(self, broadcast: _Broadcast, position: int, floor: int) -> None:
+        """Initialize subscription at a history position."""
+        self._broadcast = broadcast
+        self.position = position
+        self.floor = floor
+        self.dropped = 0
+        self.missed = 0
+        self.error: BaseException | None = None
+        self.closed = False
+
+    @property
+    def lag(self) -> int:
+        """Live chunks published but not yet read."""
+        return self._broadcast.published - max(self.position, self.floor)
+
+
+class _Broadcast:
+    """History, subscribers and slow-consumer policy of a broadcast.
+
+    ``history`` holds the chunks from index ``trimmed`` on; chunks older
+    than the newest ``max_history`` are trimmed once no subscriber still
+    has to read them.
+    """
+
+    def __init__(
+        self, max_queue: int, policy: SlowConsumerPolicy | str, max_history: int | None
+    ) -> None:
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if max_history is not None and max_history < 0:
+            raise ValueError("max_history must not be negative")
+        self.max_queue = max_queue
+        self.policy = SlowConsumerPolicy(policy)
+        self.max_history = max_history
+        self.history: list[StreamChunk] = []
+        self.trimmed = 0
+        self.subscribers: list[Subscription] = []
+        self.done = False
+        self.error: BaseException | None = None
+
+    @property
+    def published(self) -> int:
+        """Chunks published so far, trimmed ones included."""
+        return self.trimmed + len(self.history)
+
+    def _join(self, replay: bool) -> Subscription:
+        floor = self.published
+        start = floor
+        if replay:
+            start = self.trimmed
+            if self.max_history is not None:
+                start = max(start, floor - self.max_history)
+        subscription = Subscription(self, start, floor)
+        subscription.missed = start if replay else 0
+        if not self.done:
+            self.subscribers.append(subscription)
+        return subscription
+
+    def _leave(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        if subscription in self.subscribers:
+            self.subscribers.remove(subscription)
+
+    def _must_wait(self) -> bool:
+        """Whether the publisher is held by a full subscriber (block policy)."""
+        return self.policy is SlowConsumerPolicy.BLOCK and any(
+            subscription.lag >= self.max_queue for subscription in self.subscribers
+        )
+
+    def _publish(self, chunk: StreamChunk) -> None:
+        """Append a chunk and apply the drop or disconnect policy."""
+        self.history.append(chunk)
+        if self.policy is not SlowConsumerPolicy.BLOCK:
+            self._apply_policy()
+        if self.max_history is not None:
+            self._trim(self.max_history)
+
+    def _apply_policy(self) -> None:
+        for subscription in list(self.subscribers):
+            if subscription.lag <= self.max_queue:
+                continue
+            if self.policy is SlowConsumerPolicy.DROP:
+                newest = self.published - self.max_queue
+                subscription.dropped += newest - max(subscription.position, subscription.floor)
+                subscription.position = newest
+            else:
+                subscription.error = SlowConsumerError(
+                    f"Subscriber fell more than {self.max_queue} chunks behind",
+                    max_queue=self.max_queue,
+                )
+                self._leave(subscription)
+
+    def _trim(self, max_history: int) -> None:
+        """Drop chunks past the replay window that no subscriber still needs."""
+        cutoff = min(
+            (subscription.position for subscription in self.subscribers),
+            default=self.published,
+        )
+        cutoff = min(cutoff, self.published - max_history)
+        if cutoff > self.trimmed:
+            del self.history[: cutoff - self.trimmed]
+            self.trimmed = cutoff
+
+    def _finish(self, error: BaseException | None) -> None:
+        self.done = True
+        self.error = error
+
+    def _take(self, subscription: Subscription) -> StreamChunk | None:
+        """Next chunk for a subscriber, or None if it has to wait or stop.
+
+        Raises:
+            SlowConsumerError: If the subscriber was disconnected
+            Exception: The upstream error, once the history is read
+
+        """
+        if subscription.error is not None:
+            raise subscription.error
+        if subscription.position < self.published:
+            chunk = self.history[subscription.position - self.trimmed]
+            subscription.position += 1
+            return chunk
+        if self.done and self.error is not None:
+            raise self.error
+        return None
+
+    def _ready(self, subscription: Subscription) -> bool:
+        return (
+            subscription.error is not None
+            or subscription.position < self.published
+            or self.done
+            or subscription.closed
+        )
+
+
+class AsyncStreamBroadcast(_Broadcast):
+    """Share one async upstream stream between async subscribers.
+
+    The upstream is read by a task started with the first subscription.
+
+    Example:
+        >>> broadcast = AsyncStreamBroadcast(conv.ask_stream("What is AI?"))
+        >>> ui, audit = broadcast.subscribe(), broadcast.subscribe()
+        >>> async for chunk in ui:
+        ...     await websocket.send_text(chunk.text or "")
+
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[StreamChunk],
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy | str = SlowConsumerPolicy.BLOCK,
+        max_history: int | None = None,
+    ) -> None:
+        """Initialize broadcast.
+
+        Args:
+            source: Upstream chunk stream, read once
+            max_queue: Live chunks a subscriber may fall behind
+            policy: What happens to a subscriber that falls further behind
+            max_history: Chunks kept for late joiners to replay, or None to
+                keep the whole stream
+
+        Raises:
+            ValueError: If max_queue is below 1, max_history is negative or
+                the policy is unknown
+
+        """
+        super().__init__(max_queue, policy, max_history)
+        self.source = source
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task[None] | None = None
+
+    def subscribe(self, replay: bool = True) -> AsyncGenerator[StreamChunk, None]:
+        """Subscribe to the stream; must be called with a running loop.
+
+        Args:
+            replay: Start with the chunks received before subscribing
+
+        Returns:
+            Async generator of chunks; its ``aclose()`` unsubscribes
+
+        """
+        subscription = self._join(replay)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._pump())
+        return self._read(subscription)
+
+    async def _pump(self) -> None:
+        error: BaseException | None = None
+        try:
+            async for chunk in self.source:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: not self._must_wait())
+                    self._publish(chunk)
+                    self._changed.notify_all()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error = exc
+        finally:
+            close = getattr(self.source, "aclose", None)
+            if close is not None:
+                await close()
+            async with self._changed:
+                self._finish(error)
+                self._changed.notify_all()
+
+    async def _read(self, subscription: Subscription) -> AsyncGenerator[StreamChunk, None]:
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: self._ready(subscription))
+                    chunk = self._take(subscription)
+                    if chunk is None:
+                        return
+                    # A read may unblock the publisher
+                    self._changed.notify_all()
+                yield chunk
+        finally:
+            async with self._changed:
+                self._leave(subscription)
+                self._changed.notify_all()
+
+    async def aclose(self) -> None:
+        """Stop reading the upstream; subscribers end after their history."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> AsyncStreamBroadcast:
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.aclose()
+
+
+class StreamBroadcast(_Broadcast):
+    """Share one sync upstream stream between subscribers in other threads.
+
+    The upstream is read by a daemon thread started with the first
+    subscription.
+
+    Example:
+        >>> broadcast = StreamBroadcast(conv.ask_stream("What is AI?"))
+        >>> audit = broadcast.subscribe()
+        >>> threading.Thread(target=write_audit_log, args=(audit,)).start()
+        >>> for chunk in broadcast.subscribe():
+        ...     print(chunk.text or "", end="")
+
+    """
+
+    def __init__(
+        self,
+        source: Iterable[StreamChunk],
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy | str = SlowConsumerPolicy.BLOCK,
+        max_history: int | None = None,
+    ) -> None:
+        """Initialize broadcast.
+
+        Args:
+            source: Upstream chunk stream, read once
+            max_queue: Live chunks a subscriber may fall behind
+            policy: What happens to a subscriber that falls further behind
+            max_history: Chunks kept for late joiners to replay, or None to
+                keep the whole stream
+
+        Raises:
+            ValueError: If max_queue is below 1, max_history is negative or
+                the policy is unknown
+
+        """
+        super().__init__(max_queue, policy, max_history)
+        self.source = source
+        self._changed = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def subscribe(self, replay: bool = True) -> Generator[StreamChunk, None, None]:
+        """Subscribe to the stream.
+
+        Args:
+            replay: Start with the chunks received before subscribing
+
+        Returns:
+            Generator of chunks; its ``close()`` unsubscribes
+
+        """
+        with self._changed:
+            subscription = self._join(replay)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._pump, name="pplx-broadcast", daemon=True
+                )
+                self._thread.start()
+        return self._read(subscription)
+
+    def _pump(self) -> None:
+        error: BaseException | None = None
+        iterator = iter(self.source)
+        try:
+            for chunk in iterator:
+                with self._changed:
+                    self._changed.wait_for(lambda: self._stopping or not self._must_wait())
+                    if self._stopping:
+                        break
+                    self._publish(chunk)
+                    self._changed.notify_all()
+        except Exception as exc:
+            error = exc
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            with self._changed:
+                self._finish(error)
+                self._changed.notify_all()
+
+    def _read(self, subscription: Subscription) -> Generator[StreamChunk, None, None]:
+        try:
+            while True:
+                with self._changed:
+                    self._changed.wait_for(lambda: self._ready(subscription))
+                    chunk = self._take(subscription)
+                    if chunk is None:
+                        return
+                    # A read may unblock the publisher
+                    self._changed.notify_all()
+                yield chunk
+        finally:
+            with self._changed:
+                self._leave(subscription)
+                self._changed.notify_all()
+
+    def close(self, wait: bool = True) -> None:
+        """Stop reading the upstream at its next chunk.
+
+        Args:
+            wait: Wait for the pump thread to close the upstream
+
+        """
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __enter__(self) -> StreamBroadcast:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
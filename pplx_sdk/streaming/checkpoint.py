@@ -0,0 +1,214 @@
+"""Durable checkpoints for resumable streams.
+
+A checkpoint records what is needed to pick an interrupted stream up again:
+the request that started it, the last ``cursor`` and the backend entry
+UUIDs seen so far. StreamManager and AsyncStreamManager save one every few
+events while streaming and delete it once the stream completes, so after a
+crash or restart ``manager.resume(frontend_uuid)`` continues from the saved
+cursor instead of re-running the search.
+
+Stores implement the CheckpointStore protocol. Two are provided:
+
+- MemoryCheckpointStore: a dict, for tests and single-process retries
+- SQLiteCheckpointStore: a SQLite file that survives restarts
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from pplx_sdk.shared import codec
+
+
+@dataclass
+class StreamCheckpoint:
+    """Resume position of a stream.
+
+    Attributes:
+        frontend_uuid: Client-generated entry UUID identifying the stream
+        request: Arguments the stream was started with (query,
+            context_uuid, mode, ...); must be JSON-serializable for
+            persistent stores
+        cursor: Last resume cursor received
+        resume_entry_uuids: Backend entry UUIDs seen so far
+        events: Events received when the checkpoint was taken
+        updated_at: Unix time of the checkpoint
+
+    """
+
+    frontend_uuid: str
+    request: dict[str, Any]
+    cursor: str | None = None
+    resume_entry_uuids: list[str] = field(default_factory=list)
+    events: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> bytes:
+        """Serialize the checkpoint.
+
+        Returns:
+            JSON document as UTF-8 bytes
+
+        """
+        return codec.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> StreamCheckpoint:
+        """Deserialize a checkpoint written by to_json().
+
+        Args:
+            data: JSON document
+
+        Returns:
+            StreamCheckpoint instance
+
+        """
+        return cls(**codec.loads(data))
+
+
+@runtime_checkable
+class CheckpointStore(Protocol):
+    """Storage backend for stream checkpoints."""
+
+    def save(self, checkpoint: StreamCheckpoint) -> None:
+        """Insert or replace the checkpoint of a stream."""
+        ...
+
+    def load(self, frontend_uuid: str) -> StreamCheckpoint | None:
+        """Return the checkpoint of a stream, or None."""
+        ...
+
+    def delete(self, frontend_uuid: str) -> None:
+        """Remove the checkpoint of a stream, if any."""
+        ...
+
+
+class MemoryCheckpointStore:
+    """In-process checkpoint store.
+
+    Example:
+        >>> store = MemoryCheckpointStore()
+        >>> manager = StreamManager(transport, checkpoint_store=store)
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty store."""
+        self._checkpoints: dict[str, StreamCheckpoint] = {}
+
+    def save(self, checkpoint: StreamCheckpoint) -> None:
+        """Insert or replace the checkpoint of a stream.
+
+        Args:
+            checkpoint: Checkpoint to store; a copy is kept
+
+        """
+        self._checkpoints[checkpoint.frontend_uuid] = StreamCheckpoint(**asdict(checkpoint))
+
+    def load(self, frontend_uuid: str) -> StreamCheckpoint | None:
+        """Return the checkpoint of a stream.
+
+        Args:
+            frontend_uuid: Stream identifier
+
+        Returns:
+            StreamCheckpoint, or None if there is none
+
+        """
+        return self._checkpoints.get(frontend_uuid)
+
+    def delete(self, frontend_uuid: str) -> None:
+        """Remove the checkpoint of a stream, if any.
+
+        Args:
+            frontend_uuid: Stream identifier
+
+        """
+        self._checkpoints.pop(frontend_uuid, None)
+
+
+class SQLiteCheckpointStore:
+    """Checkpoint store in a SQLite file.
+
+    Uses WAL journaling with ``synchronous=NORMAL``: a save is a short local
+    write that survives a process crash (a power loss may drop the latest
+    ones). The connection is shared between threads behind a lock.
+
+    Example:
+        >>> store = SQLiteCheckpointStore("~/.cache/pplx/checkpoints.db")
+        >>> manager = StreamManager(transport, checkpoint_store=store)
+        >>> for chunk in manager.resume(frontend_uuid):
+        ...     print(chunk.text or "", end="")
+
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (and create if needed) the checkpoint database.
+
+        Args:
+            path: Database file path; ``:memory:`` for a private in-memory
+                database
+
+        """
+        path = str(path) if str(path) == ":memory:" else str(Path(path).expanduser())
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stream_checkpoints ("
+                "frontend_uuid TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def save(self, checkpoint: StreamCheckpoint) -> None:
+        """Insert or replace the checkpoint of a stream.
+
+        Args:
+            checkpoint: Checkpoint to store
+
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stream_checkpoints VALUES (?, ?, ?)",
+                (checkpoint.frontend_uuid, checkpoint.to_json(), checkpoint.updated_at),
+            )
+
+    def load(self, frontend_uuid: str) -> StreamCheckpoint | None:
+        """Return the checkpoint of a stream.
+
+        Args:
+            frontend_uuid: Stream identifier
+
+        Returns:
+            StreamCheckpoint, or None if there is none
+
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM stream_checkpoints WHERE frontend_uuid = ?",
+                (frontend_uuid,),
+            ).fetchone()
+        return None if row is None else StreamCheckpoint.from_json(row[0])
+
+    def delete(self, frontend_uuid: str) -> None:
+        """Remove the checkpoint of a stream, if any.
+
+        Args:
+            frontend_uuid: Stream identifier
+
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM stream_checkpoints WHERE frontend_uuid = ?", (frontend_uuid,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,241 @@
+"""Single-flight coalescing of identical concurrent streams.
+
+When several callers ask the same question at the same time, a coalescer
+opens one upstream stream for the first of them (the leader) and serves
+everyone from it through a broadcast: each caller gets its own replay of
+the chunks, from the start. Callers that arrive after the upstream has
+finished start a new stream.
+
+The upstream is stopped once every caller has left, so an abandoned
+request does not keep a connection busy.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import AsyncGenerator, Callable, Generator, Hashable
+from contextlib import aclosing
+
+from pplx_sdk.domain.models import StreamChunk
+from pplx_sdk.streaming.broadcast import (
+    AsyncStreamBroadcast,
+    SlowConsumerPolicy,
+    StreamBroadcast,
+)
+
+
+class _Flight[B: (AsyncStreamBroadcast, StreamBroadcast)]:
+    """One upstream stream and the number of callers reading it."""
+
+    __slots__ = ("broadcast", "callers")
+
+    def __init__(self) -> None:
+        self.broadcast: B
+        self.callers = 0
+
+
+class AsyncStreamCoalescer:
+    """Share one upstream stream between identical concurrent async requests.
+
+    Attributes:
+        coalesced: Requests served by a stream another request started
+
+    Example:
+        >>> coalescer = AsyncStreamCoalescer()
+        >>> key = ("What is AI?", "concise")
+        >>> async for chunk in coalescer.stream(key, lambda: transport.stream(...)):
+        ...     print(chunk.text or "", end="")
+
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy | str = SlowConsumerPolicy.BLOCK,
+    ) -> None:
+        """Initialize coalescer.
+
+        Args:
+            max_queue: Live chunks a caller may fall behind the upstream
+            policy: What happens to a caller that falls further behind
+
+        """
+        self.max_queue = max_queue
+        self.policy = SlowConsumerPolicy(policy)
+        self.coalesced = 0
+        self._flights: dict[Hashable, _Flight[AsyncStreamBroadcast]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of upstream streams currently shared."""
+        return len(self._flights)
+
+    async def stream(
+        self,
+        key: Hashable,
+        open_stream: Callable[[], AsyncGenerator[StreamChunk, None]],
+        on_join: Callable[[bool], None] | None = None,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream the answer for a request, joining an identical one in flight.
+
+        Args:
+            key: Identity of the request; requests with equal keys share
+            open_stream: Opens the upstream stream; only called for the
+                first request of a flight
+            on_join: Called with True if this request leads the flight
+                (its stream goes upstream), False if it joined one
+
+        Yields:
+            StreamChunk objects, starting from the first chunk of the
+            upstream
+
+        """
+        flight = self._flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _Flight()
+            flight.broadcast = AsyncStreamBroadcast(
+                self._source(key, flight, open_stream), self.max_queue, self.policy
+            )
+            self._flights[key] = flight
+        else:
+            self.coalesced += 1
+        if on_join is not None:
+            on_join(leader)
+
+        flight.callers += 1
+        try:
+            async with aclosing(flight.broadcast.subscribe()) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            flight.callers -= 1
+            if flight.callers == 0:
+                # Nobody is reading any more; stop the upstream
+                self._forget(key, flight)
+                await flight.broadcast.aclose()
+
+    async def _source(
+        self,
+        key: Hashable,
+        flight: _Flight[AsyncStreamBroadcast],
+        open_stream: Callable[[], AsyncGenerator[StreamChunk, None]],
+    ) -> AsyncGenerator[StreamChunk, None]:
+        try:
+            async with aclosing(open_stream()) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            # Requests from now on start a fresh stream
+            self._forget(key, flight)
+
+    def _forget(self, key: Hashable, flight: _Flight[AsyncStreamBroadcast]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class StreamCoalescer:
+    """Share one upstream stream between identical concurrent sync requests.
+
+    Requests are expected to come from different threads; the upstream is
+    read by the broadcast's pump thread.
+
+    Attributes:
+        coalesced: Requests served by a stream another request started
+
+    Example:
+        >>> coalescer = StreamCoalescer()
+        >>> key = ("What is AI?", "concise")
+        >>> for chunk in coalescer.stream(key, lambda: transport.stream(...)):
+        ...     print(chunk.text or "", end="")
+
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy | str = SlowConsumerPolicy.BLOCK,
+    ) -> None:
+        """Initialize coalescer.
+
+        Args:
+            max_queue: Live chunks a caller may fall behind the upstream
+            policy: What happens to a caller that falls further behind
+
+        """
+        self.max_queue = max_queue
+        self.policy = SlowConsumerPolicy(policy)
+        self.coalesced = 0
+        self._flights: dict[Hashable, _Flight[StreamBroadcast]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of upstream streams currently shared."""
+        return len(self._flights)
+
+    def stream(
+        self,
+        key: Hashable,
+        open_stream: Callable[[], Generator[StreamChunk, None, None]],
+        on_join: Callable[[bool], None] | None = None,
+    ) -> Generator[StreamChunk, None, None]:
+        """Stream the answer for a request, joining an identical one in flight.
+
+        Args:
+            key: Identity of the request; requests with equal keys share
+            open_stream: Opens the upstream stream; only called for the
+                first request of a flight
+            on_join: Called with True if this request leads the flight
+                (its stream goes upstream), False if it joined one
+
+        Yields:
+            StreamChunk objects, starting from the first chunk of the
+            upstream
+
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                flight.broadcast = StreamBroadcast(
+                    self._source(key, flight, open_stream), self.max_queue, self.policy
+                )
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+            flight.callers += 1
+            chunks = flight.broadcast.subscribe()
+        if on_join is not None:
+            on_join(leader)
+
+        try:
+            yield from chunks
+        finally:
+            chunks.close()
+            with self._lock:
+                flight.callers -= 1
+                idle = flight.callers == 0
+                if idle:
+                    self._forget(key, flight)
+            if idle:
+                # Nobody is reading any more; stop the upstream
+                flight.broadcast.close(wait=False)
+
+    def _source(
+        self,
+        key: Hashable,
+        flight: _Flight[StreamBroadcast],
+        open_stream: Callable[[], Generator[StreamChunk, None, None]],
+    ) -> Generator[StreamChunk, None, None]:
+        try:
+            yield from open_stream()
+        finally:
+            # Requests from now on start a fresh stream
+            with self._lock:
+                self._forget(key, flight)
+
+    def _forget(self, key: Hashable, flight: _Flight[StreamBroadcast]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
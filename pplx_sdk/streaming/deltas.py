@@ -0,0 +1,145 @@
+"""Coalescing of small text deltas into fewer, larger ones.
+
+Upstream ``answer_chunk`` events often carry a few characters each.
+Forwarding each as its own frame multiplies writes, JSON encoding and
+client-side parsing. acoalesce_deltas() merges consecutive deltas until
+``max_bytes`` are buffered or the oldest buffered delta has waited
+``max_delay`` seconds. By default the first delta is passed through at
+once, so time to first token is unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import AsyncGenerator, AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class DeltaCoalescing:
+    """Limits for merging consecutive text deltas.
+
+    Attributes:
+        enabled: Whether deltas are merged at all
+        max_delay: Seconds a delta may wait for more to merge with
+        max_bytes: UTF-8 size at which the buffered deltas are sent
+        flush_first: Send the first delta of a stream without waiting
+
+    Example:
+        >>> coalescing = DeltaCoalescing(max_delay=0.02, max_bytes=1024)
+        >>> async for text in acoalesce_deltas(texts, coalescing):
+        ...     await send(text)
+
+    """
+
+    enabled: bool = True
+    max_delay: float = 0.02
+    max_bytes: int = 4096
+    flush_first: bool = True
+
+    @classmethod
+    def from_env(cls, prefix: str = "PPLX_COALESCE_DELTAS") -> DeltaCoalescing:
+        """Build limits from environment variables.
+
+        ``<prefix>=1`` enables coalescing. ``<prefix>_MAX_DELAY`` (seconds),
+        ``<prefix>_MAX_BYTES`` and ``<prefix>_FLUSH_FIRST`` override the
+        defaults.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            DeltaCoalescing instance, disabled unless enabled by ``<prefix>``
+
+        Raises:
+            ValueError: If a limit is not a number
+
+        """
+        values: dict[str, Any] = {"enabled": os.getenv(prefix, "").lower() in {"1", "true"}}
+        if raw := os.getenv(f"{prefix}_MAX_DELAY"):
+            values["max_delay"] = float(raw)
+        if raw := os.getenv(f"{prefix}_MAX_BYTES"):
+            values["max_bytes"] = int(raw)
+        if raw := os.getenv(f"{prefix}_FLUSH_FIRST"):
+            values["flush_first"] = raw.lower() in {"1", "true"}
+        return cls(**values)
+
+
+async def acoalesce_deltas(
+    texts: AsyncIterator[str], coalescing: DeltaCoalescing
+) -> AsyncGenerator[str, None]:
+    """Merge consecutive text deltas.
+
+    While deltas are buffered, the next one is awaited in a task, so the
+    ``max_delay`` flush never cancels a pending read of ``texts``.
+
+    Args:
+        texts: Text deltas; closed when the merged stream is closed
+        coalescing: Merge limits
+
+    Yields:
+        Merged deltas, in order and with nothing dropped
+
+    """
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Future[str] | None = None
+    buffer: list[str] = []
+    size = 0
+    deadline = 0.0
+    passthrough = coalescing.flush_first
+    try:
+        if not coalescing.enabled:
+            async for text in texts:
+                yield text
+            return
+
+        while True:
+            try:
+                if buffer:
+                    if pending is None:
+                        pending = asyncio.ensure_future(anext(texts))
+                    done, _ = await asyncio.wait({pending}, timeout=deadline - loop.time())
+                    if not done:
+                        # The oldest buffered delta has waited long enough
+                        yield "".join(buffer)
+                        buffer.clear()
+                        size = 0
+                        continue
+                    text = pending.result()
+                    pending = None
+                elif pending is not None:
+                    text = await pending
+                    pending = None
+                else:
+                    text = await anext(texts)
+            except StopAsyncIteration:
+                pending = None
+                break
+
+            if passthrough:
+                passthrough = False
+                yield text
+                continue
+            if not buffer:
+                deadline = loop.time() + coalescing.max_delay
+            buffer.append(text)
+            size += len(text.encode())
+            if size >= coalescing.max_bytes:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            # Let the read finish or be cancelled before closing its source
+            pending.cancel()
+            await asyncio.wait({pending})
+            if not pending.cancelled():
+                pending.exception()
+        aclose = getattr(texts, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -5,20 +5,358 @@ Provides resilient streaming with automatic retry and resume capabilities.
 
 from __future__ import annotations
 
+import asyncio
 import time
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from contextlib import aclosing
+from dataclasses import replace
 from typing import Any
 
-from pplx_sdk.core.exceptions import StreamingError, TransportError
-from pplx_sdk.domain.models import MessageChunk
-from pplx_sdk.transport.sse import SSETransport
+import httpx
+
+from pplx_sdk.core.exceptions import StreamingError, StreamTimeoutError, TransportError
+from pplx_sdk.domain.models import StreamChunk
+from pplx_sdk.shared.metrics import MetricsSink, StreamTiming, atimed, timed
+from pplx_sdk.shared.retry import RetryConfig
+from pplx_sdk.streaming.checkpoint import CheckpointStore, StreamCheckpoint
+from pplx_sdk.transport.replay import ReplayTracker
+from pplx_sdk.transport.sse import AsyncSSETransport, SSETransport
+from pplx_sdk.transport.timeouts import StreamTimeouts, stream_timeout_error
+
+# Errors after which a stream with a cursor is reconnected
+RETRYABLE_ERRORS: tuple[type[Exception], ...] = (
+    TransportError,
+    StreamingError,
+    httpx.TransportError,
+    OSError,
+)
+
+
+class _ResumeState:
+    """Cursor, entry UUIDs and delivery history of an interrupted stream."""
+
+    __slots__ = ("cursor", "events", "replay", "resume_entry_uuids", "saved_at", "unsaved")
+
+    def __init__(self, checkpoint: StreamCheckpoint | None = None) -> None:
+        self.cursor: str | None = None
+        # Insertion-ordered set of backend UUIDs
+        self.resume_entry_uuids: dict[str, None] = {}
+        # Drops events a reconnect replays; empty after a process restart,
+        # where the caller needs the replayed events again
+        self.replay = ReplayTracker()
+        self.events = 0
+        # Events since the last checkpoint, and when it was taken
+        self.unsaved = 0
+        self.saved_at = time.monotonic()
+        if checkpoint is not None:
+            self.cursor = checkpoint.cursor
+            self.resume_entry_uuids = dict.fromkeys(checkpoint.resume_entry_uuids)
+            self.events = checkpoint.events
+
+    def update(self, chunk: StreamChunk, reconnectable: bool) -> None:
+        """Record the resume position after a chunk."""
+        self.events += 1
+        self.unsaved += 1
+
+        # Update cursor for reconnection
+        if reconnectable and chunk.cursor:
+            self.cursor = chunk.cursor
+
+        # Track backend UUID for resume
+        if chunk.backend_uuid:
+            self.resume_entry_uuids[chunk.backend_uuid] = None
+
+    def request_params(self) -> dict[str, Any]:
+        """Resume parameters for the next attempt."""
+        return {
+            "cursor": self.cursor,
+            "resume_entry_uuids": list(self.resume_entry_uuids) or None,
+            "replay": self.replay,
+        }
+
+
+def _stream_request(
+    query: str,
+    context_uuid: str,
+    frontend_uuid: str,
+    mode: str,
+    model_preference: str,
+    sources: list[str] | None,
+    parent_entry_uuid: str | None,
+    extra: dict[str, Any],
+) -> dict[str, Any]:
+    """Collect the transport arguments that define a stream."""
+    return {
+        "query": query,
+        "context_uuid": context_uuid,
+        "frontend_uuid": frontend_uuid,
+        "mode": mode,
+        "model_preference": model_preference,
+        "sources": sources,
+        "parent_entry_uuid": parent_entry_uuid,
+        **extra,
+    }
+
+
+class _BaseStreamManager:
+    """Retry, checkpoint and deadline bookkeeping shared by stream managers."""
 
+    def __init__(
+        self,
+        max_retries: int,
+        retry_backoff_ms: int,
+        timeout_ms: int,
+        timeouts: StreamTimeouts | None,
+        retry_config: RetryConfig | None,
+        checkpoint_store: CheckpointStore | None,
+        checkpoint_every: int,
+        checkpoint_interval_ms: int,
+        metrics: MetricsSink | None,
+    ) -> None:
+        """Initialize retry and checkpoint policy.
+
+        Args:
+            max_retries: Maximum number of retry attempts
+            retry_backoff_ms: Base backoff time in milliseconds
+            timeout_ms: Total deadline used by stream_with_timeout, in
+                milliseconds
+            timeouts: Default limits for every stream
+            retry_config: Backoff policy; overrides max_retries and
+                retry_backoff_ms when given
+            checkpoint_store: Where resume positions are saved, or None
+            checkpoint_every: Save after this many events
+            checkpoint_interval_ms: Save when this much time has passed
+                since the last save and new events arrived
+            metrics: Sink receiving the StreamTiming of every stream
+
+        """
+        self.retry_config = retry_config or RetryConfig(
+            max_retries=max_retries, initial_backoff_ms=retry_backoff_ms
+        )
+        self.max_retries = self.retry_config.max_retries
+        self.retry_backoff_ms = self.retry_config.initial_backoff_ms
+        self.timeout_ms = timeout_ms
+        self.timeouts = timeouts
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval_ms = checkpoint_interval_ms
+        self.metrics = metrics
+
+    def _due_checkpoint(
+        self, request: dict[str, Any], state: _ResumeState, force: bool = False
+    ) -> StreamCheckpoint | None:
+        """Build the checkpoint to save, if the policy says one is due.
+
+        The state counts as saved from here on; the caller saves the
+        checkpoint.
+
+        Args:
+            request: Transport arguments of the stream
+            state: Current resume position
+            force: Save regardless of the event and time thresholds
+
+        Returns:
+            Checkpoint to save, or None
+
+        """
+        if self.checkpoint_store is None or state.cursor is None or not state.unsaved:
+            return None
+        now = time.monotonic()
+        if not (
+            force
+            or state.unsaved >= self.checkpoint_every
+            or (now - state.saved_at) * 1000 >= self.checkpoint_interval_ms
+        ):
+            return None
+        state.unsaved = 0
+        state.saved_at = now
+        return StreamCheckpoint(
+            frontend_uuid=request["frontend_uuid"],
+            # Event filters may be sets; store them as lists
+            request={
+                key: sorted(value) if isinstance(value, set | frozenset) else value
+                for key, value in request.items()
+            },
+            cursor=state.cursor,
+            resume_entry_uuids=list(state.resume_entry_uuids),
+            events=state.events,
+        )
+
+    def _checkpoint(
+        self, request: dict[str, Any], state: _ResumeState, force: bool = False
+    ) -> None:
+        """Save the resume position if the policy says it is due.
+
+        Args:
+            request: Transport arguments of the stream
+            state: Current resume position
+            force: Save regardless of the event and time thresholds
+
+        """
+        checkpoint = self._due_checkpoint(request, state, force)
+        if checkpoint is not None and self.checkpoint_store is not None:
+            self.checkpoint_store.save(checkpoint)
+
+    def _stream_timing(self, timing: StreamTiming | None) -> StreamTiming | None:
+        """Pick the timing of a stream: the caller's, or a new one for the sink."""
+        if timing is None and self.metrics is not None:
+            return StreamTiming()
+        return timing
+
+    def _completed(self, request: dict[str, Any]) -> None:
+        """Drop the checkpoint of a stream that finished."""
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.delete(request["frontend_uuid"])
+
+    def _load_checkpoint(self, frontend_uuid: str) -> StreamCheckpoint:
+        """Load the checkpoint to resume a stream from.
+
+        Args:
+            frontend_uuid: Stream identifier
+
+        Returns:
+            Saved StreamCheckpoint
+
+        Raises:
+            StreamingError: If there is no store or no checkpoint
+
+        """
+        if self.checkpoint_store is None:
+            raise StreamingError("Resuming a stream needs a checkpoint_store")
+        checkpoint = self.checkpoint_store.load(frontend_uuid)
+        if checkpoint is None:
+            raise StreamingError(
+                f"No checkpoint for stream {frontend_uuid}", {"frontend_uuid": frontend_uuid}
+            )
+        return checkpoint
+
+    @staticmethod
+    def _deadline(timeouts: StreamTimeouts | None) -> float | None:
+        """Monotonic time the total deadline passes, or None."""
+        if timeouts is None or timeouts.total is None:
+            return None
+        return time.monotonic() + timeouts.total
+
+    @staticmethod
+    def _attempt_timeouts(
+        timeouts: StreamTimeouts | None, deadline: float | None
+    ) -> StreamTimeouts | None:
+        """Limits for one attempt, with the total cut to what is left.
+
+        Args:
+            timeouts: Limits of the whole stream
+            deadline: Monotonic time the total deadline passes, or None
+
+        Returns:
+            Limits to pass to the transport
+
+        Raises:
+            StreamTimeoutError: If the total deadline has already passed
+
+        """
+        if timeouts is None or deadline is None:
+            return timeouts
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise stream_timeout_error("total", timeouts.total or 0.0)
+        return replace(timeouts, total=remaining)
+
+    def _retry_backoff(
+        self,
+        error: Exception,
+        retry_count: int,
+        state: _ResumeState,
+        reconnectable: bool,
+        timeouts: StreamTimeouts | None,
+        deadline: float | None,
+    ) -> float:
+        """Decide whether to retry a failed attempt and for how long to wait.
+
+        Args:
+            error: Error that ended the attempt
+            retry_count: Retries so far, including this one
+            state: Resume position of the stream
+            reconnectable: Whether reconnection is enabled
+            timeouts: Limits of the whole stream
+            deadline: Monotonic time the total deadline passes, or None
+
+        Returns:
+            Backoff in seconds, jittered by the retry policy
+
+        Raises:
+            Exception: ``error`` itself when it should not be retried
+            StreamTimeoutError: If the backoff would outlast the total deadline
 
-class StreamManager:
+        """
+        # Check if we should retry
+        if retry_count > self.retry_config.max_retries:
+            raise error
+
+        # Check if reconnectable
+        if not reconnectable or not state.cursor:
+            raise error
+
+        # The total deadline covers every attempt
+        if isinstance(error, StreamTimeoutError) and error.kind == "total":
+            raise error
+
+        backoff_seconds = self.retry_config.calculate_backoff(retry_count - 1)
+        if deadline is not None and time.monotonic() + backoff_seconds >= deadline:
+            total = timeouts.total if timeouts is not None else None
+            raise stream_timeout_error("total", total or 0.0) from error
+        return backoff_seconds
+
+    @staticmethod
+    def _retry_chunk(
+        error: Exception, retry_count: int, backoff_seconds: float, context_uuid: str
+    ) -> StreamChunk:
+        """Build the chunk announcing a retry.
+
+        Returns:
+            StreamChunk of type ``error`` with status ``retrying``
+
+        """
+        return StreamChunk(
+            type="error",
+            status="retrying",
+            data={
+                "error": str(error),
+                "retry_count": retry_count,
+                "backoff_seconds": backoff_seconds,
+            },
+            backend_uuid=None,
+            context_uuid=context_uuid,
+        )
+
+    def _with_timeout_limits(
+        self, timeout_ms: int | None, first_byte_ms: int | None, idle_ms: int | None
+    ) -> StreamTimeouts:
+        """Combine the default limits with stream_with_timeout overrides.
+
+        Returns:
+            StreamTimeouts for the stream
+
+        """
+        timeouts = replace(
+            self.timeouts or StreamTimeouts(),
+            total=(timeout_ms or self.timeout_ms) / 1000.0,
+        )
+        if first_byte_ms is not None:
+            timeouts = replace(timeouts, first_byte=first_byte_ms / 1000.0)
+        if idle_ms is not None:
+            timeouts = replace(timeouts, idle=idle_ms / 1000.0)
+        return timeouts
+
+
+class StreamManager(_BaseStreamManager):
     """Manage SSE streams with retry and reconnection.
 
-    Handles automatic retry with exponential backoff and cursor-based
-    reconnection for resumable streams.
+    Handles automatic retry with jittered exponential backoff (see
+    RetryConfig) and cursor-based reconnection for resumable streams. Idle
+    and first-byte timeouts are retried like disconnects; the total
+    deadline spans all attempts and the backoff between them. With a
+    checkpoint store the resume position is saved while streaming, so
+    resume() can continue a stream after a restart.
 
     Example:
         >>> manager = StreamManager(
@@ -37,6 +375,12 @@ class StreamManager:
         max_retries: int = 3,
         retry_backoff_ms: int = 1500,
         timeout_ms: int = 30000,
+        timeouts: StreamTimeouts | None = None,
+        retry_config: RetryConfig | None = None,
+        checkpoint_store: CheckpointStore | None = None,
+        checkpoint_every: int = 10,
+        checkpoint_interval_ms: int = 1000,
+        metrics: MetricsSink | None = None,
     ) -> None:
         """Initialize stream manager.
 
@@ -44,13 +388,32 @@ class StreamManager:
             transport: SSETransport instance
             max_retries: Maximum number of retry attempts
             retry_backoff_ms: Base backoff time in milliseconds
-            timeout_ms: Request timeout in milliseconds
+            timeout_ms: Total deadline used by stream_with_timeout, in
+                milliseconds
+            timeouts: Default limits for every stream
+            retry_config: Backoff policy (jitter, cap); overrides
+                max_retries and retry_backoff_ms when given
+            checkpoint_store: Where resume positions are saved so
+                resume() works after a restart; None disables checkpoints
+            checkpoint_every: Save a checkpoint after this many events
+            checkpoint_interval_ms: Save a checkpoint when this much time
+                has passed since the last one
+            metrics: Sink receiving the StreamTiming of every stream,
+                retries included
 
         """
+        super().__init__(
+            max_retries,
+            retry_backoff_ms,
+            timeout_ms,
+            timeouts,
+            retry_config,
+            checkpoint_store,
+            checkpoint_every,
+            checkpoint_interval_ms,
+            metrics,
+        )
         self.transport = transport
-        self.max_retries = max_retries
-        self.retry_backoff_ms = retry_backoff_ms
-        self.timeout_ms = timeout_ms
 
     def stream(
         self,
@@ -62,8 +425,10 @@ class StreamManager:
         sources: list[str] | None = None,
         parent_entry_uuid: str | None = None,
         reconnectable: bool = True,
+        timeouts: StreamTimeouts | None = None,
+        timing: StreamTiming | None = None,
         **extra: Any,
-    ) -> Generator[MessageChunk, None, None]:
+    ) -> Generator[StreamChunk, None, None]:
         """Stream with automatic retry and reconnection.
 
         Args:
@@ -75,76 +440,101 @@ class StreamManager:
             sources: Source types
             parent_entry_uuid: Parent entry UUID
             reconnectable: Enable reconnection with cursor
+            timeouts: Limits for this stream, overriding the default
+            timing: Latency breakdown to fill across all attempts; one is
+                created when the manager has a metrics sink. It is finished
+                and sent to the sink when the stream ends
             **extra: Additional parameters
 
         Yields:
-            MessageChunk objects from stream
+            StreamChunk objects from stream
 
         Raises:
             StreamingError: If all retries exhausted
+            StreamTimeoutError: If the total deadline passes, or an idle or
+                first-byte timeout cannot be retried
 
         """
+        request = _stream_request(
+            query,
+            context_uuid,
+            frontend_uuid,
+            mode,
+            model_preference,
+            sources,
+            parent_entry_uuid,
+            extra,
+        )
+        timing = self._stream_timing(timing)
+        chunks = self._run(request, _ResumeState(), reconnectable, timeouts, timing)
+        yield from chunks if timing is None else timed(chunks, timing, self.metrics)
+
+    def resume(
+        self,
+        frontend_uuid: str,
+        timeouts: StreamTimeouts | None = None,
+        timing: StreamTiming | None = None,
+    ) -> Generator[StreamChunk, None, None]:
+        """Resume a stream from its saved checkpoint.
+
+        Continues from the saved cursor, e.g. after a process restart,
+        without re-running the search. Only events after the checkpoint are
+        yielded.
+
+        Args:
+            frontend_uuid: Client-generated entry UUID of the stream
+            timeouts: Limits for the resumed stream
+            timing: Latency breakdown to fill, see stream()
+
+        Yields:
+            StreamChunk objects from the resumed stream
+
+        Raises:
+            StreamingError: If there is no checkpoint for the stream
+
+        """
+        checkpoint = self._load_checkpoint(frontend_uuid)
+        timing = self._stream_timing(timing)
+        chunks = self._run(checkpoint.request, _ResumeState(checkpoint), True, timeouts, timing)
+        yield from chunks if timing is None else timed(chunks, timing, self.metrics)
+
+    def _run(
+        self,
+        request: dict[str, Any],
+        state: _ResumeState,
+        reconnectable: bool,
+        timeouts: StreamTimeouts | None,
+        timing: StreamTiming | None,
+    ) -> Generator[StreamChunk, None, None]:
+        """Stream with retries, starting from ``state``."""
+        timeouts = timeouts or self.timeouts
+        deadline = self._deadline(timeouts)
         retry_count = 0
-        cursor: str | None = None
-        resume_entry_uuids: list[str] = []
 
-        while retry_count <= self.max_retries:
+        while True:
             try:
                 # Stream from transport
                 for chunk in self.transport.stream(
-                    query=query,
-                    context_uuid=context_uuid,
-                    frontend_uuid=frontend_uuid,
-                    mode=mode,
-                    model_preference=model_preference,
-                    sources=sources,
-                    parent_entry_uuid=parent_entry_uuid,
-                    cursor=cursor,
-                    resume_entry_uuids=resume_entry_uuids if resume_entry_uuids else None,
-                    **extra,
+                    **request,
+                    timeouts=self._attempt_timeouts(timeouts, deadline),
+                    timing=timing,
+                    **state.request_params(),
                 ):
-                    # Yield chunk
                     yield chunk
-
-                    # Update cursor for reconnection
-                    if reconnectable and chunk.cursor:
-                        cursor = chunk.cursor
-
-                    # Track backend UUID for resume
-                    if chunk.backend_uuid and chunk.backend_uuid not in resume_entry_uuids:
-                        resume_entry_uuids.append(chunk.backend_uuid)
+                    state.update(chunk, reconnectable)
+                    self._checkpoint(request, state)
 
                 # Stream completed successfully
-                break
+                self._completed(request)
+                return
 
-            except (TransportError, StreamingError, OSError) as e:
+            except RETRYABLE_ERRORS as e:
+                self._checkpoint(request, state, force=True)
                 retry_count += 1
-
-                # Check if we should retry
-                if retry_count > self.max_retries:
-                    raise
-
-                # Check if reconnectable
-                if not reconnectable or not cursor:
-                    raise
-
-                # Calculate backoff time with exponential increase
-                backoff_time = self.retry_backoff_ms * (2 ** (retry_count - 1))
-                backoff_seconds = backoff_time / 1000.0
-
-                # Yield error chunk
-                error_chunk = MessageChunk(
-                    type="error",
-                    status="retrying",
-                    data={
-                        "error": str(e),
-                        "retry_count": retry_count,
-                        "backoff_seconds": backoff_seconds,
-                    },
-                    backend_uuid=None,
-                    context_uuid=context_uuid,
+                backoff_seconds = self._retry_backoff(
+                    e, retry_count, state, reconnectable, timeouts, deadline
                 )
-                yield error_chunk
+                yield self._retry_chunk(e, retry_count, backoff_seconds, request["context_uuid"])
 
                 # Wait before retry
                 time.sleep(backoff_seconds)
@@ -155,35 +545,282 @@ class StreamManager:
         context_uuid: str,
         frontend_uuid: str,
         timeout_ms: int | None = None,
+        first_byte_ms: int | None = None,
+        idle_ms: int | None = None,
         **kwargs: Any,
-    ) -> Generator[MessageChunk, None, None]:
-        """Stream with timeout enforcement.
+    ) -> Generator[StreamChunk, None, None]:
+        """Stream with deadline enforcement.
+
+        The limits are applied to the network reads, so a stalled upstream
+        is interrupted instead of being noticed when the next chunk lands.
 
         Args:
             query: Search query
             context_uuid: Thread context UUID
             frontend_uuid: Client-generated entry UUID
-            timeout_ms: Override default timeout
+            timeout_ms: Total deadline, overriding ``timeout_ms`` of the manager
+            first_byte_ms: Time to wait for the response to start
+            idle_ms: Longest silence between reads
             **kwargs: Additional parameters
 
         Yields:
-            MessageChunk objects from stream
+            StreamChunk objects from stream
 
         Raises:
-            TimeoutError: If stream exceeds timeout
+            StreamTimeoutError: If a limit is exceeded (a TimeoutError)
 
         """
-        timeout = (timeout_ms or self.timeout_ms) / 1000.0
-        start_time = time.time()
+        yield from self.stream(
+            query=query,
+            context_uuid=context_uuid,
+            frontend_uuid=frontend_uuid,
+            timeouts=self._with_timeout_limits(timeout_ms, first_byte_ms, idle_ms),
+            **kwargs,
+        )
+
+
+class AsyncStreamManager(_BaseStreamManager):
+    """Manage asyncio SSE streams with retry and reconnection.
 
-        for chunk in self.stream(
+    Async twin of StreamManager built on AsyncSSETransport. Backoff waits
+    use ``asyncio.sleep``, so a reconnecting stream never blocks the event
+    loop, and the jitter from RetryConfig spreads reconnects of many
+    streams that failed together. Checkpoint store calls run in worker
+    threads via ``asyncio.to_thread``, so a SQLite store never stalls the
+    loop either.
+
+    Example:
+        >>> manager = AsyncStreamManager(transport, retry_config=RetryConfig(max_retries=5))
+        >>> async for chunk in manager.stream(query="test", context_uuid="uuid"):
+        ...     print(chunk.text)
+
+    """
+
+    def __init__(
+        self,
+        transport: AsyncSSETransport,
+        max_retries: int = 3,
+        retry_backoff_ms: int = 1500,
+        timeout_ms: int = 30000,
+        timeouts: StreamTimeouts | None = None,
+        retry_config: RetryConfig | None = None,
+        checkpoint_store: CheckpointStore | None = None,
+        checkpoint_every: int = 10,
+        checkpoint_interval_ms: int = 1000,
+        metrics: MetricsSink | None = None,
+    ) -> None:
+        """Initialize async stream manager.
+
+        Args:
+            transport: AsyncSSETransport instance
+            max_retries: Maximum number of retry attempts
+            retry_backoff_ms: Base backoff time in milliseconds
+            timeout_ms: Total deadline used by stream_with_timeout, in
+                milliseconds
+            timeouts: Default limits for every stream
+            retry_config: Backoff policy (jitter, cap); overrides
+                max_retries and retry_backoff_ms when given
+            checkpoint_store: Where resume positions are saved so
+                resume() works after a restart; None disables checkpoints
+            checkpoint_every: Save a checkpoint after this many events
+            checkpoint_interval_ms: Save a checkpoint when this much time
+                has passed since the last one
+            metrics: Sink receiving the StreamTiming of every stream,
+                retries included
+
+        """
+        super().__init__(
+            max_retries,
+            retry_backoff_ms,
+            timeout_ms,
+            timeouts,
+            retry_config,
+            checkpoint_store,
+            checkpoint_every,
+            checkpoint_interval_ms,
+            metrics,
+        )
+        self.transport = transport
+
+    async def stream(
+        self,
+        query: str,
+        context_uuid: str,
+        frontend_uuid: str,
+        mode: str = "concise",
+        model_preference: str = "pplx-70b-chat",
+        sources: list[str] | None = None,
+        parent_entry_uuid: str | None = None,
+        reconnectable: bool = True,
+        timeouts: StreamTimeouts | None = None,
+        timing: StreamTiming | None = None,
+        **extra: Any,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream with automatic retry and reconnection.
+
+        Args:
+            query: Search query
+            context_uuid: Thread context UUID
+            frontend_uuid: Client-generated entry UUID
+            mode: Query mode
+            model_preference: Model to use
+            sources: Source types
+            parent_entry_uuid: Parent entry UUID
+            reconnectable: Enable reconnection with cursor
+            timeouts: Limits for this stream, overriding the default
+            timing: Latency breakdown to fill across all attempts; one is
+                created when the manager has a metrics sink. It is finished
+                and sent to the sink when the stream ends
+            **extra: Additional parameters
+
+        Yields:
+            StreamChunk objects from stream
+
+        Raises:
+            StreamingError: If all retries exhausted
+            StreamTimeoutError: If the total deadline passes, or an idle or
+                first-byte timeout cannot be retried
+
+        """
+        request = _stream_request(
+            query,
+            context_uuid,
+            frontend_uuid,
+            mode,
+            model_preference,
+            sources,
+            parent_entry_uuid,
+            extra,
+        )
+        timing = self._stream_timing(timing)
+        chunks = self._run(request, _ResumeState(), reconnectable, timeouts, timing)
+        if timing is not None:
+            chunks = atimed(chunks, timing, self.metrics)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+
+    async def resume(
+        self,
+        frontend_uuid: str,
+        timeouts: StreamTimeouts | None = None,
+        timing: StreamTiming | None = None,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Resume a stream from its saved checkpoint.
+
+        Args:
+            frontend_uuid: Client-generated entry UUID of the stream
+            timeouts: Limits for the resumed stream
+            timing: Latency breakdown to fill, see stream()
+
+        Yields:
+            StreamChunk objects from the resumed stream
+
+        Raises:
+            StreamingError: If there is no checkpoint for the stream
+
+        """
+        checkpoint = await asyncio.to_thread(self._load_checkpoint, frontend_uuid)
+        timing = self._stream_timing(timing)
+        chunks = self._run(checkpoint.request, _ResumeState(checkpoint), True, timeouts, timing)
+        if timing is not None:
+            chunks = atimed(chunks, timing, self.metrics)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+
+    async def _acheckpoint(
+        self, request: dict[str, Any], state: _ResumeState, force: bool = False
+    ) -> None:
+        """Save the resume position if due, in a worker thread.
+
+        Stores such as SQLiteCheckpointStore commit to disk under a lock;
+        the event loop never waits on them.
+
+        Args:
+            request: Transport arguments of the stream
+            state: Current resume position
+            force: Save regardless of the event and time thresholds
+
+        """
+        checkpoint = self._due_checkpoint(request, state, force)
+        if checkpoint is not None and self.checkpoint_store is not None:
+            await asyncio.to_thread(self.checkpoint_store.save, checkpoint)
+
+    async def _run(
+        self,
+        request: dict[str, Any],
+        state: _ResumeState,
+        reconnectable: bool,
+        timeouts: StreamTimeouts | None,
+        timing: StreamTiming | None,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream with retries, starting from ``state``."""
+        timeouts = timeouts or self.timeouts
+        deadline = self._deadline(timeouts)
+        retry_count = 0
+
+        while True:
+            try:
+                async for chunk in self.transport.stream(
+                    **request,
+                    timeouts=self._attempt_timeouts(timeouts, deadline),
+                    timing=timing,
+                    **state.request_params(),
+                ):
+                    yield chunk
+                    state.update(chunk, reconnectable)
+                    await self._acheckpoint(request, state)
+
+                # Stream completed successfully
+                if self.checkpoint_store is not None:
+                    await asyncio.to_thread(self._completed, request)
+                return
+
+            except RETRYABLE_ERRORS as e:
+                await self._acheckpoint(request, state, force=True)
+                retry_count += 1
+                backoff_seconds = self._retry_backoff(
+                    e, retry_count, state, reconnectable, timeouts, deadline
+                )
+                yield self._retry_chunk(e, retry_count, backoff_seconds, request["context_uuid"])
+
+                # Wait before retry without blocking the event loop
+                await asyncio.sleep(backoff_seconds)
+
+    async def stream_with_timeout(
+        self,
+        query: str,
+        context_uuid: str,
+        frontend_uuid: str,
+        timeout_ms: int | None = None,
+        first_byte_ms: int | None = None,
+        idle_ms: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream with deadline enforcement.
+
+        Args:
+            query: Search query
+            context_uuid: Thread context UUID
+            frontend_uuid: Client-generated entry UUID
+            timeout_ms: Total deadline, overriding ``timeout_ms`` of the manager
+            first_byte_ms: Time to wait for the response to start
+            idle_ms: Longest silence between reads
+            **kwargs: Additional parameters
+
+        Yields:
+            StreamChunk objects from stream
+
+        Raises:
+            StreamTimeoutError: If a limit is exceeded (a TimeoutError)
+
+        """
+        async for chunk in self.stream(
             query=query,
             context_uuid=context_uuid,
             frontend_uuid=frontend_uuid,
+            timeouts=self._with_timeout_limits(timeout_ms, first_byte_ms, idle_ms),
             **kwargs,
         ):
-            # Check timeout
-            if time.time() - start_time > timeout:
-                raise TimeoutError(f"Stream exceeded timeout of {timeout}s")
-
             yield chunk
@@ -1,6 +1,9 @@
 """SSE parsing utilities."""
 
-import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from pplx_sdk.shared import codec
+from pplx_sdk.transport.sse_decoder import SSEDecoder, SSEEvent
 
 
 def parse_sse_line(line: str) -> tuple[str | None, str | None]:
@@ -36,18 +39,68 @@ def parse_sse_line(line: str) -> tuple[str | None, str | None]:
     return None, None
 
 
-def parse_sse_data(data: str) -> dict:
+def iter_sse_events(
+    chunks: Iterable[bytes], end_marker: bytes | None = b"[end]"
+) -> Iterator[SSEEvent]:
+    """Decode raw SSE byte chunks into complete events.
+
+    Args:
+        chunks: Raw byte chunks, e.g. from ``httpx.Response.iter_bytes()``
+        end_marker: Comment payload that terminates the stream
+
+    Yields:
+        SSEEvent objects in stream order
+
+    """
+    decoder = SSEDecoder(end_marker=end_marker)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+        if decoder.ended:
+            break
+
+    last = decoder.flush()
+    if last is not None:
+        yield last
+
+
+async def aiter_sse_events(
+    chunks: AsyncIterable[bytes], end_marker: bytes | None = b"[end]"
+) -> AsyncIterator[SSEEvent]:
+    """Decode raw SSE byte chunks from an async source into complete events.
+
+    Args:
+        chunks: Raw byte chunks, e.g. from ``httpx.Response.aiter_bytes()``
+        end_marker: Comment payload that terminates the stream
+
+    Yields:
+        SSEEvent objects in stream order
+
+    """
+    decoder = SSEDecoder(end_marker=end_marker)
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+        if decoder.ended:
+            break
+
+    last = decoder.flush()
+    if last is not None:
+        yield last
+
+
+def parse_sse_data(data: str | bytes) -> dict:
     """Parse SSE data field as JSON.
 
     Args:
-        data: Data string (should be JSON)
+        data: Data string or raw bytes (should be JSON)
 
     Returns:
         Parsed dictionary or {"text": data} if not valid JSON
 
     """
     try:
-        parsed: dict = json.loads(data)
+        parsed: dict = codec.loads(data)
         return parsed
-    except json.JSONDecodeError:
-        return {"text": data}
+    except ValueError:
+        text = data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+        return {"text": text}
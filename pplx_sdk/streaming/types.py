@@ -16,3 +16,5 @@ class EventType(StrEnum):
     BACKEND_UUID = "backend_uuid"
     SEARCH_FOCUS = "search_focus"
     QUERY_REPHRASED = "query_rephrased"
+    # Emitted by the SDK where a reconnected stream picks up
+    RESUMED = "resumed"
@@ -0,0 +1,21 @@
+"""Offline testing and benchmarking helpers."""
+
+from pplx_sdk.testing.cassette import (
+    Cassette,
+    CassetteError,
+    CassettePlayer,
+    CassetteRecorder,
+    Interaction,
+)
+from pplx_sdk.testing.standin import StandinConfig, StandinServer, StandinStats
+
+__all__ = [
+    "Cassette",
+    "CassetteError",
+    "CassettePlayer",
+    "CassetteRecorder",
+    "Interaction",
+    "StandinConfig",
+    "StandinServer",
+    "StandinStats",
+]
@@ -0,0 +1,5 @@
+"""Run the local Perplexity stand-in: ``python -m pplx_sdk.testing``."""
+
+from pplx_sdk.testing.standin import main
+
+main()
@@ -0,0 +1,364 @@
+"""Record and replay raw SSE streams.
+
+CassetteRecorder is an httpx transport that forwards requests to a real
+transport and records every response: status, headers and the raw body
+chunks with the delay before each one. CassettePlayer is an
+``httpx.MockTransport`` handler that answers requests from a cassette,
+either at the recorded pace or as fast as possible, so the whole stack
+above the socket (SSEDecoder, EntriesService.ask, the OAI server) runs
+offline and reproducibly.
+
+Cassette files are gzip-compressed binary::
+
+    b"PPLXCAS1"
+    per interaction:
+        u32 length, JSON metadata (method, url, status, headers, latency, chunks)
+        per chunk: u32 delay in microseconds, u32 length, raw bytes
+
+Example:
+    >>> cassette = Cassette()
+    >>> http = httpx.Client(transport=CassetteRecorder(cassette))
+    >>> with PerplexityClient(auth_token=token, http_client=http) as client:
+    ...     client.new_conversation().ask("What is AI?")
+    >>> cassette.save("ask.cassette")
+
+    >>> player = CassettePlayer(Cassette.load("ask.cassette"))
+    >>> http = httpx.Client(transport=httpx.MockTransport(player))
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import struct
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from pplx_sdk.shared import codec
+
+_MAGIC = b"PPLXCAS1"
+_LENGTH = struct.Struct("<I")
+_CHUNK = struct.Struct("<II")
+
+
+class CassetteError(LookupError):
+    """A request has no matching interaction left in the cassette."""
+
+
+@dataclass
+class Interaction:
+    """One recorded request and its response.
+
+    Attributes:
+        method: Request method
+        url: Request URL
+        status_code: Response status
+        headers: Response headers, in order
+        latency: Seconds from sending the request to the response headers
+        chunks: Body chunks as ``(delay, data)``, the delay being the
+            seconds since the previous chunk (or the headers)
+
+    """
+
+    method: str
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    latency: float = 0.0
+    chunks: list[tuple[float, bytes]] = field(default_factory=list)
+
+    @property
+    def body(self) -> bytes:
+        """The whole response body."""
+        return b"".join(data for _, data in self.chunks)
+
+    def matches(self, request: httpx.Request) -> bool:
+        """Whether a request has this interaction's method and URL path.
+
+        Args:
+            request: Request to check
+
+        Returns:
+            True on a match; host and query string are ignored
+
+        """
+        return request.method == self.method and request.url.path == httpx.URL(self.url).path
+
+
+@dataclass
+class Cassette:
+    """Ordered list of recorded interactions.
+
+    Attributes:
+        interactions: Interactions in the order they were recorded
+
+    """
+
+    interactions: list[Interaction] = field(default_factory=list)
+
+    def save(self, path: str | Path) -> None:
+        """Write the cassette to a file.
+
+        Args:
+            path: Destination file
+
+        """
+        with gzip.open(Path(path), "wb") as file:
+            file.write(_MAGIC)
+            for interaction in self.interactions:
+                meta = codec.dumps(
+                    {
+                        "method": interaction.method,
+                        "url": interaction.url,
+                        "status_code": interaction.status_code,
+                        "headers": interaction.headers,
+                        "latency": interaction.latency,
+                        "chunks": len(interaction.chunks),
+                    }
+                )
+                file.write(_LENGTH.pack(len(meta)))
+                file.write(meta)
+                for delay, data in interaction.chunks:
+                    file.write(_CHUNK.pack(round(delay * 1_000_000), len(data)))
+                    file.write(data)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Cassette:
+        """Read a cassette written by save().
+
+        Args:
+            path: Cassette file
+
+        Returns:
+            Cassette instance
+
+        Raises:
+            ValueError: If the file is not a cassette
+
+        """
+        with gzip.open(Path(path), "rb") as file:
+            data = file.read()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"Not a cassette file: {path}")
+
+        interactions = []
+        offset = len(_MAGIC)
+        while offset < len(data):
+            (size,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            meta = codec.loads(data[offset : offset + size])
+            offset += size
+            chunks = []
+            for _ in range(meta.pop("chunks")):
+                delay, size = _CHUNK.unpack_from(data, offset)
+                offset += _CHUNK.size
+                chunks.append((delay / 1_000_000, data[offset : offset + size]))
+                offset += size
+            meta["headers"] = [(name, value) for name, value in meta["headers"]]
+            interactions.append(Interaction(**meta, chunks=chunks))
+        return cls(interactions)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+
+class _RecordingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body that copies each chunk into an interaction."""
+
+    def __init__(self, stream: Any, interaction: Interaction) -> None:
+        self._stream = stream
+        self._interaction = interaction
+        self._last = time.perf_counter()
+
+    def _record(self, data: bytes) -> None:
+        now = time.perf_counter()
+        self._interaction.chunks.append((now - self._last, bytes(data)))
+        self._last = now
+
+    def __iter__(self) -> Iterator[bytes]:
+        for data in self._stream:
+            self._record(data)
+            yield data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for data in self._stream:
+            self._record(data)
+            yield data
+
+    def close(self) -> None:
+        self._stream.close()
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class CassetteRecorder(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """httpx transport recording the responses of a real transport.
+
+    Works for both ``httpx.Client`` and ``httpx.AsyncClient``. Interactions
+    are added to the cassette when their response starts, so they keep
+    the request order; body chunks are added as they are read.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize recorder.
+
+        Args:
+            cassette: Cassette receiving the interactions
+            transport: Transport for sync clients (default: HTTPTransport)
+            async_transport: Transport for async clients (default:
+                AsyncHTTPTransport)
+
+        """
+        self.cassette = cassette
+        self._transport = transport
+        self._async_transport = async_transport
+
+    def _start(self, request: httpx.Request, response: httpx.Response, sent: float) -> Interaction:
+        interaction = Interaction(
+            method=request.method,
+            url=str(request.url),
+            status_code=response.status_code,
+            headers=[(name, value) for name, value in response.headers.multi_items()],
+            latency=time.perf_counter() - sent,
+        )
+        self.cassette.interactions.append(interaction)
+        return interaction
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Forward a request and record its response."""
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        sent = time.perf_counter()
+        response = self._transport.handle_request(request)
+        interaction = self._start(request, response, sent)
+        response.stream = _RecordingStream(response.stream, interaction)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Forward a request and record its response."""
+        if self._async_transport is None:
+            self._async_transport = httpx.AsyncHTTPTransport()
+        sent = time.perf_counter()
+        response = await self._async_transport.handle_async_request(request)
+        interaction = self._start(request, response, sent)
+        response.stream = _RecordingStream(response.stream, interaction)
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped sync transport."""
+        if self._transport is not None:
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        """Close the wrapped async transport."""
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+
+
+class _ReplayStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body replaying recorded chunks, optionally paced."""
+
+    def __init__(self, chunks: list[tuple[float, bytes]], speed: float | None) -> None:
+        self._chunks = chunks
+        self._speed = speed
+
+    def __iter__(self) -> Iterator[bytes]:
+        for delay, data in self._chunks:
+            if self._speed:
+                time.sleep(delay / self._speed)
+            yield data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for delay, data in self._chunks:
+            if self._speed:
+                await asyncio.sleep(delay / self._speed)
+            yield data
+
+
+class CassettePlayer:
+    """``httpx.MockTransport`` handler answering requests from a cassette.
+
+    Interactions are played in recorded order. Each request takes the next
+    unplayed interaction with the same method and URL path, so concurrent
+    streams to one endpoint are answered in arrival order.
+
+    Example:
+        >>> player = CassettePlayer(Cassette.load("ask.cassette"), speed=1.0)
+        >>> http = httpx.AsyncClient(transport=httpx.MockTransport(player))
+        >>> client = AsyncPerplexityClient(auth_token="unused", http_client=http)
+
+    """
+
+    def __init__(self, cassette: Cassette, speed: float | None = None, loop: bool = False) -> None:
+        """Initialize player.
+
+        Args:
+            cassette: Interactions to replay
+            speed: Pace relative to the recording (1.0 = recorded timings,
+                2.0 = twice as fast); None replays as fast as possible
+            loop: Start over once every interaction has been played, for
+                benchmarks replaying one cassette many times
+
+        """
+        self.cassette = cassette
+        self.speed = speed
+        self.loop = loop
+        self.played = 0
+        self._pending = list(cassette.interactions)
+        self._lock = threading.Lock()
+
+    def _next(self, request: httpx.Request) -> Interaction:
+        with self._lock:
+            for attempt in range(2):
+                for index, interaction in enumerate(self._pending):
+                    if interaction.matches(request):
+                        del self._pending[index]
+                        self.played += 1
+                        return interaction
+                if not (self.loop and attempt == 0):
+                    break
+                self._pending = list(self.cassette.interactions)
+        raise CassetteError(f"No recorded interaction left for {request.method} {request.url}")
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request with its recorded response.
+
+        When paced, the recorded header latency is waited out before the
+        first body chunk: MockTransport calls handlers synchronously, so
+        sleeping here would block an async client's event loop.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            Response streaming the recorded body
+
+        Raises:
+            CassetteError: If no interaction matches
+
+        """
+        interaction = self._next(request)
+        chunks = interaction.chunks
+        if self.speed and chunks:
+            # Pay the header latency before the first chunk
+            first_delay, first = chunks[0]
+            chunks = [(interaction.latency + first_delay, first), *chunks[1:]]
+        return httpx.Response(
+            interaction.status_code,
+            headers=interaction.headers,
+            stream=_ReplayStream(chunks, self.speed),
+            request=request,
+        )
@@ -0,0 +1,845 @@
+"""Local stand-in for the Perplexity web API, for load tests.
+
+StandinServer is a small asyncio HTTP/1.1 server answering
+``POST /rest/sse/perplexity.ask`` with generated answer streams and the
+thread, entry and collection endpoints of docs/REST_API.md from an
+in-memory store. Completed answers are stored as entries of their thread,
+so the REST endpoints see what was asked.
+
+Streams can be shaped to look like a real upstream under load:
+
+- ``events`` answer chunks of ``chunk_size`` characters each
+- ``latency`` before the response headers and ``interval`` between
+  events, both with up to ``jitter`` seconds of random extra delay
+- ``disconnect_after``: the connection is cut after this many answer
+  chunks of each attempt; every chunk carries a ``cursor`` (also sent as
+  the SSE ``id``) and a request with ``cursor`` or ``Last-Event-ID``
+  continues after it, repeating the last ``resume_overlap`` chunks
+- ``rate_limit_every``: every n-th request is answered with a 429 and a
+  ``Retry-After`` header
+
+Run it with::
+
+    python -m pplx_sdk.testing --port 8765 --events 200 --interval 0.01
+
+and point a client at it with ``PerplexityClient(api_base="http://127.0.0.1:8765")``.
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import random
+import re
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from pplx_sdk.shared import codec
+
+SSE_PATH = "/rest/sse/perplexity.ask"
+
+_FILLER = "the quick brown fox jumps over the lazy dog "
+
+
+@dataclass
+class StandinConfig:
+    """Shape of the generated streams and failures.
+
+    Attributes:
+        events: Answer chunks per stream
+        chunk_size: Characters of answer text per chunk
+        latency: Seconds before the response headers
+        interval: Seconds between events
+        jitter: Up to this many extra seconds, drawn uniformly, added to
+            ``latency`` and to every ``interval``
+        disconnect_after: Cut each stream attempt after this many answer
+            chunks; None never disconnects
+        resume_overlap: Answer chunks a resumed stream repeats from before
+            its cursor, as a real upstream may
+        rate_limit_every: Answer every n-th request with a 429; 0 never
+        retry_after: ``Retry-After`` seconds sent with a 429
+        seed: Seed of the jitter generator
+
+    """
+
+    events: int = 50
+    chunk_size: int = 24
+    latency: float = 0.0
+    interval: float = 0.0
+    jitter: float = 0.0
+    disconnect_after: int | None = None
+    resume_overlap: int = 0
+    rate_limit_every: int = 0
+    retry_after: int = 1
+    seed: int | None = None
+
+
+@dataclass
+class StandinStats:
+    """Counters of a running stand-in.
+
+    Attributes:
+        connections: Accepted TCP connections
+        requests: HTTP requests received
+        streams: SSE streams started, resumed ones included
+        resumed: Streams continued from a cursor
+        disconnects: Streams cut by ``disconnect_after``
+        rate_limited: Requests answered with a 429
+
+    """
+
+    connections: int = 0
+    requests: int = 0
+    streams: int = 0
+    resumed: int = 0
+    disconnects: int = 0
+    rate_limited: int = 0
+
+
+class _HTTPError(Exception):
+    """Error answered with the documented JSON error body."""
+
+    def __init__(self, status: int, code: str, message: str, **details: Any) -> None:
+        super().__init__(message)
+        self.status = status
+        self.body = {"error": {"code": code, "message": message, "details": details}}
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _page(items: list[dict[str, Any]], query: dict[str, str]) -> dict[str, Any]:
+    """Apply offset pagination to a list response."""
+    try:
+        limit = int(query.get("limit", 20))
+        offset = int(query.get("offset", 0))
+    except ValueError:
+        raise _HTTPError(400, "validation_error", "limit and offset must be integers") from None
+    page = items[offset : offset + limit]
+    has_more = offset + len(page) < len(items)
+    result: dict[str, Any] = {"items": page, "total": len(items), "has_more": has_more}
+    if has_more:
+        result["next_offset"] = offset + len(page)
+    return result
+
+
+def _patch(resource: dict[str, Any], body: Any, fields: tuple[str, ...]) -> None:
+    """Apply a JSON merge body or a list of JSON Patch ``replace`` ops."""
+    if isinstance(body, dict):
+        changes = body
+    elif isinstance(body, list):
+        changes = {
+            op.get("path", "").lstrip("/"): op.get("value")
+            for op in body
+            if isinstance(op, dict) and op.get("op") == "replace"
+        }
+    else:
+        raise _HTTPError(400, "validation_error", "Expected a JSON object or JSON Patch list")
+    for name, value in changes.items():
+        if name in fields:
+            resource[name] = value
+    resource["updated_at"] = _now()
+
+
+class _Store:
+    """In-memory threads, entries and collections."""
+
+    def __init__(self) -> None:
+        self.threads: dict[str, dict[str, Any]] = {}
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.collections: dict[str, dict[str, Any]] = {}
+
+    def thread(self, thread_uuid: str) -> dict[str, Any]:
+        try:
+            return self.threads[thread_uuid]
+        except KeyError:
+            raise _HTTPError(
+                404, "not_found", "Thread not found", resource="thread", uuid=thread_uuid
+            ) from None
+
+    def entry(self, entry_uuid: str) -> dict[str, Any]:
+        try:
+            return self.entries[entry_uuid]
+        except KeyError:
+            raise _HTTPError(
+                404, "not_found", "Entry not found", resource="entry", uuid=entry_uuid
+            ) from None
+
+    def collection(self, collection_uuid: str) -> dict[str, Any]:
+        try:
+            return self.collections[collection_uuid]
+        except KeyError:
+            raise _HTTPError(
+                404,
+                "not_found",
+                "Collection not found",
+                resource="collection",
+                uuid=collection_uuid,
+            ) from None
+
+    def new_thread(
+        self, title: str, access: str = "private", thread_uuid: str | None = None
+    ) -> dict[str, Any]:
+        now = _now()
+        thread: dict[str, Any] = {
+            "uuid": thread_uuid or str(uuid.uuid4()),
+            "title": title,
+            "created_at": now,
+            "updated_at": now,
+            "access": access,
+            "entries": [],
+            "collection_uuids": [],
+        }
+        self.threads[thread["uuid"]] = thread
+        return thread
+
+    def add_entry(self, thread: dict[str, Any], entry: dict[str, Any]) -> None:
+        entry["thread_uuid"] = thread["uuid"]
+        self.entries[entry["uuid"]] = entry
+        thread["entries"].append(entry["uuid"])
+        thread["updated_at"] = entry["created_at"]
+
+    def record_answer(
+        self, payload: dict[str, Any], context_uuid: str, backend_uuid: str, text: str, model: str
+    ) -> None:
+        """Store a completed answer as an entry of its thread."""
+        query = str(payload.get("query_str", ""))
+        thread = self.threads.get(context_uuid) or self.new_thread(
+            query[:80], thread_uuid=context_uuid
+        )
+        self.add_entry(
+            thread,
+            {
+                "uuid": backend_uuid,
+                "backend_uuid": backend_uuid,
+                "text_query": query,
+                "text_completed": text,
+                "blocks": [{"type": "text", "content": text}],
+                "sources_list": [],
+                "created_at": _now(),
+                "role": "assistant",
+                "model": model,
+                "liked": False,
+                "like_count": 0,
+            },
+        )
+
+    # Representations
+
+    @staticmethod
+    def thread_summary(thread: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "uuid": thread["uuid"],
+            "title": thread["title"],
+            "created_at": thread["created_at"],
+            "updated_at": thread["updated_at"],
+            "entry_count": len(thread["entries"]),
+            "access": thread["access"],
+        }
+
+    def thread_detail(self, thread: dict[str, Any]) -> dict[str, Any]:
+        entries = [self.entries[entry_uuid] for entry_uuid in thread["entries"]]
+        return {
+            "uuid": thread["uuid"],
+            "title": thread["title"],
+            "created_at": thread["created_at"],
+            "updated_at": thread["updated_at"],
+            "entries": [
+                {
+                    "uuid": entry["uuid"],
+                    "text_completed": entry["text_completed"],
+                    "created_at": entry["created_at"],
+                    "role": entry["role"],
+                    "sources_list": entry["sources_list"],
+                }
+                for entry in entries
+            ],
+            "access": thread["access"],
+            "collection_uuids": thread["collection_uuids"],
+        }
+
+    @staticmethod
+    def collection_summary(collection: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "uuid": collection["uuid"],
+            "name": collection["name"],
+            "description": collection["description"],
+            "created_at": collection["created_at"],
+            "thread_count": len(collection["threads"]),
+            "access": collection["access"],
+        }
+
+
+_Handler = Callable[["StandinServer", re.Match[str], dict[str, str], Any], tuple[int, Any]]
+_ROUTES: list[tuple[str, re.Pattern[str], _Handler]] = []
+
+
+def _route(method: str, pattern: str) -> Callable[[_Handler], _Handler]:
+    def register(handler: _Handler) -> _Handler:
+        _ROUTES.append((method, re.compile(pattern + "$"), handler))
+        return handler
+
+    return register
+
+
+def _required(body: Any, name: str) -> Any:
+    if not isinstance(body, dict) or not body.get(name):
+        raise _HTTPError(400, "validation_error", f"'{name}' is required", field=name)
+    return body[name]
+
+
+@_route("GET", r"/rest/threads")
+def _list_threads(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    sort = query.get("sort", "updated_at")
+    if sort not in ("created_at", "updated_at", "title"):
+        raise _HTTPError(400, "validation_error", f"Cannot sort by {sort!r}", field="sort")
+    threads = sorted(
+        server.store.threads.values(),
+        key=lambda thread: thread[sort],
+        reverse=query.get("order", "desc") == "desc",
+    )
+    return 200, _page([server.store.thread_summary(thread) for thread in threads], query)
+
+
+@_route("POST", r"/rest/threads")
+def _create_thread(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    thread = server.store.new_thread(_required(body, "title"), body.get("access", "private"))
+    return 201, {key: thread[key] for key in ("uuid", "title", "created_at", "access")}
+
+
+@_route("GET", r"/rest/threads/(?P<uuid>[^/]+)")
+def _get_thread(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    return 200, server.store.thread_detail(server.store.thread(match["uuid"]))
+
+
+@_route("PATCH", r"/rest/threads/(?P<uuid>[^/]+)")
+def _update_thread(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    thread = server.store.thread(match["uuid"])
+    _patch(thread, body, ("title", "access"))
+    return 200, server.store.thread_detail(thread)
+
+
+@_route("DELETE", r"/rest/threads/(?P<uuid>[^/]+)")
+def _delete_thread(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    thread = store.threads.pop(store.thread(match["uuid"])["uuid"])
+    for entry_uuid in thread["entries"]:
+        store.entries.pop(entry_uuid, None)
+    for collection in store.collections.values():
+        if thread["uuid"] in collection["threads"]:
+            collection["threads"].remove(thread["uuid"])
+    return 204, None
+
+
+@_route("GET", r"/rest/entries/(?P<uuid>[^/]+)")
+def _get_entry(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    entry = server.store.entry(match["uuid"])
+    return 200, {key: value for key, value in entry.items() if key != "liked"}
+
+
+@_route("POST", r"/rest/entries/(?P<uuid>[^/]+)/fork")
+def _fork_entry(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    entry = store.entry(match["uuid"])
+    body = body if isinstance(body, dict) else {}
+    thread = store.new_thread(
+        body.get("title") or entry["text_query"][:80], body.get("access", "private")
+    )
+    fork = {**entry, "uuid": str(uuid.uuid4()), "liked": False, "like_count": 0}
+    store.add_entry(thread, fork)
+    return 201, {
+        "thread_uuid": thread["uuid"],
+        "entry_uuid": fork["uuid"],
+        "title": thread["title"],
+    }
+
+
+@_route("POST", r"/rest/entries/(?P<uuid>[^/]+)/like")
+def _like_entry(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    entry = server.store.entry(match["uuid"])
+    if not entry["liked"]:
+        entry["liked"] = True
+        entry["like_count"] += 1
+    return 200, {"liked": True, "like_count": entry["like_count"]}
+
+
+@_route("DELETE", r"/rest/entries/(?P<uuid>[^/]+)/like")
+def _unlike_entry(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    entry = server.store.entry(match["uuid"])
+    if entry["liked"]:
+        entry["liked"] = False
+        entry["like_count"] -= 1
+    return 200, {"liked": False, "like_count": entry["like_count"]}
+
+
+@_route("GET", r"/rest/collections")
+def _list_collections(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    return 200, _page([store.collection_summary(c) for c in store.collections.values()], query)
+
+
+@_route("POST", r"/rest/collections")
+def _create_collection(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    now = _now()
+    collection = {
+        "uuid": str(uuid.uuid4()),
+        "name": _required(body, "name"),
+        "description": body.get("description", ""),
+        "created_at": now,
+        "updated_at": now,
+        "access": body.get("access", "private"),
+        "owner_uuid": server.owner_uuid,
+        "threads": [],
+    }
+    server.store.collections[collection["uuid"]] = collection
+    return 201, {key: collection[key] for key in ("uuid", "name", "created_at")}
+
+
+@_route("GET", r"/rest/collections/(?P<uuid>[^/]+)")
+def _get_collection(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    collection = store.collection(match["uuid"])
+    threads = [store.threads[thread_uuid] for thread_uuid in collection["threads"]]
+    return 200, {
+        **{key: value for key, value in collection.items() if key != "threads"},
+        "threads": [
+            {"uuid": t["uuid"], "title": t["title"], "entry_count": len(t["entries"])}
+            for t in threads
+        ],
+    }
+
+
+@_route("PATCH", r"/rest/collections/(?P<uuid>[^/]+)")
+def _update_collection(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    collection = server.store.collection(match["uuid"])
+    _patch(collection, body, ("name", "description", "access"))
+    return 200, server.store.collection_summary(collection)
+
+
+@_route("DELETE", r"/rest/collections/(?P<uuid>[^/]+)")
+def _delete_collection(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    collection = store.collections.pop(store.collection(match["uuid"])["uuid"])
+    for thread_uuid in collection["threads"]:
+        store.threads[thread_uuid]["collection_uuids"].remove(collection["uuid"])
+    return 204, None
+
+
+@_route("POST", r"/rest/collections/(?P<uuid>[^/]+)/threads")
+def _add_to_collection(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    collection = store.collection(match["uuid"])
+    thread = store.thread(_required(body, "thread_uuid"))
+    if thread["uuid"] not in collection["threads"]:
+        collection["threads"].append(thread["uuid"])
+        thread["collection_uuids"].append(collection["uuid"])
+    return 200, {
+        "collection_uuid": collection["uuid"],
+        "thread_uuid": thread["uuid"],
+        "added_at": _now(),
+    }
+
+
+@_route("DELETE", r"/rest/collections/(?P<uuid>[^/]+)/threads/(?P<thread>[^/]+)")
+def _remove_from_collection(
+    server: StandinServer, match: re.Match[str], query: dict[str, str], body: Any
+) -> tuple[int, Any]:
+    store = server.store
+    collection = store.collection(match["uuid"])
+    thread = store.thread(match["thread"])
+    if thread["uuid"] in collection["threads"]:
+        collection["threads"].remove(thread["uuid"])
+        thread["collection_uuids"].remove(collection["uuid"])
+    return 204, None
+
+
+class _DisconnectError(Exception):
+    """The stream is cut by ``disconnect_after``."""
+
+
+class StandinServer:
+    """Local Perplexity stand-in on an asyncio HTTP/1.1 server.
+
+    Use it as an async context manager inside an event loop, or through
+    running() from synchronous code, which serves from a background
+    thread.
+
+    Attributes:
+        config: Stream shape and failure settings; may be changed while
+            the server runs
+        stats: Counters since the server was created
+        owner_uuid: Owner reported for collections
+
+    Example:
+        >>> config = StandinConfig(events=500, interval=0.005, disconnect_after=100)
+        >>> with StandinServer(config).running() as url:
+        ...     client = PerplexityClient(api_base=url, auth_token="unused")
+        ...     entry = client.new_conversation().ask("What is AI?")
+
+    """
+
+    def __init__(
+        self, config: StandinConfig | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """Initialize server.
+
+        Args:
+            config: Stream shape and failures (default: StandinConfig())
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+
+        """
+        self.config = config or StandinConfig()
+        self.host = host
+        self.port = port
+        self.stats = StandinStats()
+        self.store = _Store()
+        self.owner_uuid = str(uuid.uuid4())
+        self._random = random.Random(self.config.seed)  # noqa: S311 - jitter, not security
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        """Start listening.
+
+        Returns:
+            Base URL of the server
+
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = int(self._server.sockets[0].getsockname()[1])
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop listening and cut open connections."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled, starting the server if needed."""
+        if self._server is None:
+            await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> StandinServer:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        await self.stop()
+
+    @contextlib.contextmanager
+    def running(self) -> Iterator[str]:
+        """Serve from a background thread with its own event loop.
+
+        Yields:
+            Base URL of the server
+
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="pplx-standin", daemon=True)
+        thread.start()
+        try:
+            yield asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    # Connection handling
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats.connections += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+        try:
+            while await self._serve_request(reader, writer):
+                pass
+        except (asyncio.IncompleteReadError, ConnectionError, _DisconnectError):
+            pass
+        finally:
+            if task is not None:
+                self._tasks.discard(task)
+            # Without the terminating chunk, a cut stream reads as a disconnect
+            writer.close()
+
+    async def _serve_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        """Serve one request.
+
+        Returns:
+            Whether the connection stays open for another request
+
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                raise
+            return False
+        request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raw = await reader.readexactly(int(headers.get("content-length", 0)))
+        keep_alive = headers.get("connection", "").lower() != "close"
+        self.stats.requests += 1
+
+        config = self.config
+        if config.rate_limit_every and self.stats.requests % config.rate_limit_every == 0:
+            self.stats.rate_limited += 1
+            error = _HTTPError(429, "rate_limit_exceeded", "Too many requests")
+            await self._send_json(
+                writer, error.status, error.body, {"Retry-After": str(config.retry_after)}
+            )
+            return keep_alive
+
+        if method == "HEAD":
+            # Connection warm-up (PerplexityClient.warmup)
+            await self._send_json(writer, 200, None)
+            return keep_alive
+
+        url = urlsplit(target)
+        try:
+            body = codec.loads(raw) if raw else None
+        except ValueError:
+            error = _HTTPError(400, "validation_error", "Request body is not JSON")
+            await self._send_json(writer, error.status, error.body)
+            return keep_alive
+
+        if method == "POST" and url.path == SSE_PATH:
+            await self._stream_answer(writer, body if isinstance(body, dict) else {}, headers)
+            return keep_alive
+
+        try:
+            status, payload = self._dispatch(method, url.path, dict(parse_qsl(url.query)), body)
+        except _HTTPError as error:
+            status, payload = error.status, error.body
+        await self._send_json(writer, status, payload)
+        return keep_alive
+
+    def _dispatch(
+        self, method: str, path: str, query: dict[str, str], body: Any
+    ) -> tuple[int, Any]:
+        allowed = False
+        for route_method, pattern, handler in _ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return handler(self, match, query, body)
+            allowed = True
+        if allowed:
+            raise _HTTPError(405, "method_not_allowed", f"{method} not allowed on {path}")
+        raise _HTTPError(404, "not_found", f"No endpoint at {path}")
+
+    @staticmethod
+    async def _send_json(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        body = b"" if payload is None else codec.dumps(payload)
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        if payload is not None:
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # Answer streams
+
+    async def _pause(self, seconds: float) -> None:
+        jitter = self.config.jitter
+        delay = seconds + (self._random.uniform(0, jitter) if jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _text(self, index: int) -> str:
+        size = self.config.chunk_size
+        offset = index * size % len(_FILLER)
+        return (_FILLER * (size // len(_FILLER) + 2))[offset : offset + size]
+
+    async def _stream_answer(
+        self, writer: asyncio.StreamWriter, payload: dict[str, Any], headers: dict[str, str]
+    ) -> None:
+        config = self.config
+        context_uuid = str(payload.get("context_uuid") or uuid.uuid4())
+        model = str(payload.get("model_preference") or "pplx-70b-chat")
+
+        # Cursors are "<backend uuid>:<answer chunk index>"
+        cursor = payload.get("cursor") or headers.get("last-event-id")
+        backend_uuid, _, position = str(cursor or "").rpartition(":")
+        if cursor and position.isdigit() and backend_uuid:
+            start = max(int(position) + 1 - config.resume_overlap, 0)
+            self.stats.resumed += 1
+        else:
+            backend_uuid = str(uuid.uuid4())
+            start = 0
+        self.stats.streams += 1
+
+        await self._pause(config.latency)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        async def send(event: str, data: dict[str, Any], event_id: str | None = None) -> None:
+            frame = b"event: %s\n" % event.encode()
+            if event_id is not None:
+                frame += b"id: %s\n" % event_id.encode()
+            frame += b"data: %s\n\n" % codec.dumps(data)
+            writer.write(b"%x\r\n%s\r\n" % (len(frame), frame))
+            await writer.drain()
+
+        if start == 0:
+            await send(
+                "query_progress",
+                {"status": "searching", "context_uuid": context_uuid, "backend_uuid": backend_uuid},
+            )
+        for sent, index in enumerate(range(start, config.events)):
+            if config.disconnect_after is not None and sent >= config.disconnect_after:
+                self.stats.disconnects += 1
+                raise _DisconnectError
+            await self._pause(config.interval)
+            chunk_cursor = f"{backend_uuid}:{index}"
+            await send(
+                "answer_chunk",
+                {
+                    "text": self._text(index),
+                    "cursor": chunk_cursor,
+                    "backend_uuid": backend_uuid,
+                    "context_uuid": context_uuid,
+                },
+                chunk_cursor,
+            )
+
+        text = "".join(self._text(index) for index in range(config.events))
+        await self._pause(config.interval)
+        await send(
+            "final_response",
+            {
+                "status": "COMPLETED",
+                "backend_uuid": backend_uuid,
+                "context_uuid": context_uuid,
+                "display_model": model,
+                "blocks": [{"type": "text", "content": text}],
+                "sources": [],
+            },
+        )
+        writer.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(b": [end]\n\n"), b": [end]\n\n"))
+        await writer.drain()
+        self.store.record_answer(payload, context_uuid, backend_uuid, text, model)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m pplx_sdk.testing", description="Local Perplexity stand-in server"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--events", type=int, default=StandinConfig.events)
+    parser.add_argument("--chunk-size", type=int, default=StandinConfig.chunk_size)
+    parser.add_argument("--latency", type=float, default=StandinConfig.latency)
+    parser.add_argument("--interval", type=float, default=StandinConfig.interval)
+    parser.add_argument("--jitter", type=float, default=StandinConfig.jitter)
+    parser.add_argument("--disconnect-after", type=int, default=None)
+    parser.add_argument("--resume-overlap", type=int, default=StandinConfig.resume_overlap)
+    parser.add_argument("--rate-limit-every", type=int, default=StandinConfig.rate_limit_every)
+    parser.add_argument("--retry-after", type=int, default=StandinConfig.retry_after)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the stand-in from the command line.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    """
+    args = _parse_args(argv)
+    config = StandinConfig(
+        events=args.events,
+        chunk_size=args.chunk_size,
+        latency=args.latency,
+        interval=args.interval,
+        jitter=args.jitter,
+        disconnect_after=args.disconnect_after,
+        resume_overlap=args.resume_overlap,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    server = StandinServer(config, args.host, args.port)
+
+    async def serve() -> None:
+        await server.start()
+        print(f"Perplexity stand-in listening on {server.url}")
+        await server.serve_forever()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve())
@@ -1,6 +1,32 @@
 """Transport layer for HTTP and SSE communication."""
 
+from pplx_sdk.transport.config import TransportConfig
 from pplx_sdk.transport.http import HttpTransport
-from pplx_sdk.transport.sse import SSETransport
+from pplx_sdk.transport.pool import (
+    AsyncInstrumentedTransport,
+    InstrumentedTransport,
+    PoolStats,
+    instrument_client,
+    pool_stats,
+)
+from pplx_sdk.transport.replay import ReplayTracker
+from pplx_sdk.transport.sse import AsyncSSETransport, SSETransport, event_filter
+from pplx_sdk.transport.sse_decoder import SSEDecoder, SSEEvent
+from pplx_sdk.transport.timeouts import StreamTimeouts
 
-__all__ = ["HttpTransport", "SSETransport"]
+__all__ = [
+    "AsyncInstrumentedTransport",
+    "AsyncSSETransport",
+    "HttpTransport",
+    "InstrumentedTransport",
+    "PoolStats",
+    "ReplayTracker",
+    "SSEDecoder",
+    "SSEEvent",
+    "SSETransport",
+    "StreamTimeouts",
+    "TransportConfig",
+    "event_filter",
+    "instrument_client",
+    "pool_stats",
+]
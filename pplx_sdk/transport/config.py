@@ -0,0 +1,145 @@
+"""Connection pool and timeout configuration for HTTP clients."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, fields
+from typing import Any
+
+import httpx
+
+from pplx_sdk.transport.pool import instrument_client
+
+
+@dataclass
+class TransportConfig:
+    """Pool limits, keepalive and per-phase timeouts for httpx clients.
+
+    The defaults match httpx's own, so a default config changes nothing;
+    environment proxies (``HTTP(S)_PROXY``, ``ALL_PROXY``, ``NO_PROXY``)
+    apply as usual. Per-phase timeouts left as None inherit the client's
+    overall ``timeout``. Clients built from a config are instrumented and
+    report PoolStats.
+
+    Attributes:
+        max_connections: Maximum open connections (None for no limit)
+        max_keepalive_connections: Maximum idle connections kept alive
+        keepalive_expiry: Seconds an idle connection is kept alive
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for a chunk of the response; bounds
+            the gap between SSE events
+        write_timeout: Seconds to send a chunk of the request
+        pool_timeout: Seconds to wait for a free connection slot
+
+    Example:
+        >>> config = TransportConfig(max_connections=200, pool_timeout=2.0)
+        >>> client = PerplexityClient(auth_token="...", transport_config=config)
+        >>> client.pool_stats().waiting
+        0
+
+    """
+
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    write_timeout: float | None = None
+    pool_timeout: float | None = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "PPLX_") -> TransportConfig:
+        """Build a config from environment variables.
+
+        Each field is read from ``<prefix><FIELD>``, e.g.
+        ``PPLX_MAX_CONNECTIONS`` or ``PPLX_POOL_TIMEOUT``; unset variables
+        keep the default.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            TransportConfig instance
+
+        Raises:
+            ValueError: If a variable is not a number
+
+        """
+        values: dict[str, Any] = {}
+        for field in fields(cls):
+            raw = os.getenv(f"{prefix}{field.name.upper()}")
+            if raw:
+                values[field.name] = int(raw) if field.name.startswith("max_") else float(raw)
+        return cls(**values)
+
+    def limits(self) -> httpx.Limits:
+        """Build the httpx pool limits.
+
+        Returns:
+            httpx.Limits for this config
+
+        """
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self, timeout: float | None) -> httpx.Timeout:
+        """Build the httpx timeouts.
+
+        Args:
+            timeout: Default for phases without their own timeout
+
+        Returns:
+            httpx.Timeout for this config
+
+        """
+
+        def phase(value: float | None) -> float | None:
+            return timeout if value is None else value
+
+        return httpx.Timeout(
+            connect=phase(self.connect_timeout),
+            read=phase(self.read_timeout),
+            write=phase(self.write_timeout),
+            pool=phase(self.pool_timeout),
+        )
+
+    def create_client(
+        self, timeout: float | None = 30.0, http2: bool = False, **kwargs: Any
+    ) -> httpx.Client:
+        """Create an instrumented httpx.Client.
+
+        Args:
+            timeout: Default timeout in seconds
+            http2: Negotiate HTTP/2
+            **kwargs: Passed to httpx.Client (base_url, headers, ...)
+
+        Returns:
+            Client whose pool statistics are available via pool_stats()
+
+        """
+        client = httpx.Client(
+            limits=self.limits(), http2=http2, timeout=self.timeouts(timeout), **kwargs
+        )
+        return instrument_client(client)
+
+    def create_async_client(
+        self, timeout: float | None = 30.0, http2: bool = False, **kwargs: Any
+    ) -> httpx.AsyncClient:
+        """Create an instrumented httpx.AsyncClient.
+
+        Args:
+            timeout: Default timeout in seconds
+            http2: Negotiate HTTP/2
+            **kwargs: Passed to httpx.AsyncClient (base_url, headers, ...)
+
+        Returns:
+            Client whose pool statistics are available via pool_stats()
+
+        """
+        client = httpx.AsyncClient(
+            limits=self.limits(), http2=http2, timeout=self.timeouts(timeout), **kwargs
+        )
+        return instrument_client(client)
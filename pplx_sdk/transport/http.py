@@ -9,6 +9,8 @@ from typing import Any
 import httpx
 
 from pplx_sdk.core.exceptions import AuthenticationError, RateLimitError, TransportError
+from pplx_sdk.transport.config import TransportConfig
+from pplx_sdk.transport.pool import PoolStats, pool_stats
 
 
 class HttpTransport:
@@ -34,6 +36,8 @@ class HttpTransport:
         auth_token: str | None = None,
         timeout: float = 30.0,
         default_headers: dict[str, str] | None = None,
+        http2: bool = False,
+        config: TransportConfig | None = None,
     ) -> None:
         """Initialize HTTP transport.
 
@@ -42,10 +46,14 @@ class HttpTransport:
             auth_token: Authentication token (session ID)
             timeout: Request timeout in seconds
             default_headers: Additional headers to include in all requests
+            http2: Negotiate HTTP/2 (requires the ``h2`` package)
+            config: Pool limits, keepalive and per-phase timeouts
 
         """
         self.base_url = base_url
         self.timeout = timeout
+        self.http2 = http2
+        self.config = config or TransportConfig()
 
         # Build default headers
         headers = {
@@ -66,9 +74,10 @@ class HttpTransport:
 
     def __enter__(self) -> "HttpTransport":
         """Context manager entry."""
-        self.client = httpx.Client(
-            base_url=self.base_url,
+        self.client = self.config.create_client(
             timeout=self.timeout,
+            http2=self.http2,
+            base_url=self.base_url,
             headers=self.default_headers,
             follow_redirects=True,
         )
@@ -80,6 +89,15 @@ class HttpTransport:
             self.client.close()
             self.client = None
 
+    def pool_stats(self) -> PoolStats | None:
+        """Report connection pool usage.
+
+        Returns:
+            PoolStats, or None when the transport is not open
+
+        """
+        return pool_stats(self.client) if self.client else None
+
     def request(
         self,
         method: str,
@@ -0,0 +1,311 @@
+"""Connection pool telemetry.
+
+Wraps httpx's HTTP transports to report how the connection pool is used:
+connections open, idle and in use, requests waiting for a slot, and the
+time spent waiting for one. Clients built with TransportConfig are
+instrumented automatically.
+
+Pool wait is measured with httpcore's ``trace`` request extension: the pool
+emits no event of its own, so the wait ends at the first connection-level
+event (a new TCP connect, or sending headers on a reused connection).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Snapshot of connection pool usage.
+
+    Attributes:
+        connections: Open connections
+        idle: Open connections with no request in flight
+        in_use: Open connections serving at least one request
+        waiting: Requests waiting for a connection slot
+        requests: Requests sent since the client was created
+        pool_wait_total: Total seconds requests spent waiting for a slot
+        pool_wait_max: Longest single wait for a slot, in seconds
+        pool_timeouts: Requests that failed with httpx.PoolTimeout
+
+    """
+
+    connections: int
+    idle: int
+    in_use: int
+    waiting: int
+    requests: int
+    pool_wait_total: float
+    pool_wait_max: float
+    pool_timeouts: int
+
+    @property
+    def pool_wait_avg(self) -> float:
+        """Average seconds a request waited for a slot."""
+        return self.pool_wait_total / self.requests if self.requests else 0.0
+
+
+class _PoolMeter:
+    """Thread-safe request and pool wait counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def begin(self) -> float:
+        """Record a request entering the pool; return its start time."""
+        with self._lock:
+            self.requests += 1
+            self.waiting += 1
+        return time.monotonic()
+
+    def acquired(self, start: float) -> None:
+        """Record that the request waiting since ``start`` got a connection."""
+        wait = time.monotonic() - start
+        with self._lock:
+            self.waiting -= 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def timed_out(self) -> None:
+        """Record a pool timeout."""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Any) -> PoolStats:
+        """Combine the counters with the pool's current connections.
+
+        Args:
+            pool: httpcore connection pool
+
+        Returns:
+            PoolStats snapshot
+
+        """
+        connections = [conn for conn in list(pool.connections) if not conn.is_closed()]
+        idle = sum(1 for conn in connections if conn.is_idle())
+        with self._lock:
+            return PoolStats(
+                connections=len(connections),
+                idle=idle,
+                in_use=len(connections) - idle,
+                waiting=self.waiting,
+                requests=self.requests,
+                pool_wait_total=self.wait_total,
+                pool_wait_max=self.wait_max,
+                pool_timeouts=self.timeouts,
+            )
+
+
+class _Wait:
+    """Per-request flag closing the pool wait exactly once."""
+
+    __slots__ = ("meter", "open", "start")
+
+    def __init__(self, meter: _PoolMeter) -> None:
+        self.meter = meter
+        self.start = meter.begin()
+        self.open = True
+
+    def close(self) -> None:
+        if self.open:
+            self.open = False
+            self.meter.acquired(self.start)
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """httpx.HTTPTransport wrapper collecting PoolStats.
+
+    Example:
+        >>> transport = InstrumentedTransport(httpx.HTTPTransport())
+        >>> client = httpx.Client(transport=transport)
+        >>> transport.stats().connections
+        0
+
+    """
+
+    def __init__(self, transport: httpx.HTTPTransport) -> None:
+        """Initialize wrapper.
+
+        Args:
+            transport: Transport whose pool is measured
+
+        """
+        self.transport = transport
+        self._meter = _PoolMeter()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, measuring the wait for a pooled connection.
+
+        Args:
+            request: Request to send
+
+        Returns:
+            Response from the wrapped transport
+
+        """
+        wait = _Wait(self._meter)
+        user_trace: Callable[[str, dict[str, Any]], None] | None = request.extensions.get("trace")
+
+        def trace(name: str, info: dict[str, Any]) -> None:
+            wait.close()
+            if user_trace is not None:
+                user_trace(name, info)
+
+        request.extensions["trace"] = trace
+        try:
+            return self.transport.handle_request(request)
+        except httpx.PoolTimeout:
+            self._meter.timed_out()
+            raise
+        finally:
+            wait.close()
+
+    def stats(self) -> PoolStats:
+        """Snapshot pool usage.
+
+        Returns:
+            Current PoolStats
+
+        """
+        # httpx keeps its httpcore pool in a private attribute
+        return self._meter.snapshot(self.transport._pool)
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class AsyncInstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx.AsyncHTTPTransport wrapper collecting PoolStats.
+
+    Async twin of InstrumentedTransport.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport) -> None:
+        """Initialize wrapper.
+
+        Args:
+            transport: Transport whose pool is measured
+
+        """
+        self.transport = transport
+        self._meter = _PoolMeter()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, measuring the wait for a pooled connection.
+
+        Args:
+            request: Request to send
+
+        Returns:
+            Response from the wrapped transport
+
+        """
+        wait = _Wait(self._meter)
+        user_trace = request.extensions.get("trace")
+
+        async def trace(name: str, info: dict[str, Any]) -> None:
+            wait.close()
+            if user_trace is not None:
+                await user_trace(name, info)
+
+        request.extensions["trace"] = trace
+        try:
+            return await self.transport.handle_async_request(request)
+        except httpx.PoolTimeout:
+            self._meter.timed_out()
+            raise
+        finally:
+            wait.close()
+
+    def stats(self) -> PoolStats:
+        """Snapshot pool usage.
+
+        Returns:
+            Current PoolStats
+
+        """
+        return self._meter.snapshot(self.transport._pool)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
+
+
+def _instrumented(transport: Any) -> Any:
+    if isinstance(transport, httpx.HTTPTransport):
+        return InstrumentedTransport(transport)
+    if isinstance(transport, httpx.AsyncHTTPTransport):
+        return AsyncInstrumentedTransport(transport)
+    return transport
+
+
+def instrument_client[C: (httpx.Client, httpx.AsyncClient)](client: C) -> C:
+    """Instrument the HTTP transports of a client in place.
+
+    The default transport and every mounted one, e.g. the proxies httpx
+    sets up from ``HTTP(S)_PROXY``/``ALL_PROXY``/``NO_PROXY``, are wrapped,
+    so httpx's own routing between them is kept. Custom transports are
+    left alone.
+
+    Args:
+        client: Client built without an explicit ``transport``
+
+    Returns:
+        The same client
+
+    """
+    # httpx keeps its transports in private attributes
+    client._transport = _instrumented(client._transport)
+    client._mounts = {
+        pattern: _instrumented(transport) for pattern, transport in client._mounts.items()
+    }
+    return client
+
+
+def pool_stats(client: httpx.Client | httpx.AsyncClient) -> PoolStats | None:
+    """Read pool statistics from an instrumented httpx client.
+
+    Figures of the default transport and of mounted proxy transports are
+    added up.
+
+    Args:
+        client: Client built by TransportConfig, or any client whose
+            transports are (Async)InstrumentedTransports
+
+    Returns:
+        PoolStats, or None if the client is not instrumented
+
+    """
+    mounts: dict[Any, Any] = getattr(client, "_mounts", {})
+    stats = [
+        transport.stats()
+        for transport in (getattr(client, "_transport", None), *mounts.values())
+        if isinstance(transport, InstrumentedTransport | AsyncInstrumentedTransport)
+    ]
+    if not stats:
+        return None
+    if len(stats) == 1:
+        return stats[0]
+    return PoolStats(
+        connections=sum(s.connections for s in stats),
+        idle=sum(s.idle for s in stats),
+        in_use=sum(s.in_use for s in stats),
+        waiting=sum(s.waiting for s in stats),
+        requests=sum(s.requests for s in stats),
+        pool_wait_total=sum(s.pool_wait_total for s in stats),
+        pool_wait_max=max(s.pool_wait_max for s in stats),
+        pool_timeouts=sum(s.pool_timeouts for s in stats),
+    )
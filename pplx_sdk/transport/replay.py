@@ -0,0 +1,171 @@
+"""Replay detection for reconnected SSE streams.
+
+After a reconnect with ``cursor``/``resume_entry_uuids`` the server may send
+events the consumer already received. ReplayTracker remembers a digest of
+every event a logical stream has delivered, in order. On the next attempt
+it aligns the first incoming event with that history and drops events for
+as long as they repeat it, so replays are skipped before JSON decoding and
+only the missing tail is parsed.
+
+Alignment only happens at a known position: at the delivered event with
+the same SSE ``id``, or, for events without an id, at the start of the
+history. An attempt whose first event cannot be aligned is treated as a
+plain continuation, so a new event that repeats an earlier payload is
+never dropped.
+
+Digests are Python hashes of the event type and raw data. They are only
+compared within one process, which is all a reconnect needs.
+"""
+
+from __future__ import annotations
+
+from pplx_sdk.domain.models import StreamChunk
+from pplx_sdk.transport.sse_decoder import SSEEvent
+
+# Type of the chunk marking where a resumed stream picks up
+RESUMED_EVENT = "resumed"
+
+_LIVE, _PROBING, _REPLAYING = 0, 1, 2
+
+
+class ReplayTracker:
+    """Sequence of events delivered by one logical stream.
+
+    Pass the same tracker to every attempt of a stream; the stream
+    managers do this automatically.
+
+    Attributes:
+        last_event_id: Last SSE ``id`` received, sent as ``Last-Event-ID``
+            on reconnect
+        replayed: Events dropped as replays in the current attempt
+        resuming: True from the start of a reconnected attempt until its
+            first new event, when resumed_marker() should be emitted
+
+    Example:
+        >>> tracker = ReplayTracker()
+        >>> for chunk in transport.stream(..., replay=tracker):
+        ...     ...  # connection drops
+        >>> for chunk in transport.stream(..., cursor=cursor, replay=tracker):
+        ...     ...  # replayed events are skipped
+
+    """
+
+    __slots__ = (
+        "_digests",
+        "_event_ids",
+        "_ids",
+        "_mode",
+        "_position",
+        "_resumed_at",
+        "last_event_id",
+        "replayed",
+        "resuming",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self._digests: list[int] = []
+        self._event_ids: list[str] = []
+        # Offset of the first event delivered with each SSE id
+        self._ids: dict[str, int] = {}
+        self._mode = _LIVE
+        self._position = 0
+        self._resumed_at = 0
+        self.last_event_id: str | None = None
+        self.replayed = 0
+        self.resuming = False
+
+    @property
+    def offset(self) -> int:
+        """Number of events delivered so far."""
+        return len(self._digests)
+
+    def begin(self) -> None:
+        """Start a new attempt; its first event is checked for a replay."""
+        self._mode = _PROBING if self._digests else _LIVE
+        self._resumed_at = len(self._digests)
+        self.replayed = 0
+        self.resuming = bool(self._digests)
+
+    def accept(self, event: SSEEvent) -> bool:
+        """Decide whether an event is new, recording it if so.
+
+        Args:
+            event: Event received in the current attempt
+
+        Returns:
+            False for a replay of an already delivered event
+
+        """
+        digest = hash((event.event, event.data))
+        if self._mode == _PROBING:
+            position = self._align(event, digest)
+            if position is not None:
+                self._mode = _REPLAYING
+                self._position = position + 1
+                self.replayed = 1
+                return False
+        elif self._mode == _REPLAYING:
+            position = self._position
+            if position < len(self._digests) and self._digests[position] == digest:
+                self._position = position + 1
+                self.replayed += 1
+                return False
+
+        self._mode = _LIVE
+        if event.id:
+            self._ids.setdefault(event.id, len(self._digests))
+            self.last_event_id = event.id
+        self._digests.append(digest)
+        self._event_ids.append(event.id)
+        return True
+
+    def _align(self, event: SSEEvent, digest: int) -> int | None:
+        """Find the delivered event that the first event of an attempt replays.
+
+        Args:
+            event: First event of the attempt
+            digest: Digest of the event
+
+        Returns:
+            Offset of the replayed event, or None if it cannot be aligned
+
+        """
+        if not event.id:
+            return 0 if self._digests[0] == digest else None
+        start = self._ids.get(event.id)
+        if start is None:
+            return None
+        # Events without an id line share the id of the event before them
+        for position in range(start, len(self._digests)):
+            if self._event_ids[position] != event.id:
+                break
+            if self._digests[position] == digest:
+                return position
+        return None
+
+    def resumed_marker(self, context_uuid: str | None = None) -> StreamChunk:
+        """Build the chunk marking where a resumed attempt picks up.
+
+        Called at the first new event of the attempt; clears ``resuming``.
+
+        Args:
+            context_uuid: Thread context UUID
+
+        Returns:
+            StreamChunk of type ``resumed`` with the offset and the number
+            of replayed events dropped
+
+        """
+        self.resuming = False
+        offset = self._resumed_at
+        return StreamChunk(
+            type=RESUMED_EVENT,
+            status="resuming",
+            data={
+                "message": f"resumed at offset {offset}",
+                "offset": offset,
+                "replayed": self.replayed,
+            },
+            context_uuid=context_uuid,
+        )
@@ -1,24 +1,177 @@
 """SSE (Server-Sent Events) transport for streaming responses.
 
-Handles SSE protocol parsing and yields MessageChunk objects.
+Handles SSE protocol parsing and yields StreamChunk objects.
 """
 
 from __future__ import annotations
 
-import json
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterable, Iterator
 from typing import Any
 
 import httpx
 
 from pplx_sdk.core.exceptions import TransportError
-from pplx_sdk.domain.models import MessageChunk
+from pplx_sdk.domain.models import StreamChunk
+from pplx_sdk.shared import codec
+from pplx_sdk.shared.metrics import StreamTiming
+from pplx_sdk.transport.replay import ReplayTracker
+from pplx_sdk.transport.sse_decoder import SSEDecoder, SSEEvent
+from pplx_sdk.transport.timeouts import StreamClock, StreamTimeouts
 
+# Perplexity's ask endpoint, relative to the API base
+SSE_ENDPOINT = "/rest/sse/perplexity.ask"
 
-class SSETransport:
+# Headers sent with every SSE request
+SSE_HEADERS = {
+    "Accept": "text/event-stream",
+    "Content-Type": "application/json",
+}
+
+
+def event_filter(
+    events: Iterable[str] | None, exclude_events: Iterable[str] | None
+) -> Callable[[str], bool] | None:
+    """Build the predicate deciding which event types get decoded.
+
+    Args:
+        events: Event types to keep, or None to keep all
+        exclude_events: Event types to drop
+
+    Returns:
+        Predicate on the event type, or None when every event is kept
+
+    """
+    excluded = frozenset(exclude_events or ())
+    if events is not None:
+        return frozenset(events).difference(excluded).__contains__
+    if excluded:
+        return lambda event_type: event_type not in excluded
+    return None
+
+
+class _BaseSSETransport:
+    """Shared request building and event parsing for SSE transports."""
+
+    def __init__(self, endpoint: str, headers: dict[str, str] | None = None) -> None:
+        """Initialize base transport.
+
+        Args:
+            endpoint: SSE endpoint path (e.g., /rest/sse/perplexity.ask)
+            headers: Extra headers sent with every request, e.g. auth
+                headers when the HTTP client is shared
+
+        """
+        self.endpoint = endpoint
+        self.headers = {**(headers or {}), **SSE_HEADERS}
+
+    def _build_payload(
+        self,
+        query: str,
+        context_uuid: str,
+        frontend_uuid: str,
+        mode: str,
+        model_preference: str,
+        sources: list[str] | None,
+        parent_entry_uuid: str | None,
+        cursor: str | None,
+        resume_entry_uuids: list[str] | None,
+        extra: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Build the JSON payload for an SSE ask request.
+
+        Returns:
+            Request payload dictionary
+
+        """
+        payload: dict[str, Any] = {
+            "query_str": query,
+            "context_uuid": context_uuid,
+            "frontend_uuid": frontend_uuid,
+            "mode": mode,
+            "model_preference": model_preference,
+            "sources": sources or ["web"],
+            "use_schematized_api": True,
+            "language": "en-US",
+            "timezone": "UTC",
+            "is_incognito": False,
+        }
+
+        if parent_entry_uuid:
+            payload["parent_entry_uuid"] = parent_entry_uuid
+
+        if cursor:
+            payload["cursor"] = cursor
+
+        if resume_entry_uuids:
+            payload["resume_entry_uuids"] = resume_entry_uuids
+
+        # Add any extra parameters
+        payload.update(extra)
+        return payload
+
+    @staticmethod
+    def _start_clock(timeouts: StreamTimeouts | None) -> StreamClock | None:
+        """Start the deadlines of a stream.
+
+        Args:
+            timeouts: Limits for the stream, or None
+
+        Returns:
+            Running StreamClock, or None when no limit is set
+
+        """
+        if timeouts is None or not timeouts.enabled:
+            return None
+        return timeouts.start()
+
+    @staticmethod
+    def _status_error(response: httpx.Response) -> TransportError:
+        """Build a TransportError for a failed (and fully read) SSE response.
+
+        Args:
+            response: Response with an error status code
+
+        Returns:
+            TransportError describing the failure
+
+        """
+        return TransportError(
+            f"SSE request failed: HTTP {response.status_code}",
+            status_code=response.status_code,
+            response_body=response.text,
+        )
+
+    def _parse_event(self, event_type: str, data: bytes | str) -> StreamChunk:
+        """Parse SSE event into StreamChunk.
+
+        Args:
+            event_type: Event type (query_progress, answer_chunk, etc.)
+            data: JSON data as raw bytes or string
+
+        Returns:
+            StreamChunk object
+
+        """
+        # Parse JSON data
+        try:
+            parsed_data = codec.loads(data)
+        except ValueError:
+            parsed_data = None
+
+        if not isinstance(parsed_data, dict):
+            # If not a JSON object, treat as plain text
+            plain = data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+            parsed_data = {"text": plain}
+
+        # Copy the common fields out without validation (see StreamChunk)
+        return StreamChunk.from_event(event_type, parsed_data)
+
+
+class SSETransport(_BaseSSETransport):
     """SSE streaming transport for Perplexity API.
 
-    Parses Server-Sent Events format and yields MessageChunk objects.
+    Parses Server-Sent Events format and yields StreamChunk objects.
     Handles the SSE protocol including event types, data fields, and end markers.
 
     SSE Format:
@@ -34,16 +187,19 @@ class SSETransport:
 
     """
 
-    def __init__(self, client: httpx.Client, endpoint: str) -> None:
+    def __init__(
+        self, client: httpx.Client, endpoint: str, headers: dict[str, str] | None = None
+    ) -> None:
         """Initialize SSE transport.
 
         Args:
             client: httpx.Client instance for making requests
             endpoint: SSE endpoint path (e.g., /rest/sse/perplexity.ask)
+            headers: Extra headers sent with every request
 
         """
+        super().__init__(endpoint, headers)
         self.client = client
-        self.endpoint = endpoint
 
     def stream(
         self,
@@ -56,8 +212,13 @@ class SSETransport:
         parent_entry_uuid: str | None = None,
         cursor: str | None = None,
         resume_entry_uuids: list[str] | None = None,
+        events: Iterable[str] | None = None,
+        exclude_events: Iterable[str] | None = None,
+        timeouts: StreamTimeouts | None = None,
+        replay: ReplayTracker | None = None,
+        timing: StreamTiming | None = None,
         **extra: Any,
-    ) -> Generator[MessageChunk, None, None]:
+    ) -> Generator[StreamChunk, None, None]:
         """Stream SSE events from Perplexity API.
 
         Args:
@@ -70,125 +231,338 @@ class SSETransport:
             parent_entry_uuid: Parent entry for threaded queries
             cursor: Resume cursor for reconnection
             resume_entry_uuids: Entry UUIDs to resume from
+            events: Event types to yield (EventType members or strings);
+                others are skipped before JSON decoding. None yields all
+            exclude_events: Event types to skip before JSON decoding
+            timeouts: Total deadline, first-byte and idle timeouts
+            replay: Delivery history shared by the attempts of one stream;
+                replayed events are dropped before JSON decoding and a
+                ``resumed`` chunk marks where a reconnect picks up
+            timing: Latency breakdown shared by the attempts of one
+                stream; this attempt's connection setup, headers, bytes
+                and events are recorded into it
             **extra: Additional request parameters
 
         Yields:
-            MessageChunk objects parsed from SSE events
+            StreamChunk objects parsed from SSE events
 
         Raises:
-            httpx.HTTPError: On HTTP errors
+            TransportError: On non-2xx responses
+            StreamTimeoutError: When a limit in ``timeouts`` is exceeded
+            httpx.HTTPError: On network errors
 
         """
-        # Build request payload
-        payload: dict[str, Any] = {
-            "query_str": query,
-            "context_uuid": context_uuid,
-            "frontend_uuid": frontend_uuid,
-            "mode": mode,
-            "model_preference": model_preference,
-            "sources": sources or ["web"],
-            "use_schematized_api": True,
-            "language": "en-US",
-            "timezone": "UTC",
-            "is_incognito": False,
-        }
+        payload = self._build_payload(
+            query,
+            context_uuid,
+            frontend_uuid,
+            mode,
+            model_preference,
+            sources,
+            parent_entry_uuid,
+            cursor,
+            resume_entry_uuids,
+            extra,
+        )
 
-        if parent_entry_uuid:
-            payload["parent_entry_uuid"] = parent_entry_uuid
+        clock = self._start_clock(timeouts)
+        headers = self.headers
+        if replay is not None:
+            replay.begin()
+            if replay.last_event_id:
+                headers = {**headers, "Last-Event-ID": replay.last_event_id}
+        extensions = None
+        if timing is not None:
+            timing.attempt()
+            extensions = {"trace": timing.trace}
+        try:
+            with self.client.stream(
+                "POST",
+                self.endpoint,
+                json=payload,
+                headers=headers,
+                timeout=httpx.USE_CLIENT_DEFAULT
+                if clock is None
+                else clock.cap(self.client.timeout),
+                extensions=extensions,
+            ) as response:
+                if timing is not None:
+                    timing.response_started()
+                if response.is_error:
+                    response.read()
+                    raise self._status_error(response)
+
+                # Decode SSE events straight from the raw byte chunks; filtered
+                # events never reach the JSON decoder
+                decoder = SSEDecoder()
+                accept = event_filter(events, exclude_events)
+                chunks = (
+                    response.iter_bytes() if clock is None else self._timed_bytes(response, clock)
+                )
+                if timing is not None:
+                    chunks = timing.count(chunks)
+                for batch in self._event_batches(decoder, chunks):
+                    for event in batch:
+                        if timing is not None:
+                            timing.event(event.event)
+                        if replay is not None:
+                            # Replays are dropped before JSON decoding
+                            if not replay.accept(event):
+                                continue
+                            if replay.resuming:
+                                marker = replay.resumed_marker(context_uuid)
+                                if accept is None or accept(marker.type):
+                                    yield marker
+                        if accept is None or accept(event.event):
+                            yield self._parse_event(event.event, event.data)
+        except httpx.TimeoutException as exc:
+            if clock is not None and clock.expired():
+                raise clock.error() from exc
+            raise
+
+    @staticmethod
+    def _event_batches(decoder: SSEDecoder, chunks: Iterator[bytes]) -> Iterator[list[SSEEvent]]:
+        """Decode the events of each body chunk, then any unterminated one.
 
-        if cursor:
-            payload["cursor"] = cursor
+        Args:
+            decoder: Fresh decoder for this response
+            chunks: Raw body chunks
 
-        if resume_entry_uuids:
-            payload["resume_entry_uuids"] = resume_entry_uuids
+        Yields:
+            Events completed by each chunk
 
-        # Add any extra parameters
-        payload.update(extra)
+        """
+        for raw in chunks:
+            yield decoder.feed(raw)
+            if decoder.ended:
+                break
 
-        # Make streaming request
-        headers = {
-            "Accept": "text/event-stream",
-            "Content-Type": "application/json",
-        }
+        # Handle any remaining buffered event
+        last = decoder.flush()
+        if last is not None:
+            yield [last]
 
-        with self.client.stream("POST", self.endpoint, json=payload, headers=headers) as response:
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                raise TransportError(
-                    f"SSE request failed: HTTP {exc.response.status_code}",
-                    status_code=exc.response.status_code,
-                    response_body=exc.response.text,
-                ) from exc
-
-            # Parse SSE stream
-            event_type: str | None = None
-            data_buffer: list[str] = []
-
-            for line in response.iter_lines():
-                line = line.strip()
-
-                # Skip empty lines and comments (except [end] marker)
-                if not line:
-                    # Empty line indicates end of event
-                    if event_type and data_buffer:
-                        yield self._parse_event(event_type, "".join(data_buffer))
-                        event_type = None
-                        data_buffer = []
-                    continue
-
-                if line.startswith(":"):
-                    # Check for end marker
-                    if "[end]" in line:
-                        break
-                    continue
-
-                # Parse SSE fields
-                if ":" in line:
-                    field, _, value = line.partition(":")
-                    value = value.lstrip()
-
-                    if field == "event":
-                        event_type = value
-                    elif field == "data":
-                        data_buffer.append(value)
-
-            # Handle any remaining buffered event
-            if event_type and data_buffer:
-                yield self._parse_event(event_type, "".join(data_buffer))
-
-    def _parse_event(self, event_type: str, data: str) -> MessageChunk:
-        """Parse SSE event into MessageChunk.
+    def _timed_bytes(self, response: httpx.Response, clock: StreamClock) -> Iterator[bytes]:
+        """Iterate the body under the idle and total limits.
+
+        httpcore reads the read timeout of an HTTP/1.1 body once, when the
+        body starts, so the budget is set there and the total deadline is
+        checked again after every chunk.
 
         Args:
-            event_type: Event type (query_progress, answer_chunk, etc.)
-            data: JSON data string
+            response: Streaming response whose headers have arrived
+            clock: Running deadlines of this stream
 
-        Returns:
-            MessageChunk object
+        Yields:
+            Raw body chunks
 
         """
-        # Parse JSON data
-        try:
-            parsed_data = json.loads(data)
-        except json.JSONDecodeError:
-            # If not JSON, treat as plain text
-            parsed_data = {"text": data}
-
-        # Extract common fields
-        backend_uuid = parsed_data.get("backend_uuid")
-        context_uuid = parsed_data.get("context_uuid")
-        status = parsed_data.get("status")
-        text = parsed_data.get("text")
-        cursor = parsed_data.get("cursor")
-
-        return MessageChunk(
-            type=event_type,
-            status=status,
-            data=parsed_data,
-            backend_uuid=backend_uuid,
-            context_uuid=context_uuid,
-            text=text,
-            cursor=cursor,
-            reconnectable=cursor is not None,
+        clock.started()
+        budget = clock.budget()
+        if budget is not None:
+            client_read = self.client.timeout.read
+            read = budget if client_read is None else min(client_read, budget)
+            response.request.extensions["timeout"]["read"] = read
+        for raw in response.iter_bytes():
+            clock.check()
+            yield raw
+
+
+class AsyncSSETransport(_BaseSSETransport):
+    """Asyncio SSE streaming transport for Perplexity API.
+
+    Async twin of SSETransport built on httpx.AsyncClient. Yields the same
+    StreamChunk objects through an async generator, so a single event loop
+    can hold many concurrent streams open.
+
+    Example:
+        >>> transport = AsyncSSETransport(async_client, "/rest/sse/perplexity.ask")
+        >>> async for chunk in transport.stream(query="test", context_uuid="uuid"):
+        ...     print(chunk.type, chunk.data)
+
+    """
+
+    def __init__(
+        self, client: httpx.AsyncClient, endpoint: str, headers: dict[str, str] | None = None
+    ) -> None:
+        """Initialize async SSE transport.
+
+        Args:
+            client: httpx.AsyncClient instance for making requests
+            endpoint: SSE endpoint path (e.g., /rest/sse/perplexity.ask)
+            headers: Extra headers sent with every request
+
+        """
+        super().__init__(endpoint, headers)
+        self.client = client
+
+    async def stream(
+        self,
+        query: str,
+        context_uuid: str,
+        frontend_uuid: str,
+        mode: str = "concise",
+        model_preference: str = "pplx-70b-chat",
+        sources: list[str] | None = None,
+        parent_entry_uuid: str | None = None,
+        cursor: str | None = None,
+        resume_entry_uuids: list[str] | None = None,
+        events: Iterable[str] | None = None,
+        exclude_events: Iterable[str] | None = None,
+        timeouts: StreamTimeouts | None = None,
+        replay: ReplayTracker | None = None,
+        timing: StreamTiming | None = None,
+        **extra: Any,
+    ) -> AsyncGenerator[StreamChunk, None]:
+        """Stream SSE events from Perplexity API.
+
+        Args:
+            query: Search query string
+            context_uuid: Thread context UUID
+            frontend_uuid: Client-generated entry UUID
+            mode: Query mode (concise, research, etc.)
+            model_preference: Model to use (pplx-70b-chat, etc.)
+            sources: List of source types to use
+            parent_entry_uuid: Parent entry for threaded queries
+            cursor: Resume cursor for reconnection
+            resume_entry_uuids: Entry UUIDs to resume from
+            events: Event types to yield (EventType members or strings);
+                others are skipped before JSON decoding. None yields all
+            exclude_events: Event types to skip before JSON decoding
+            timeouts: Total deadline, first-byte and idle timeouts
+            replay: Delivery history shared by the attempts of one stream;
+                replayed events are dropped before JSON decoding and a
+                ``resumed`` chunk marks where a reconnect picks up
+            timing: Latency breakdown shared by the attempts of one
+                stream; this attempt's connection setup, headers, bytes
+                and events are recorded into it
+            **extra: Additional request parameters
+
+        Yields:
+            StreamChunk objects parsed from SSE events
+
+        Raises:
+            TransportError: On non-2xx responses
+            StreamTimeoutError: When a limit in ``timeouts`` is exceeded
+            httpx.HTTPError: On network errors
+
+        """
+        payload = self._build_payload(
+            query,
+            context_uuid,
+            frontend_uuid,
+            mode,
+            model_preference,
+            sources,
+            parent_entry_uuid,
+            cursor,
+            resume_entry_uuids,
+            extra,
         )
+
+        clock = self._start_clock(timeouts)
+        headers = self.headers
+        if replay is not None:
+            replay.begin()
+            if replay.last_event_id:
+                headers = {**headers, "Last-Event-ID": replay.last_event_id}
+        extensions = None
+        if timing is not None:
+            timing.attempt()
+            extensions = {"trace": timing.atrace}
+        try:
+            async with self.client.stream(
+                "POST",
+                self.endpoint,
+                json=payload,
+                headers=headers,
+                timeout=httpx.USE_CLIENT_DEFAULT
+                if clock is None
+                else clock.cap(self.client.timeout),
+                extensions=extensions,
+            ) as response:
+                if timing is not None:
+                    timing.response_started()
+                if response.is_error:
+                    await response.aread()
+                    raise self._status_error(response)
+
+                # Decode SSE events straight from the raw byte chunks; filtered
+                # events never reach the JSON decoder
+                decoder = SSEDecoder()
+                accept = event_filter(events, exclude_events)
+                chunks = (
+                    response.aiter_bytes() if clock is None else self._timed_bytes(response, clock)
+                )
+                if timing is not None:
+                    chunks = timing.acount(chunks)
+                async for batch in self._aevent_batches(decoder, chunks):
+                    for event in batch:
+                        if timing is not None:
+                            timing.event(event.event)
+                        if replay is not None:
+                            # Replays are dropped before JSON decoding
+                            if not replay.accept(event):
+                                continue
+                            if replay.resuming:
+                                marker = replay.resumed_marker(context_uuid)
+                                if accept is None or accept(marker.type):
+                                    yield marker
+                        if accept is None or accept(event.event):
+                            yield self._parse_event(event.event, event.data)
+        except httpx.TimeoutException as exc:
+            if clock is not None and clock.expired():
+                raise clock.error() from exc
+            raise
+
+    @staticmethod
+    async def _aevent_batches(
+        decoder: SSEDecoder, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[list[SSEEvent]]:
+        """Decode the events of each body chunk, then any unterminated one.
+
+        Args:
+            decoder: Fresh decoder for this response
+            chunks: Raw body chunks
+
+        Yields:
+            Events completed by each chunk
+
+        """
+        async for raw in chunks:
+            yield decoder.feed(raw)
+            if decoder.ended:
+                break
+
+        # Handle any remaining buffered event
+        last = decoder.flush()
+        if last is not None:
+            yield [last]
+
+    @staticmethod
+    async def _timed_bytes(response: httpx.Response, clock: StreamClock) -> AsyncIterator[bytes]:
+        """Iterate the body, bounding every read by the idle and total limits.
+
+        Args:
+            response: Streaming response whose headers have arrived
+            clock: Running deadlines of this stream
+
+        Yields:
+            Raw body chunks
+
+        Raises:
+            StreamTimeoutError: When a read outlasts its budget
+
+        """
+        clock.started()
+        chunks = response.aiter_bytes()
+        while True:
+            budget = clock.budget()
+            try:
+                async with asyncio.timeout(budget):
+                    raw = await anext(chunks)
+            except StopAsyncIteration:
+                return
+            except TimeoutError as exc:
+                raise clock.error() from exc
+            yield raw
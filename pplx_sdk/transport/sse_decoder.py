@@ -0,0 +1,390 @@
+"""Incremental byte-level SSE decoder.
+
+Implements the event stream interpretation rules from the WHATWG HTML
+Living Standard (Server-sent events, section 9.2.6) directly on raw
+``bytes`` chunks as they arrive from the network.
+
+Input is accumulated in one reusable ``bytearray``. Nothing is decoded to
+``str`` except event names (decoded once and cached) and ``id`` values;
+event payloads are handed out as ``bytes``, which ``json.loads`` (and
+orjson/msgspec) accept without an intermediate decode.
+
+Per-byte scanning in Python is far slower than the C-level primitives, so
+the decoder leans on them:
+
+- LF-only input (what Perplexity sends) is cut at the last blank line. A
+  run made only of ``event: X`` / ``data: Y`` blocks is converted with
+  C-level ``map``/``zip`` passes over a single ``split``; otherwise it is
+  split into event blocks, the common shapes take a few slices each and
+  anything else goes through the line rules.
+- Input containing CR is cut at the last line terminator and split with
+  ``bytes.splitlines``, which breaks on exactly CR, LF and CRLF, the three
+  terminators the SSE grammar allows.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from itertools import repeat
+from operator import itemgetter
+from typing import NamedTuple
+
+_LF = 0x0A
+_CR = 0x0D
+_COLON = 0x3A
+_SPACE = 0x20
+_BOM = b"\xef\xbb\xbf"
+
+# Event names repeat constantly; decode each distinct one only once
+_EVENT_NAMES: dict[bytes, str] = {}
+
+
+def _event_name(raw: bytes) -> str:
+    """Decode an event name, caching the result.
+
+    Args:
+        raw: Event field value
+
+    Returns:
+        Decoded event name
+
+    """
+    name = _EVENT_NAMES.get(raw)
+    if name is None:
+        name = raw.decode("utf-8", "replace")
+        if len(_EVENT_NAMES) < 256:
+            _EVENT_NAMES[raw] = name
+    return name
+
+
+class SSEEvent(NamedTuple):
+    r"""A complete, dispatched SSE event.
+
+    A named tuple, so the hot path can build it with one C-level call.
+
+    Attributes:
+        event: Event type (``message`` when the stream sets none)
+        data: Event payload; multiple ``data:`` lines are joined with ``\n``
+        id: Last event ID in effect when the event was dispatched
+
+    """
+
+    event: str
+    data: bytes
+    id: str = ""
+
+
+# tuple.__new__ bound to SSEEvent skips the Python-level NamedTuple __new__
+_new_event = partial(tuple.__new__, SSEEvent)
+_data_payload = itemgetter(slice(6, None))
+
+
+class SSEDecoder:
+    r"""Incremental decoder turning raw SSE bytes into events.
+
+    Feed it chunks in arrival order; each call returns the events completed
+    by that chunk. Chunks may split lines, fields and CRLF pairs anywhere.
+
+    Perplexity terminates streams with a ``: [end]`` comment. When
+    ``end_marker`` is set and a comment containing it is seen, the decoder
+    stops consuming input and sets ``ended``.
+
+    Example:
+        >>> decoder = SSEDecoder()
+        >>> decoder.feed(b"event: answer_chunk\ndata: {\"text\": \"hi\"}\n")
+        []
+        >>> decoder.feed(b"\n")
+        [SSEEvent(event='answer_chunk', data=b'{"text": "hi"}', id='')]
+
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_data",
+        "_event",
+        "_seen_input",
+        "_skip_lf",
+        "end_marker",
+        "ended",
+        "last_event_id",
+        "retry",
+    )
+
+    def __init__(self, end_marker: bytes | None = b"[end]") -> None:
+        """Initialize decoder state.
+
+        Args:
+            end_marker: Comment payload that terminates the stream, or None
+                to decode until the input is exhausted
+
+        """
+        self.end_marker = end_marker
+        self.ended = False
+        self.last_event_id = ""
+        self.retry: int | None = None
+
+        self._buffer = bytearray()
+        self._data: list[bytes] = []
+        self._event = ""
+        self._seen_input = False
+        self._skip_lf = False
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """Consume a chunk of raw bytes.
+
+        Args:
+            chunk: Next bytes from the stream
+
+        Returns:
+            Events completed by this chunk, in stream order
+
+        """
+        events: list[SSEEvent] = []
+        if self.ended or not chunk:
+            return events
+
+        buffer = self._buffer
+        # Buffered input never holds a complete event block, so a new blank
+        # line can only start at its last byte
+        scan_from = max(len(buffer) - 1, 0)
+        buffer += chunk
+
+        if not self._seen_input:
+            # A single leading UTF-8 BOM is ignored
+            if len(buffer) < len(_BOM) and _BOM.startswith(buffer):
+                return events
+            self._seen_input = True
+            if buffer.startswith(_BOM):
+                del buffer[: len(_BOM)]
+                scan_from = 0
+
+        if self._skip_lf:
+            # Second half of a CRLF split across chunks
+            self._skip_lf = False
+            if buffer and buffer[0] == _LF:
+                del buffer[:1]
+                scan_from = 0
+
+        if self._data or self._event or b"\r" in buffer:
+            self._feed_lines(events)
+        else:
+            self._feed_blocks(events, scan_from)
+        return events
+
+    def flush(self) -> SSEEvent | None:
+        """Dispatch an event left pending at end of input.
+
+        The SSE specification discards a trailing event that is not followed
+        by a blank line. Perplexity streams may end right after the last
+        ``data:`` line, so transports call this once the body is exhausted
+        to keep that event. A final unterminated line is included.
+
+        Returns:
+            The pending event, or None if there is none
+
+        """
+        events: list[SSEEvent] = []
+        if self._buffer and not self.ended:
+            self._buffer += b"\n"
+            self._feed_lines(events)
+            self._buffer.clear()
+
+        if self._data:
+            events.append(self._dispatch())
+        self._event = ""
+        return events[-1] if events else None
+
+    def _feed_blocks(self, events: list[SSEEvent], scan_from: int) -> None:
+        """Decode LF-terminated input one event block at a time.
+
+        Only called with no event in progress, so every block starts clean.
+
+        Args:
+            events: List collecting dispatched events
+            scan_from: Offset from which a new blank line may be found
+
+        """
+        buffer = self._buffer
+        end = buffer.rfind(b"\n\n", scan_from)
+        if end == -1:
+            return
+
+        region = bytes(buffer[:end])
+        del buffer[: end + 2]
+
+        if self._feed_uniform(events, region):
+            return
+
+        blocks = region.split(b"\n\n")
+        append = events.append
+        for block in blocks:
+            if not block:
+                # Extra blank lines between events
+                continue
+
+            if block.startswith(b"event:"):
+                newline = block.find(b"\n")
+                if (
+                    newline != -1
+                    and block.startswith(b"data:", newline + 1)
+                    and block.find(b"\n", newline + 1) == -1
+                ):
+                    name = block[7:newline] if block[6] == _SPACE else block[6:newline]
+                    value = newline + 6
+                    if block[value : value + 1] == b" ":
+                        value += 1
+                    append(
+                        _new_event(
+                            (_event_name(name) or "message", block[value:], self.last_event_id)
+                        )
+                    )
+                    continue
+            elif block.startswith(b"data:") and block.find(b"\n") == -1:
+                value = 6 if block[5:6] == b" " else 5
+                append(_new_event(("message", block[value:], self.last_event_id)))
+                continue
+
+            # Any other shape: apply the line rules, then the blank line
+            for line in block.split(b"\n"):
+                if line:
+                    self._line(line)
+                    if self.ended:
+                        return
+                else:
+                    self._blank(events)
+            self._blank(events)
+
+    def _feed_uniform(self, events: list[SSEEvent], region: bytes) -> bool:
+        """Decode a region made only of ``event: X`` / ``data: Y`` blocks.
+
+        This is the steady state of a Perplexity answer stream. The region is
+        split once and every check and conversion runs as a C-level pass
+        (``any``, ``bytes.count``, ``map``), with no Python code per event.
+
+        Args:
+            events: List collecting dispatched events
+            region: Complete event blocks without the final blank line
+
+        Returns:
+            True if the region had that shape and was decoded
+
+        """
+        lines = region.split(b"\n")
+        if len(lines) % 3 != 2:
+            return False
+
+        names = lines[0::3]
+        payloads = lines[1::3]
+        if any(lines[2::3]):
+            return False
+
+        # Every data line starts with "data: " iff each one contributes a
+        # "\ndata: " once they are joined behind a leading newline
+        joined = b"\n" + b"\n".join(payloads)
+        if joined.count(b"\ndata: ") != len(payloads):
+            return False
+
+        kinds: dict[bytes, str] = {}
+        for line in set(names):
+            if not line.startswith(b"event: "):
+                return False
+            kinds[line] = _event_name(line[7:]) or "message"
+
+        events.extend(
+            map(
+                _new_event,
+                zip(
+                    map(kinds.__getitem__, names),
+                    map(_data_payload, payloads),
+                    repeat(self.last_event_id),
+                    strict=False,
+                ),
+            )
+        )
+        return True
+
+    def _feed_lines(self, events: list[SSEEvent]) -> None:
+        """Decode all complete lines with any mix of CR, LF and CRLF.
+
+        Args:
+            events: List collecting dispatched events
+
+        """
+        buffer = self._buffer
+        end = max(buffer.rfind(b"\n"), buffer.rfind(b"\r"))
+        if end == -1:
+            return
+
+        if end == len(buffer) - 1 and buffer[end] == _CR:
+            # A CR at the very end may be the first half of a CRLF
+            self._skip_lf = True
+
+        lines = bytes(buffer[: end + 1]).splitlines()
+        del buffer[: end + 1]
+
+        for line in lines:
+            if line:
+                self._line(line)
+                if self.ended:
+                    return
+            else:
+                self._blank(events)
+
+    def _blank(self, events: list[SSEEvent]) -> None:
+        """Handle a blank line: dispatch the pending event, if any.
+
+        Args:
+            events: List collecting dispatched events
+
+        """
+        if self._data:
+            events.append(self._dispatch())
+        else:
+            self._event = ""
+
+    def _line(self, line: bytes) -> None:
+        """Apply a non-blank line to the decoder state.
+
+        Args:
+            line: Line without its terminator
+
+        """
+        if line[0] == _COLON:
+            # Comment; Perplexity's end marker lives here
+            marker = self.end_marker
+            if marker and marker in line:
+                self.ended = True
+            return
+
+        name, colon, value = line.partition(b":")
+        if colon and value[:1] == b" ":
+            value = value[1:]
+
+        if name == b"data":
+            self._data.append(value)
+        elif name == b"event":
+            self._event = _event_name(value)
+        elif name == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif name == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+        # Unknown fields are ignored
+
+    def _dispatch(self) -> SSEEvent:
+        """Build the pending event and reset the per-event buffers.
+
+        Returns:
+            The dispatched event
+
+        """
+        data = self._data
+        event = SSEEvent(
+            event=self._event or "message",
+            data=data[0] if len(data) == 1 else b"\n".join(data),
+            id=self.last_event_id,
+        )
+        self._data = []
+        self._event = ""
+        return event
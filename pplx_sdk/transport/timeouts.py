@@ -0,0 +1,232 @@
+"""Deadlines for SSE streams.
+
+httpx timeouts bound single network operations, so a stream that keeps
+trickling bytes never times out, and a stream that stalls is only cut off
+by the client-wide read timeout. StreamTimeouts adds three limits measured
+with ``time.monotonic()``:
+
+- ``total``: wall-clock deadline for the whole stream
+- ``first_byte``: wait for the response to start (status line and headers)
+- ``idle``: longest silence between two reads of the body; keep-alive
+  comments count as traffic
+
+The remaining budget is applied as the httpx timeout of the request, so a
+blocked read is interrupted and its connection released instead of being
+noticed only when the next chunk arrives. The async transport recomputes
+the budget before every read. httpcore fixes the read timeout of an
+HTTP/1.1 body when the body starts, so the sync transport bounds each read
+by ``idle`` and the budget left at that point, and additionally checks the
+total deadline after every chunk.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, fields
+
+import httpx
+
+from pplx_sdk.core.exceptions import StreamTimeoutError
+
+# Event loops may fire a timer up to one clock tick early
+_TOLERANCE = 0.001
+
+_MESSAGES = {
+    "total": "Stream exceeded total deadline of {:g}s",
+    "first_byte": "No response within first-byte timeout of {:g}s",
+    "idle": "Stream idle for more than {:g}s",
+}
+
+
+def stream_timeout_error(kind: str, timeout: float) -> StreamTimeoutError:
+    """Build the error for an exceeded stream limit.
+
+    Args:
+        kind: ``total``, ``first_byte`` or ``idle``
+        timeout: The limit in seconds
+
+    Returns:
+        StreamTimeoutError describing the limit
+
+    """
+    return StreamTimeoutError(_MESSAGES[kind].format(timeout), kind=kind, timeout=timeout)
+
+
+@dataclass(frozen=True)
+class StreamTimeouts:
+    """Total deadline, first-byte and idle timeouts for a stream.
+
+    Limits left as None are not enforced.
+
+    Attributes:
+        total: Seconds the whole stream may take
+        first_byte: Seconds to wait for the response to start
+        idle: Seconds the stream may stay silent between reads
+
+    Example:
+        >>> timeouts = StreamTimeouts(total=120.0, first_byte=10.0, idle=30.0)
+        >>> for chunk in conv.ask_stream("What is AI?", timeouts=timeouts):
+        ...     print(chunk.text, end="")
+
+    """
+
+    total: float | None = None
+    first_byte: float | None = None
+    idle: float | None = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "PPLX_STREAM_") -> StreamTimeouts:
+        """Build timeouts from environment variables.
+
+        Each limit is read from ``<prefix><LIMIT>``, e.g.
+        ``PPLX_STREAM_TOTAL`` or ``PPLX_STREAM_IDLE``; unset variables
+        leave the limit off.
+
+        Args:
+            prefix: Environment variable prefix
+
+        Returns:
+            StreamTimeouts instance
+
+        Raises:
+            ValueError: If a variable is not a number
+
+        """
+        values: dict[str, float] = {}
+        for field in fields(cls):
+            raw = os.getenv(f"{prefix}{field.name.upper()}")
+            if raw:
+                values[field.name] = float(raw)
+        return cls(**values)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is set."""
+        return self.total is not None or self.first_byte is not None or self.idle is not None
+
+    def start(self) -> StreamClock:
+        """Start the clock for one stream.
+
+        Returns:
+            StreamClock tracking this stream's deadlines
+
+        """
+        return StreamClock(self)
+
+
+class StreamClock:
+    """Running deadlines of one stream.
+
+    Before ``started()`` the budget of a wait is bounded by ``first_byte``
+    and ``total``; afterwards by ``idle`` and ``total``. ``armed`` records
+    which limit bounded the last budget handed out, so a timeout raised by
+    the network layer can be told apart from the client's own timeouts.
+    """
+
+    __slots__ = ("armed", "deadline", "expires", "first_byte_deadline", "timeouts")
+
+    def __init__(self, timeouts: StreamTimeouts) -> None:
+        """Initialize clock.
+
+        Args:
+            timeouts: Limits to enforce, measured from now
+
+        """
+        now = time.monotonic()
+        self.timeouts = timeouts
+        self.deadline = None if timeouts.total is None else now + timeouts.total
+        self.first_byte_deadline = (
+            None if timeouts.first_byte is None else now + timeouts.first_byte
+        )
+        self.armed: str | None = None
+        self.expires: float | None = None
+
+    def started(self) -> None:
+        """Record that the response has started; idle limits apply from now."""
+        self.first_byte_deadline = None
+
+    def budget(self) -> float | None:
+        """Seconds the next wait may take.
+
+        Returns:
+            Budget in seconds, or None when no limit applies
+
+        Raises:
+            StreamTimeoutError: If a limit has already passed
+
+        """
+        now = time.monotonic()
+        budget: float | None = None
+        self.armed = None
+        if self.first_byte_deadline is not None:
+            budget, self.armed = self.first_byte_deadline - now, "first_byte"
+        elif self.timeouts.idle is not None:
+            budget, self.armed = self.timeouts.idle, "idle"
+        if self.deadline is not None and (budget is None or self.deadline - now <= budget):
+            budget, self.armed = self.deadline - now, "total"
+        if budget is None:
+            self.expires = None
+            return None
+        self.expires = now + budget
+        if budget <= 0:
+            raise self.error()
+        return budget
+
+    def expired(self) -> bool:
+        """Whether the last budget handed out has run out.
+
+        Returns:
+            True if a network timeout now is due to this clock
+
+        """
+        return self.expires is not None and time.monotonic() >= self.expires - _TOLERANCE
+
+    def check(self) -> None:
+        """Raise if the total deadline has passed.
+
+        Raises:
+            StreamTimeoutError: If the total deadline has passed
+
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.armed = "total"
+            raise self.error()
+
+    def error(self) -> StreamTimeoutError:
+        """Build the error for the limit that bounded the last budget.
+
+        Returns:
+            StreamTimeoutError for the armed limit
+
+        """
+        kind = self.armed or "total"
+        limit = getattr(self.timeouts, kind)
+        return stream_timeout_error(kind, limit)
+
+    def cap(self, timeout: httpx.Timeout) -> httpx.Timeout:
+        """Bound every phase of an httpx timeout by the current budget.
+
+        Args:
+            timeout: Timeouts configured on the client
+
+        Returns:
+            Timeouts no longer than the budget
+
+        Raises:
+            StreamTimeoutError: If a limit has already passed
+
+        """
+        budget = self.budget()
+        if budget is None:
+            return timeout
+
+        def phase(value: float | None) -> float:
+            return budget if value is None else min(value, budget)
+
+        return httpx.Timeout(
+            connect=phase(timeout.connect),
+            read=phase(timeout.read),
+            write=phase(timeout.write),
+            pool=phase(timeout.pool),
+        )
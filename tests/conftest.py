@@ -1,5 +1,11 @@
 """Test configuration and shared fixtures."""
 
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
 
@@ -41,3 +47,100 @@ def mock_backend_uuid() -> str:
         Test backend UUID
     """
     return "backend-550e8400-e29b-41d4-a716-446655440002"
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    """Answer every GET and HEAD with a tiny keep-alive response."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def local_url() -> Iterator[str]:
+    """Base URL of a real HTTP server on localhost.
+
+    Returns:
+        Server base URL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class _SlowSSEHandler(BaseHTTPRequestHandler):
+    """Answer POSTs with SSE streams that misbehave in time.
+
+    ``/slow-start`` delays the response headers, ``/trickle`` sends a
+    keep-alive comment every 20 ms, and any other path sends one event and
+    goes silent. Each gives up after a few seconds.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/slow-start":
+            time.sleep(2)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            self.wfile.write(b'event: answer_chunk\ndata: {"text": "Hi"}\n\n')
+            self.wfile.flush()
+            for _ in range(150):
+                time.sleep(0.02)
+                if self.path == "/trickle":
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+        except OSError:
+            pass
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def slow_sse_url() -> Iterator[str]:
+    """Base URL of a localhost server with stalling SSE endpoints.
+
+    Returns:
+        Server base URL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowSSEHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_url() -> str:
+    """Base URL of a localhost port nobody listens on.
+
+    Returns:
+        Base URL refusing connections
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
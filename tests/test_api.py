@@ -0,0 +1,364 @@
+"""Tests for the OpenAI-compatible API server."""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+
+import httpx
+import pytest
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pytest_httpx import HTTPXMock
+
+from pplx_sdk.api import oai_server
+from pplx_sdk.api.metrics import ServerMetrics
+from pplx_sdk.api.middleware import AuthMiddleware, LoggingMiddleware
+from pplx_sdk.api.oai_models import ChatCompletionRequest
+from pplx_sdk.client import AsyncConversation, AsyncPerplexityClient
+from pplx_sdk.domain.cache import AnswerCache
+from pplx_sdk.domain.models import StreamChunk
+from pplx_sdk.streaming.deltas import DeltaCoalescing
+from pplx_sdk.transport.timeouts import StreamTimeouts
+
+SSE_URL = "https://www.perplexity.ai/rest/sse/perplexity.ask"
+
+# Only upstream calls are mocked; requests to the app go through ASGITransport.
+pytestmark = pytest.mark.httpx_mock(should_mock=lambda request: request.url.host != "testserver")
+
+
+def sse_event(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+@pytest.fixture
+def sse_body(mock_backend_uuid: str) -> bytes:
+    return "".join(
+        [
+            sse_event("answer_chunk", {"text": "Hello"}),
+            sse_event("answer_chunk", {"text": " world"}),
+            sse_event(
+                "final_response",
+                {
+                    "backend_uuid": mock_backend_uuid,
+                    "blocks": [{"type": "text", "content": "Hello world"}],
+                },
+            ),
+        ]
+    ).encode()
+
+
+@pytest.fixture
+async def api_client(
+    monkeypatch: pytest.MonkeyPatch, mock_auth_token: str
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    upstream = AsyncPerplexityClient(auth_token=mock_auth_token)
+    monkeypatch.setattr(oai_server, "_client", upstream)
+
+    transport = httpx.ASGITransport(app=oai_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+    await upstream.aclose()
+
+
+def completion_request(stream: bool) -> dict:
+    return {
+        "model": "pplx-70b-chat",
+        "messages": [{"role": "user", "content": "Say hello"}],
+        "stream": stream,
+    }
+
+
+def parse_stream(body: str) -> list[dict | str]:
+    frames: list[dict | str] = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        payload = frame.removeprefix("data: ")
+        frames.append(payload if payload == "[DONE]" else json.loads(payload))
+    return frames
+
+
+async def test_chat_completions_non_streaming(
+    httpx_mock: HTTPXMock, api_client: httpx.AsyncClient, sse_body: bytes
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    response = await api_client.post("/v1/chat/completions", json=completion_request(False))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["object"] == "chat.completion"
+    assert body["choices"][0]["message"]["content"] == "Hello world"
+
+
+async def test_chat_completions_streaming(
+    httpx_mock: HTTPXMock, api_client: httpx.AsyncClient, sse_body: bytes
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    response = await api_client.post("/v1/chat/completions", json=completion_request(True))
+
+    assert response.status_code == 200
+    frames = parse_stream(response.text)
+    assert frames[-1] == "[DONE]"
+    chunks = [f for f in frames if isinstance(f, dict)]
+    assert chunks[0]["choices"][0]["delta"]["role"] == "assistant"
+    assert "".join(c["choices"][0]["delta"]["content"] or "" for c in chunks) == "Hello world"
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+async def test_streaming_does_not_block_event_loop(
+    httpx_mock: HTTPXMock, api_client: httpx.AsyncClient, sse_body: bytes
+) -> None:
+    release = asyncio.Event()
+
+    async def slow_upstream(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, content=sse_body)
+
+    httpx_mock.add_callback(slow_upstream, url=SSE_URL, method="POST")
+
+    pending = asyncio.create_task(
+        api_client.post("/v1/chat/completions", json=completion_request(True))
+    )
+    await asyncio.sleep(0)
+
+    # Another client is served while the upstream answer is still pending
+    health = await asyncio.wait_for(api_client.get("/v1/health"), timeout=5)
+    assert health.status_code == 200
+    assert not pending.done()
+
+    release.set()
+    response = await asyncio.wait_for(pending, timeout=5)
+    assert response.status_code == 200
+    assert parse_stream(response.text)[-1] == "[DONE]"
+
+
+async def test_health_reports_pool_stats(api_client: httpx.AsyncClient) -> None:
+    response = await api_client.get("/v1/health")
+
+    pool = response.json()["pool"]
+    assert pool["connections"] == 0
+    assert pool["waiting"] == 0
+
+
+async def test_chat_completions_requires_user_message(api_client: httpx.AsyncClient) -> None:
+    request = completion_request(False)
+    request["messages"] = [{"role": "system", "content": "be nice"}]
+
+    response = await api_client.post("/v1/chat/completions", json=request)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.httpx_mock(should_mock=lambda request: False)
+async def test_lifespan_warms_up_connections(
+    monkeypatch: pytest.MonkeyPatch, local_url: str, mock_auth_token: str
+) -> None:
+    monkeypatch.setenv("PPLX_WARMUP_CONNECTIONS", "2")
+    client = AsyncPerplexityClient(api_base=local_url, auth_token=mock_auth_token)
+    monkeypatch.setattr(oai_server, "_client", client)
+
+    async with oai_server.lifespan(oai_server.app):
+        stats = client.pool_stats()
+        assert stats is not None
+        assert stats.idle == 2
+
+    assert oai_server._client is None
+
+
+@pytest.mark.httpx_mock(should_mock=lambda request: False)
+async def test_lifespan_survives_warmup_failure(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    closed_url: str,
+    mock_auth_token: str,
+) -> None:
+    client = AsyncPerplexityClient(api_base=closed_url, auth_token=mock_auth_token)
+    monkeypatch.setattr(oai_server, "_client", client)
+
+    async with oai_server.lifespan(oai_server.app):
+        pass
+
+    assert "warm-up failed" in caplog.text
+
+
+def test_stream_timeouts_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(oai_server, "_stream_timeouts", None)
+    monkeypatch.setenv("PPLX_STREAM_IDLE", "30")
+    monkeypatch.setenv("PPLX_STREAM_FIRST_BYTE", "10")
+
+    assert oai_server.get_stream_timeouts() == StreamTimeouts(first_byte=10.0, idle=30.0)
+
+
+@pytest.mark.parametrize(("retries", "expected"), [(None, 3), ("5", 5), ("0", None)])
+async def test_client_stream_retries_from_env(
+    monkeypatch: pytest.MonkeyPatch, mock_auth_token: str, retries: str | None, expected: int | None
+) -> None:
+    monkeypatch.setattr(oai_server, "_client", None)
+    monkeypatch.setenv("PPLX_AUTH_TOKEN", mock_auth_token)
+    if retries is None:
+        monkeypatch.delenv("PPLX_STREAM_RETRIES", raising=False)
+    else:
+        monkeypatch.setenv("PPLX_STREAM_RETRIES", retries)
+
+    client = oai_server.get_client()
+    manager = client.entries.stream_manager
+    assert (manager and manager.retry_config.max_retries) == expected
+    await client.aclose()
+
+
+async def test_streaming_replays_cached_answer(
+    httpx_mock: HTTPXMock, api_client: httpx.AsyncClient, sse_body: bytes
+) -> None:
+    """Test a repeat streaming request is replayed from the answer cache."""
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+    oai_server.get_client().entries.cache = AnswerCache()
+
+    responses = [
+        await api_client.post("/v1/chat/completions", json=completion_request(True))
+        for _ in range(2)
+    ]
+
+    assert len(httpx_mock.get_requests()) == 1
+    for response in responses:
+        chunks = [f for f in parse_stream(response.text) if isinstance(f, dict)]
+        assert "".join(c["choices"][0]["delta"]["content"] or "" for c in chunks) == "Hello world"
+    health = await api_client.get("/v1/health")
+    assert health.json()["answer_cache"] == {"hits": 1, "stale_hits": 0, "misses": 1}
+
+
+async def test_metrics_endpoint(
+    httpx_mock: HTTPXMock,
+    monkeypatch: pytest.MonkeyPatch,
+    api_client: httpx.AsyncClient,
+    sse_body: bytes,
+) -> None:
+    """Test /metrics counts requests, streams and upstream timings."""
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body, is_reusable=True)
+    metrics = ServerMetrics(oai_server.MODEL_MAPPING)
+    monkeypatch.setattr(oai_server, "_metrics", metrics)
+    oai_server.get_client().entries.metrics = metrics
+
+    streamed = await api_client.post("/v1/chat/completions", json=completion_request(True))
+    await api_client.post("/v1/chat/completions", json=completion_request(False))
+    response = await api_client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'pplx_requests_total{model="pplx-70b-chat",stream="true"} 1' in lines
+    assert 'pplx_requests_total{model="pplx-70b-chat",stream="false"} 1' in lines
+    assert 'pplx_time_to_first_token_seconds_count{model="pplx-70b-chat"} 1' in lines
+    assert 'pplx_stream_chunks_total{model="pplx-70b-chat"} 2' in lines
+    assert f'pplx_stream_bytes_total{{model="pplx-70b-chat"}} {len(streamed.content)}' in lines
+    assert "pplx_streams_in_flight 0" in lines
+    assert 'pplx_upstream_streams_total{source="upstream"} 2' in lines
+    assert f"pplx_upstream_bytes_total {2 * len(sse_body)}" in lines
+    assert "pplx_upstream_time_to_first_token_seconds_count 2" in lines
+    assert "pplx_pool_requests_total 2" in lines
+    assert not [line for line in lines if line.startswith("pplx_request_errors_total{")]
+    assert "# TYPE pplx_upstream_retries_total counter" in lines
+
+
+async def test_logging_middleware_passes_streams_through(
+    httpx_mock: HTTPXMock,
+    api_client: httpx.AsyncClient,
+    sse_body: bytes,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the ASGI middleware logs a streamed response once it completes."""
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+    app = LoggingMiddleware(AuthMiddleware(oai_server.app))
+    transport = httpx.ASGITransport(app=app)
+
+    with caplog.at_level("INFO", logger="pplx_sdk.api"):
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.post("/v1/chat/completions", json=completion_request(True))
+            missing = await client.get("/v1/missing")
+
+    assert parse_stream(response.text)[-1] == "[DONE]"
+    assert missing.status_code == 404
+    messages = [r.getMessage() for r in caplog.records if r.name == "pplx_sdk.api"]
+    assert messages[0] == "Request: POST /v1/chat/completions"
+    assert messages[1].startswith("Response: POST /v1/chat/completions - Status 200 - Duration ")
+    assert messages[3].startswith("Response: GET /v1/missing - Status 404")
+
+
+async def test_logging_middleware_logs_errors_without_info(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test exceptions are logged at ERROR even when INFO is disabled."""
+
+    async def failing_app(scope: object, receive: object, send: object) -> None:
+        raise RuntimeError("boom")
+
+    transport = httpx.ASGITransport(app=LoggingMiddleware(failing_app))
+
+    with caplog.at_level("WARNING", logger="pplx_sdk.api"):
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            with pytest.raises(RuntimeError, match="boom"):
+                await client.get("/v1/models")
+
+    records = [r for r in caplog.records if r.name == "pplx_sdk.api"]
+    assert [r.levelname for r in records] == ["ERROR"]
+    assert records[0].getMessage().startswith("Error: GET /v1/models - Duration ")
+
+
+@pytest.mark.parametrize(
+    ("coalesce", "expected"),
+    [(None, ["a", "b", "c", "d"]), ({"max_delay": 5}, ["a", "bcd"]), (False, ["a", "b", "c", "d"])],
+)
+async def test_streaming_coalesces_deltas(
+    httpx_mock: HTTPXMock,
+    monkeypatch: pytest.MonkeyPatch,
+    api_client: httpx.AsyncClient,
+    coalesce: dict | bool | None,
+    expected: list[str],
+) -> None:
+    """Test deltas are merged per request, after an immediate first token."""
+    body = "".join(sse_event("answer_chunk", {"text": text}) for text in "abcd")
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=body.encode())
+    # The server default is overridden by the request's field
+    monkeypatch.setattr(oai_server, "_delta_coalescing", DeltaCoalescing(enabled=coalesce is False))
+
+    request = {**completion_request(True), "coalesce": coalesce}
+    response = await api_client.post("/v1/chat/completions", json=request)
+
+    chunks = [f for f in parse_stream(response.text) if isinstance(f, dict)]
+    contents = [c["choices"][0]["delta"]["content"] for c in chunks[1:-1]]
+    assert contents == expected
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+async def test_streaming_closes_upstream_when_client_leaves(
+    monkeypatch: pytest.MonkeyPatch, mock_auth_token: str, coalesce: bool
+) -> None:
+    """Test the upstream stream is closed as soon as the response is."""
+    closed = asyncio.Event()
+
+    async def ask_stream(*args: object, **kwargs: object) -> AsyncGenerator[StreamChunk, None]:
+        try:
+            while True:
+                yield StreamChunk("answer_chunk", text="x")
+                await asyncio.sleep(0)
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(AsyncConversation, "ask_stream", ask_stream)
+    upstream = AsyncPerplexityClient(auth_token=mock_auth_token)
+    monkeypatch.setattr(oai_server, "_client", upstream)
+
+    request = ChatCompletionRequest.model_validate(
+        {**completion_request(True), "coalesce": coalesce}
+    )
+    response = await oai_server.chat_completions(request, Request({"type": "http"}))
+    assert isinstance(response, StreamingResponse)
+    frames = response.body_iterator
+    assert isinstance(frames, AsyncGenerator)
+    await anext(frames)  # role
+    await anext(frames)  # first content chunk
+    await frames.aclose()
+
+    assert closed.is_set()
+    await upstream.aclose()
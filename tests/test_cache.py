@@ -0,0 +1,260 @@
+"""Tests for the answer cache and its backends."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from pplx_sdk.client import AsyncPerplexityClient, PerplexityClient
+from pplx_sdk.domain import cache as cache_module
+from pplx_sdk.domain.cache import (
+    AnswerCache,
+    AnswerCacheBackend,
+    FileCacheBackend,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    entry_chunks,
+)
+from pplx_sdk.domain.entries import EntryAssembler
+from pplx_sdk.domain.models import Block, Entry, Source, StreamStatus
+from pplx_sdk.streaming.types import EventType
+
+SSE_URL = "https://www.perplexity.ai/rest/sse/perplexity.ask"
+
+
+def answer_body(text: str, backend_uuid: str = "b-1") -> bytes:
+    events = [
+        ("answer_chunk", {"text": text, "backend_uuid": backend_uuid}),
+        ("final_response", {"backend_uuid": backend_uuid, "blocks": []}),
+    ]
+    return "".join(f"event: {e}\ndata: {json.dumps(d)}\n\n" for e, d in events).encode()
+
+
+def make_entry(text: str = "Hello world") -> Entry:
+    return Entry(
+        backend_uuid="b-1",
+        frontend_uuid="f-1",
+        context_uuid="c-1",
+        status=StreamStatus.COMPLETED,
+        text_completed=True,
+        blocks=[Block(type="text", content=text)],
+        sources=[Source(type="web", url="https://example.com")],
+        query="hi",
+        display_model="pplx-70b-chat",
+    )
+
+
+def test_memory_backend_evicts_least_recently_used_by_size() -> None:
+    backend = MemoryCacheBackend(max_bytes=10)
+    backend.set("a", b"aaaa", 0)
+    backend.set("b", b"bbbb", 0)
+    assert backend.get("a") == b"aaaa"
+    backend.set("c", b"cccc", 0)
+    backend.set("huge", b"x" * 11, 0)
+
+    assert backend.get("b") is None
+    assert backend.get("huge") is None
+    assert (backend.get("a"), backend.get("c")) == (b"aaaa", b"cccc")
+    assert backend.size == 8
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "files"])
+def test_persistent_backends_survive_reopen_and_purge(tmp_path: Path, kind: str) -> None:
+    def open_backend() -> SQLiteCacheBackend | FileCacheBackend:
+        if kind == "sqlite":
+            return SQLiteCacheBackend(tmp_path / "answers.db")
+        return FileCacheBackend(tmp_path / "answers")
+
+    backend = open_backend()
+    assert isinstance(backend, AnswerCacheBackend)
+    backend.set("live", b"1", time.time() + 60)
+    backend.set("expired", b"2", time.time() - 1)
+    backend.set("deleted", b"3", time.time() + 60)
+    backend.delete("deleted")
+
+    reopened = open_backend()
+    assert reopened.purge() == 1
+    assert reopened.get("live") == b"1"
+    assert reopened.get("expired") is None
+    assert reopened.get("deleted") is None
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_answer_cache_ttls_and_stale_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock(1000.0)
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = AnswerCache(ttl=10, mode_ttls={"research": 100, "copilot": 0}, stale_while_revalidate=5)
+    key = cache.key("  What IS   AI? ", "concise", "m")
+    assert key == cache.key("what is ai?", "concise", "m")
+    assert key != cache.key("what is ai?", "research", "m")
+
+    cache.put(key, make_entry(), "concise")
+    cache.put(cache.key("q", "copilot", "m"), make_entry(), "copilot")
+    cached = cache.get(key)
+    assert cached is not None and cached.fresh
+    assert cache.get(cache.key("q", "copilot", "m")) is None
+
+    clock.now = 1012.0
+    cached = cache.get(key)
+    assert cached is not None and not cached.fresh
+    clock.now = 1016.0
+    assert cache.get(key) is None
+    assert cache.stats() == {"hits": 1, "stale_hits": 1, "misses": 2}
+
+
+def test_answer_cache_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    assert AnswerCache.from_env() is None
+
+    monkeypatch.setenv("PPLX_ANSWER_CACHE", f"sqlite:{tmp_path / 'a.db'}")
+    monkeypatch.setenv("PPLX_ANSWER_CACHE_TTL", "60")
+    monkeypatch.setenv("PPLX_ANSWER_CACHE_TTL_RESEARCH", "600")
+    monkeypatch.setenv("PPLX_ANSWER_CACHE_STALE", "30")
+    cache = AnswerCache.from_env()
+
+    assert cache is not None
+    assert isinstance(cache.backend, SQLiteCacheBackend)
+    assert (cache.ttl_for("concise"), cache.ttl_for("research")) == (60.0, 600.0)
+    assert cache.stale_while_revalidate == 30.0
+
+    monkeypatch.setenv("PPLX_ANSWER_CACHE", "redis")
+    with pytest.raises(ValueError, match="Unknown answer cache backend"):
+        AnswerCache.from_env()
+
+
+def test_entry_chunks_rebuild_the_entry() -> None:
+    entry = make_entry()
+    assembler = EntryAssembler("hi", "c-2", "f-2")
+    for chunk in entry_chunks(entry):
+        assembler.feed(chunk)
+
+    rebuilt = assembler.build()
+    assert rebuilt.blocks == entry.blocks
+    assert rebuilt.sources == entry.sources
+    assert rebuilt.backend_uuid == entry.backend_uuid
+
+
+def test_client_answers_repeat_questions_from_cache(
+    httpx_mock: HTTPXMock, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("Hello"))
+    cache = AnswerCache()
+
+    with PerplexityClient(auth_token=mock_auth_token, answer_cache=cache) as client:
+        first = client.new_conversation().ask("What is AI?")
+        second = client.new_conversation().ask("what is  AI?")
+        streamed = list(
+            client.new_conversation().ask_stream("What is AI?", events={EventType.ANSWER_CHUNK})
+        )
+        conv = client.new_conversation()
+        conv.entries.append(first)
+        httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("More"))
+        follow_up = conv.ask("What is AI?")
+
+    # Follow-up questions are never answered from the cache
+    assert len(httpx_mock.get_requests()) == 2
+    assert second.blocks == first.blocks
+    assert [(c.type, c.text) for c in streamed] == [("answer_chunk", "Hello")]
+    assert follow_up.blocks[0].content == "More"
+
+
+@pytest.mark.parametrize("data", [b"not json", b"[]", b'{"entry": {}}', b'{"stored_at": 1}'])
+def test_answer_cache_drops_undecodable_entries(data: bytes) -> None:
+    cache = AnswerCache()
+    cache.backend.set("k", data, time.time() + 60)
+
+    assert cache.get("k") is None
+    assert cache.backend.get("k") is None
+    assert cache.stats() == {"hits": 0, "stale_hits": 0, "misses": 1}
+
+
+async def test_async_client_answers_upstream_over_corrupt_cache_entry(
+    httpx_mock: HTTPXMock, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("Hello"))
+    cache = AnswerCache()
+
+    async with AsyncPerplexityClient(auth_token=mock_auth_token, answer_cache=cache) as client:
+        key = cache.key("What is AI?", "concise", "pplx-70b-chat", scope=client.entries.cache_scope)
+        cache.backend.set(key, b"\x00garbage", time.time() + 60)
+        entry = await client.new_conversation().ask("What is AI?")
+        cached = await client.new_conversation().ask("What is AI?")
+
+    assert entry.blocks[0].content == cached.blocks[0].content == "Hello"
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.stats() == {"hits": 1, "stale_hits": 0, "misses": 1}
+
+
+def test_cached_answer_is_a_snapshot_and_never_a_parent(
+    httpx_mock: HTTPXMock, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("Hello"))
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("Again", "b-2"))
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("More", "b-3"))
+
+    with PerplexityClient(auth_token=mock_auth_token, answer_cache=AnswerCache()) as client:
+        original = client.new_conversation()
+        first = original.ask("What is AI?")
+        conv = client.new_conversation()
+        own_context = conv.context_uuid
+        cached = conv.ask("What is AI?")
+        # A cached first answer does not make the next question shareable
+        again = conv.ask("What is AI?")
+        more = conv.ask("Tell me more")
+
+    _, second, third = (json.loads(r.content) for r in httpx_mock.get_requests())
+    assert not first.snapshot
+    assert cached.snapshot and cached.context_uuid == original.context_uuid
+    assert conv.context_uuid == own_context
+    # The first real entry of the thread has no parent; later ones chain to it
+    assert (second["context_uuid"], second.get("parent_entry_uuid")) == (own_context, None)
+    assert (third["context_uuid"], third["parent_entry_uuid"]) == (own_context, "b-2")
+    assert not again.snapshot and again.blocks[0].content == "Again"
+    assert more.blocks[0].content == "More"
+
+
+def test_answer_cache_is_scoped_by_account(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("A"), is_reusable=True)
+    cache = AnswerCache()
+
+    for token in ("token-a", "token-b", "token-a"):
+        with PerplexityClient(auth_token=token, answer_cache=cache) as client:
+            client.new_conversation().ask("What is AI?")
+
+    # One upstream request per account; the repeat of token-a is a hit
+    assert len(httpx_mock.get_requests()) == 2
+    assert cache.stats() == {"hits": 1, "stale_hits": 0, "misses": 2}
+
+
+async def test_async_client_serves_stale_answer_while_revalidating(
+    httpx_mock: HTTPXMock, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("old"))
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=answer_body("new"))
+    cache = AnswerCache(ttl=0.05, stale_while_revalidate=60)
+
+    async with AsyncPerplexityClient(auth_token=mock_auth_token, answer_cache=cache) as client:
+        await client.new_conversation().ask("q")
+        await asyncio.sleep(0.06)
+        stale = await client.new_conversation().ask("q")
+        # The refresh holds the revalidation claim until it has cached the answer
+        key = cache.key("q", "concise", "pplx-70b-chat", scope=client.entries.cache_scope)
+        for _ in range(500):
+            if cache.claim_revalidation(key):
+                break
+            await asyncio.sleep(0.01)
+        cache.release_revalidation(key)
+        fresh = await client.new_conversation().ask("q")
+
+    assert stale.blocks[0].content == "old"
+    assert fresh.blocks[0].content == "new"
+    assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,339 @@
+"""Tests for sync and async clients, conversations and entries services."""
+
+import asyncio
+import json
+from collections.abc import Iterator
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from pplx_sdk.client import (
+    AsyncConversation,
+    AsyncPerplexityClient,
+    Conversation,
+    PerplexityClient,
+)
+from pplx_sdk.core.exceptions import StreamTimeoutError, TransportError
+from pplx_sdk.domain.entries import EntryAssembler
+from pplx_sdk.domain.models import StreamChunk, StreamStatus
+from pplx_sdk.streaming.types import EventType
+from pplx_sdk.transport.sse import SSETransport
+from pplx_sdk.transport.timeouts import StreamTimeouts
+
+SSE_URL = "https://www.perplexity.ai/rest/sse/perplexity.ask"
+
+
+def sse_event(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+@pytest.fixture
+def sse_body(mock_backend_uuid: str) -> bytes:
+    """A short but complete answer stream."""
+    return "".join(
+        [
+            sse_event("query_progress", {"status": "search_started"}),
+            sse_event("answer_chunk", {"text": "Hello", "backend_uuid": mock_backend_uuid}),
+            sse_event("answer_chunk", {"text": " world", "cursor": "c-1"}),
+            sse_event(
+                "final_response",
+                {
+                    "backend_uuid": mock_backend_uuid,
+                    "display_model": "pplx-70b-chat",
+                    "blocks": [{"type": "text", "content": "Hello world"}],
+                    "sources": [{"type": "web", "url": "https://example.com"}],
+                },
+            ),
+            ": [end]\n\n",
+        ]
+    ).encode()
+
+
+def test_client_ask_stream(httpx_mock: HTTPXMock, sse_body: bytes, mock_auth_token: str) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    with PerplexityClient(auth_token=mock_auth_token) as client:
+        conv = client.new_conversation(title="Test")
+        chunks = list(conv.ask_stream("hi"))
+
+    assert isinstance(conv, Conversation)
+    assert [c.type for c in chunks] == [
+        "query_progress",
+        "answer_chunk",
+        "answer_chunk",
+        "final_response",
+    ]
+    assert "".join(c.text or "" for c in chunks) == "Hello world"
+    assert chunks[2].reconnectable is True
+
+    request = httpx_mock.get_request()
+    assert request is not None
+    assert request.headers["Authorization"] == f"Bearer {mock_auth_token}"
+    assert json.loads(request.content)["context_uuid"] == conv.context_uuid
+
+
+def test_client_ask_stream_event_filters(
+    httpx_mock: HTTPXMock,
+    monkeypatch: pytest.MonkeyPatch,
+    sse_body: bytes,
+    mock_auth_token: str,
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    decoded: list[str] = []
+    parse_event = SSETransport._parse_event
+
+    def spy(self: SSETransport, event_type: str, data: bytes | str) -> StreamChunk:
+        decoded.append(event_type)
+        return parse_event(self, event_type, data)
+
+    monkeypatch.setattr(SSETransport, "_parse_event", spy)
+
+    with PerplexityClient(auth_token=mock_auth_token) as client:
+        conv = client.new_conversation()
+        included = list(conv.ask_stream("hi", events=[EventType.ANSWER_CHUNK]))
+        excluded = list(conv.ask_stream("hi", exclude_events={"query_progress", "answer_chunk"}))
+
+    assert [c.text for c in included] == ["Hello", " world"]
+    assert [c.type for c in excluded] == ["final_response"]
+    # Filtered events never reach the JSON decoder
+    assert decoded == ["answer_chunk", "answer_chunk", "final_response"]
+    assert "events" not in json.loads(httpx_mock.get_requests()[0].content)
+
+
+def test_client_ask_tracks_history(
+    httpx_mock: HTTPXMock, sse_body: bytes, mock_backend_uuid: str, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    with PerplexityClient(auth_token=mock_auth_token) as client:
+        conv = client.new_conversation()
+        entry = conv.ask("first")
+        conv.ask("second")
+
+    assert entry.backend_uuid == mock_backend_uuid
+    assert entry.status == StreamStatus.COMPLETED
+    assert entry.blocks[0].content == "Hello world"
+    assert len(conv.entries) == 2
+
+    second = json.loads(httpx_mock.get_requests()[1].content)
+    assert second["parent_entry_uuid"] == mock_backend_uuid
+
+
+def test_clients_share_injected_http_client(
+    httpx_mock: HTTPXMock, sse_body: bytes, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body, is_reusable=True)
+
+    with httpx.Client() as shared:
+        first = PerplexityClient(auth_token=f"{mock_auth_token}-1", http_client=shared)
+        second = PerplexityClient(auth_token=f"{mock_auth_token}-2", http_client=shared)
+        for client in (first, second):
+            list(client.new_conversation().ask_stream("hi"))
+            client.close()
+        assert not shared.is_closed
+
+    auth = [request.headers["Authorization"] for request in httpx_mock.get_requests()]
+    assert auth == [f"Bearer {mock_auth_token}-1", f"Bearer {mock_auth_token}-2"]
+    assert httpx_mock.get_requests()[0].headers["Accept"] == "text/event-stream"
+
+
+def test_client_http2_option(mock_auth_token: str) -> None:
+    pytest.importorskip("h2")
+    with PerplexityClient(auth_token=mock_auth_token, http2=True) as client:
+        assert client._http_client._transport.transport._pool._http2 is True  # type: ignore[attr-defined]
+
+
+def test_client_stream_http_error(httpx_mock: HTTPXMock, mock_auth_token: str) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", status_code=500, text="boom")
+
+    with PerplexityClient(auth_token=mock_auth_token) as client:
+        conv = client.new_conversation()
+        with pytest.raises(TransportError) as exc_info:
+            list(conv.ask_stream("hi"))
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.response_body == "boom"
+
+
+async def test_async_client_ask_stream(
+    httpx_mock: HTTPXMock, sse_body: bytes, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    async with AsyncPerplexityClient(auth_token=mock_auth_token) as client:
+        conv = client.new_conversation(title="Async")
+        chunks = [chunk async for chunk in conv.ask_stream("hi")]
+
+    assert isinstance(conv, AsyncConversation)
+    assert all(isinstance(c, StreamChunk) for c in chunks)
+    assert "".join(c.text or "" for c in chunks) == "Hello world"
+
+
+async def test_async_client_ask(
+    httpx_mock: HTTPXMock, sse_body: bytes, mock_backend_uuid: str, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    async with AsyncPerplexityClient(auth_token=mock_auth_token) as client:
+        conv = client.new_conversation()
+        entry = await conv.ask("hi")
+        forked = conv.fork()
+
+    assert entry.backend_uuid == mock_backend_uuid
+    assert entry.sources[0].url == "https://example.com"
+    assert forked.entries == [entry]
+    assert forked.context_uuid != conv.context_uuid
+
+
+async def test_async_client_coalesces_identical_requests(
+    httpx_mock: HTTPXMock, sse_body: bytes, mock_backend_uuid: str, mock_auth_token: str
+) -> None:
+    """Test identical concurrent questions share one upstream stream."""
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+    httpx_mock.add_response(url=SSE_URL, method="POST", content=sse_body)
+
+    async with AsyncPerplexityClient(auth_token=mock_auth_token, coalesce_requests=True) as client:
+        convs = [client.new_conversation() for _ in range(3)]
+        entries = await asyncio.gather(*(conv.ask("hi") for conv in convs))
+        follow_up = await convs[2].ask("hi")
+        coalescer = client.entries.coalescer
+
+    # One stream for the burst, one for the follow-up question
+    first, second = (json.loads(request.content) for request in httpx_mock.get_requests())
+    assert coalescer is not None and coalescer.coalesced == 2
+    assert coalescer.in_flight == 0
+    assert [entry.backend_uuid for entry in entries] == [mock_backend_uuid] * 3
+    assert [entry.text_completed for entry in entries] == [True] * 3
+    assert follow_up.text_completed
+    # Followers get snapshots of the leader's entry; they stay in their own thread
+    assert [entry.context_uuid for entry in entries] == [first["context_uuid"]] * 3
+    assert [entry.snapshot for entry in entries] == [False, True, True]
+    assert second["context_uuid"] == convs[2].context_uuid != first["context_uuid"]
+    assert "parent_entry_uuid" not in second
+
+
+async def test_async_entries_ask_without_final_response(
+    httpx_mock: HTTPXMock, mock_auth_token: str
+) -> None:
+    httpx_mock.add_response(
+        url=SSE_URL, method="POST", content=sse_event("answer_chunk", {"text": "x"}).encode()
+    )
+
+    async with AsyncPerplexityClient(auth_token=mock_auth_token) as client:
+        with pytest.raises(ValueError, match="No final_response"):
+            await client.entries.ask("hi", context_uuid="ctx")
+
+
+def test_entry_assembler_partial_results(
+    mock_context_uuid: str, mock_frontend_uuid: str, mock_backend_uuid: str
+) -> None:
+    assembler = EntryAssembler("hi", mock_context_uuid, mock_frontend_uuid)
+
+    assert assembler.feed(StreamChunk.from_event("answer_chunk", {"text": "Hello"})) is False
+    assert assembler.feed(StreamChunk.from_event("answer_chunk", {"text": " world"})) is False
+    assert assembler.text == "Hello world"
+    assert [b.content for b in assembler.blocks] == ["Hello world"]
+
+    partial = assembler.partial()
+    assert partial.status == StreamStatus.PENDING
+    assert partial.text_completed is False
+    with pytest.raises(ValueError, match="No final_response"):
+        assembler.build()
+
+    # Final response without blocks: the streamed text becomes the answer
+    final = StreamChunk.from_event("final_response", {"backend_uuid": mock_backend_uuid})
+    assert assembler.feed(final) is True
+    entry = assembler.build()
+    assert entry.status == StreamStatus.COMPLETED
+    assert [(b.type, b.content) for b in entry.blocks] == [("text", "Hello world")]
+
+
+def test_entry_assembler_prefers_final_blocks(mock_context_uuid: str) -> None:
+    assembler = EntryAssembler("hi", mock_context_uuid, "f-1")
+    assembler.feed(StreamChunk.from_event("answer_chunk", {"text": "draft"}))
+    assembler.feed(
+        StreamChunk.from_event(
+            "final_response",
+            {
+                "backend_uuid": "b-1",
+                "blocks": [{"type": "text", "content": "A"}, {"type": "code", "content": "B"}],
+                "sources": [{"type": "web", "url": "https://example.com"}],
+            },
+        )
+    )
+
+    assert assembler.text == "A\nB"
+    assert assembler.sources[0].url == "https://example.com"
+    assert [b.type for b in assembler.build().blocks] == ["text", "code"]
+
+
+def test_ask_returns_at_final_response(
+    httpx_mock: HTTPXMock, sse_body: bytes, mock_backend_uuid: str, mock_auth_token: str
+) -> None:
+    def body() -> Iterator[bytes]:
+        yield sse_body
+        raise AssertionError("ask() kept reading after final_response")
+
+    httpx_mock.add_response(url=SSE_URL, method="POST", stream=IteratorStream(body()))
+
+    with PerplexityClient(auth_token=mock_auth_token) as client:
+        entry = client.entries.ask("hi", context_uuid="ctx")
+
+    assert entry.backend_uuid == mock_backend_uuid
+    assert entry.blocks[0].content == "Hello world"
+
+
+real_network = pytest.mark.httpx_mock(should_mock=lambda request: False)
+
+
+@real_network
+def test_client_warmup_opens_connections(local_url: str, mock_auth_token: str) -> None:
+    with PerplexityClient(api_base=local_url, auth_token=mock_auth_token) as client:
+        assert client.warmup(n_connections=3) == 3
+
+        stats = client.pool_stats()
+        assert stats is not None
+        assert (stats.connections, stats.idle) == (3, 3)
+
+
+@real_network
+async def test_async_client_warmup_opens_connections(local_url: str, mock_auth_token: str) -> None:
+    async with AsyncPerplexityClient(api_base=local_url, auth_token=mock_auth_token) as client:
+        assert await client.warmup(n_connections=2) == 2
+
+        stats = client.pool_stats()
+        assert stats is not None
+        assert stats.idle == 2
+
+
+@real_network
+async def test_warmup_reports_connect_errors(closed_url: str, mock_auth_token: str) -> None:
+    with PerplexityClient(api_base=closed_url, auth_token=mock_auth_token) as client:
+        with pytest.raises(httpx.ConnectError):
+            client.warmup(n_connections=2)
+
+    async with AsyncPerplexityClient(api_base=closed_url, auth_token=mock_auth_token) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.warmup(n_connections=2)
+
+
+@real_network
+async def test_ask_stream_idle_timeout_releases_connection(
+    slow_sse_url: str, mock_auth_token: str
+) -> None:
+    """Test a stalled answer is cut off and its connection dropped."""
+    async with AsyncPerplexityClient(api_base=slow_sse_url, auth_token=mock_auth_token) as client:
+        conv = client.new_conversation()
+        texts = []
+        with pytest.raises(StreamTimeoutError):
+            async for chunk in conv.ask_stream("hi", timeouts=StreamTimeouts(idle=0.2)):
+                texts.append(chunk.text)
+
+        assert texts == ["Hi"]
+        stats = client.pool_stats()
+        assert stats is not None
+        assert stats.connections == 0
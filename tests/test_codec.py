@@ -0,0 +1,91 @@
+"""Tests for the pluggable JSON codec."""
+
+import pytest
+
+from pplx_sdk.api.oai_models import (
+    ChatCompletionChunk,
+    ChatCompletionChunkChoice,
+    ChatCompletionChunkDelta,
+)
+from pplx_sdk.api.oai_server import _ChunkEncoder, _encode_chunk
+from pplx_sdk.shared import codec
+from pplx_sdk.shared.codec import BACKENDS, available_backends, load_codec
+
+
+@pytest.fixture(params=available_backends())
+def backend(request: pytest.FixtureRequest) -> str:
+    return request.param
+
+
+def test_loads_bytes_and_str(backend: str) -> None:
+    codec = load_codec(backend)
+    assert codec.name == backend
+    assert codec.loads(b'{"text": "h\xc3\xa9"}') == {"text": "hé"}
+    assert codec.loads('{"n": [1, 2.5, null]}') == {"n": [1, 2.5, None]}
+
+
+@pytest.mark.parametrize("data", [b"plain", b"{", b'"\xff"'])
+def test_loads_invalid_raises_value_error(backend: str, data: bytes) -> None:
+    with pytest.raises(ValueError):
+        load_codec(backend).loads(data)
+
+
+def test_dumps_matches_pydantic(backend: str) -> None:
+    chunk = ChatCompletionChunk(
+        id="chatcmpl-1",
+        created=1700000000,
+        model="pplx-70b-chat",
+        choices=[
+            ChatCompletionChunkChoice(
+                index=0, delta=ChatCompletionChunkDelta(content='héllo "wörld"\n')
+            )
+        ],
+    )
+    assert load_codec(backend).dumps(chunk.model_dump()) == chunk.model_dump_json().encode()
+
+
+def test_encode_chunk_matches_model() -> None:
+    chunk = ChatCompletionChunk(
+        id="chatcmpl-1",
+        created=1700000000,
+        model="pplx-70b-chat",
+        choices=[
+            ChatCompletionChunkChoice(
+                index=0, delta=ChatCompletionChunkDelta(), finish_reason="stop"
+            )
+        ],
+    )
+    frame = _encode_chunk("chatcmpl-1", 1700000000, "pplx-70b-chat", finish_reason="stop")
+    assert frame == f"data: {chunk.model_dump_json()}\n\n".encode()
+
+
+@pytest.mark.parametrize(
+    "text", ["Hello", "", 'héllo "wörld"\n', "tab\t\\ \x00\x1f \u2028 </script> 🚀"]
+)
+def test_chunk_encoder_matches_model(
+    backend: str, monkeypatch: pytest.MonkeyPatch, text: str
+) -> None:
+    monkeypatch.setattr(codec, "dumps", load_codec(backend).dumps)
+    chunk = ChatCompletionChunk(
+        id="chatcmpl-1",
+        created=1700000000,
+        model='my "model"',
+        choices=[ChatCompletionChunkChoice(index=0, delta=ChatCompletionChunkDelta(content=text))],
+    )
+    frame = _ChunkEncoder("chatcmpl-1", 1700000000, 'my "model"').content(text)
+    assert frame == f"data: {chunk.model_dump_json()}\n\n".encode()
+    assert frame == _encode_chunk("chatcmpl-1", 1700000000, 'my "model"', content=text)
+
+
+def test_backend_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PPLX_JSON_BACKEND", "json")
+    assert load_codec().name == "json"
+
+    monkeypatch.delenv("PPLX_JSON_BACKEND")
+    assert load_codec().name == available_backends()[0]
+    assert available_backends()[-1] == BACKENDS[-1]
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        load_codec("simdjson")
@@ -0,0 +1,158 @@
+"""Tests for per-stream timing and metrics sinks."""
+
+import asyncio
+import threading
+
+from pplx_sdk.api.metrics import Counter, Histogram, ServerMetrics
+from pplx_sdk.client import AsyncPerplexityClient, PerplexityClient
+from pplx_sdk.domain.cache import AnswerCache
+from pplx_sdk.shared.metrics import MemoryMetricsSink, MetricsSink, StreamTiming
+from pplx_sdk.shared.retry import RetryConfig
+from pplx_sdk.streaming.manager import AsyncStreamManager
+from pplx_sdk.testing import StandinConfig, StandinServer
+
+
+def test_entry_carries_stream_timing(mock_auth_token: str) -> None:
+    sink = MemoryMetricsSink()
+    assert isinstance(sink, MetricsSink)
+    server = StandinServer(StandinConfig(events=5, latency=0.02, interval=0.005))
+    with (
+        server.running() as url,
+        PerplexityClient(api_base=url, auth_token=mock_auth_token, metrics=sink) as client,
+    ):
+        entry = client.new_conversation().ask("What is AI?")
+
+    timing = entry.timing
+    assert timing is not None
+    assert list(sink.timings) == [timing]
+    assert timing.connect is not None
+    assert timing.headers is not None and timing.headers >= 0.02
+    assert timing.first_event["query_progress"] <= timing.first_event["answer_chunk"]
+    assert timing.ttft == timing.first_event["answer_chunk"]
+    assert timing.first_event["final_response"] <= (timing.total or 0)
+    assert (timing.events, timing.retries, timing.error) == (7, 0, None)
+    assert timing.gap_count == 6 and timing.max_gap >= 0.005
+    assert timing.bytes_received > 0
+    assert sink.percentile("ttft", 0.5) == timing.ttft
+    assert "timing" not in entry.model_dump()
+
+
+async def test_stream_manager_times_retries(mock_auth_token: str) -> None:
+    sink = MemoryMetricsSink()
+    server = StandinServer(StandinConfig(events=10, disconnect_after=4))
+    async with (
+        server,
+        AsyncPerplexityClient(api_base=server.url, auth_token=mock_auth_token) as client,
+    ):
+        manager = AsyncStreamManager(
+            client._sse_transport, max_retries=5, retry_backoff_ms=1, metrics=sink
+        )
+        types = [chunk.type async for chunk in manager.stream("q", "ctx", "f")]
+
+    (timing,) = sink.timings
+    assert types[-1] == "final_response"
+    assert timing.attempts == 3 and timing.retries == 2
+    # Gaps across a reconnect are left out
+    assert timing.gap_count == timing.events - timing.attempts
+    assert timing.total is not None and timing.error is None
+
+
+async def test_client_retries_are_counted_by_server_metrics(mock_auth_token: str) -> None:
+    metrics = ServerMetrics()
+    server = StandinServer(StandinConfig(events=10, disconnect_after=4))
+    async with (
+        server,
+        AsyncPerplexityClient(
+            api_base=server.url,
+            auth_token=mock_auth_token,
+            metrics=metrics,
+            retry_config=RetryConfig(initial_backoff_ms=1, jitter=False),
+        ) as client,
+    ):
+        entry = await client.new_conversation().ask("q")
+
+    assert entry.timing is not None and entry.timing.retries == 2
+    lines = metrics.render().splitlines()
+    assert "pplx_upstream_retries_total 2" in lines
+    assert 'pplx_upstream_streams_total{source="upstream"} 1' in lines
+
+
+def test_cache_hits_are_timed_as_cache(mock_auth_token: str) -> None:
+    sink = MemoryMetricsSink()
+    server = StandinServer(StandinConfig(events=3))
+    with (
+        server.running() as url,
+        PerplexityClient(
+            api_base=url, auth_token=mock_auth_token, answer_cache=AnswerCache(), metrics=sink
+        ) as client,
+    ):
+        client.new_conversation().ask("q")
+        cached = client.new_conversation().ask("q")
+
+    assert [t.source for t in sink.timings] == ["upstream", "cache"]
+    assert cached.timing is not None and cached.timing.attempts == 0
+    assert cached.timing.ttft is not None and cached.timing.headers is None
+
+
+async def test_coalesced_flight_is_timed_once_as_upstream(mock_auth_token: str) -> None:
+    sink = MemoryMetricsSink()
+    server = StandinServer(StandinConfig(events=3, latency=0.05))
+    async with (
+        server,
+        AsyncPerplexityClient(
+            api_base=server.url, auth_token=mock_auth_token, coalesce_requests=True, metrics=sink
+        ) as client,
+    ):
+        entries = await asyncio.gather(*(client.new_conversation().ask("q") for _ in range(3)))
+
+    assert sorted(t.source for t in sink.timings) == [
+        "coalesced",
+        "coalesced",
+        "leader",
+        "upstream",
+    ]
+    (upstream,) = [t for t in sink.timings if t.source == "upstream"]
+    assert upstream.attempts == 1 and upstream.bytes_received > 0
+    assert [e.timing.source for e in entries if e.timing] == ["leader", "coalesced", "coalesced"]
+    assert all(e.timing and e.timing.attempts == 0 for e in entries)
+
+
+def test_failed_stream_records_error() -> None:
+    timing = StreamTiming()
+    timing.finish(ConnectionError("boom"))
+    timing.finish()
+
+    assert timing.error == "ConnectionError"
+    assert timing.phase("total") == timing.total
+    assert timing.phase("search_results") is None
+
+
+def test_prometheus_histogram_sums_thread_shards() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    counter = Counter("hits_total", "Hits.", ("route",))
+
+    def work() -> None:
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, ("/a",))
+            counter.inc(("/a",))
+
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(('/"b"',), 2)
+
+    assert histogram.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 3',
+        'latency_seconds_bucket{route="/a",le="1"} 6',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 9',
+        'latency_seconds_sum{route="/a"} 16.65',
+        'latency_seconds_count{route="/a"} 9',
+    ]
+    assert counter.render().splitlines() == [
+        "# HELP hits_total Hits.",
+        "# TYPE hits_total counter",
+        'hits_total{route="/\\"b\\""} 2',
+        'hits_total{route="/a"} 9',
+    ]
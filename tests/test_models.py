@@ -6,6 +6,7 @@ from pplx_sdk.domain.models import (
     MessageChunk,
     Source,
     SourceType,
+    StreamChunk,
     StreamStatus,
     Thread,
     ThreadAccess,
@@ -104,6 +105,36 @@ def test_message_chunk_creation() -> None:
     assert chunk.reconnectable is True
 
 
+def test_stream_chunk_from_event() -> None:
+    """Test StreamChunk copies the common fields out of the payload."""
+    data = {
+        "text": "Hi",
+        "status": "pending",
+        "backend_uuid": "backend-uuid",
+        "context_uuid": "context-uuid",
+        "cursor": "cursor-123",
+    }
+    chunk = StreamChunk.from_event("answer_chunk", data)
+
+    assert chunk.type == "answer_chunk"
+    assert chunk.data is data
+    assert chunk.text == "Hi"
+    assert chunk.reconnectable is True
+    assert StreamChunk.from_event("answer_chunk", {}).reconnectable is False
+    assert chunk == StreamChunk.from_event("answer_chunk", dict(data))
+
+
+def test_stream_chunk_to_model() -> None:
+    """Test StreamChunk converts to an equivalent MessageChunk."""
+    chunk = StreamChunk(type="error", status="retrying", data={"error": "boom"})
+    model = chunk.to_model()
+
+    assert isinstance(model, MessageChunk)
+    assert model.model_dump() == chunk.model_dump()
+    assert chunk.model_dump(include={"type"}) == {"type": "error"}
+    assert repr(chunk).startswith("StreamChunk(type='error', status='retrying'")
+
+
 def test_stream_status_enum() -> None:
     """Test StreamStatus enum values."""
     assert StreamStatus.PENDING == "pending"
@@ -0,0 +1,82 @@
+"""Tests for the local Perplexity stand-in server."""
+
+import asyncio
+
+import pytest
+
+from pplx_sdk.client import AsyncPerplexityClient, PerplexityClient
+from pplx_sdk.core.exceptions import RateLimitError, TransportError
+from pplx_sdk.streaming.manager import StreamManager
+from pplx_sdk.testing import StandinConfig, StandinServer
+from pplx_sdk.transport.http import HttpTransport
+
+
+def test_standin_answers_and_serves_rest_endpoints(mock_auth_token: str) -> None:
+    server = StandinServer(StandinConfig(events=5, chunk_size=8))
+    with server.running() as url:
+        with PerplexityClient(api_base=url, auth_token=mock_auth_token) as client:
+            entry = client.new_conversation().ask("What is AI?")
+
+        with HttpTransport(base_url=url) as http:
+            threads = http.request("GET", "/rest/threads").json()
+            thread = http.request("GET", f"/rest/threads/{entry.context_uuid}").json()
+            liked = http.request("POST", f"/rest/entries/{entry.backend_uuid}/like").json()
+            created = http.request("POST", "/rest/collections", json={"name": "AI"})
+            collection_uuid = created.json()["uuid"]
+            http.request(
+                "POST",
+                f"/rest/collections/{collection_uuid}/threads",
+                json={"thread_uuid": entry.context_uuid},
+            )
+            collection = http.request("GET", f"/rest/collections/{collection_uuid}").json()
+            with pytest.raises(TransportError) as missing:
+                http.request("GET", "/rest/entries/nope")
+
+    assert len(entry.blocks[0].content) == 5 * 8
+    assert threads["total"] == 1 and not threads["has_more"]
+    assert thread["entries"][0]["uuid"] == entry.backend_uuid
+    assert liked == {"liked": True, "like_count": 1}
+    assert created.status_code == 201
+    assert collection["threads"][0]["uuid"] == entry.context_uuid
+    assert missing.value.status_code == 404
+
+
+def test_stream_manager_resumes_standin_disconnects(mock_auth_token: str) -> None:
+    config = StandinConfig(events=30, chunk_size=4, disconnect_after=7, resume_overlap=2)
+    server = StandinServer(config)
+    with (
+        server.running() as url,
+        PerplexityClient(api_base=url, auth_token=mock_auth_token) as client,
+    ):
+        manager = StreamManager(client._sse_transport, max_retries=10, retry_backoff_ms=1)
+        chunks = list(manager.stream("q", "ctx", "f"))
+
+    text = "".join(chunk.text or "" for chunk in chunks if chunk.type == "answer_chunk")
+    assert text == "".join(server._text(index) for index in range(30))
+    assert chunks[-1].type == "final_response"
+    assert server.stats.disconnects == 5
+    assert server.stats.resumed == 5
+
+
+def test_standin_rate_limits_with_retry_after() -> None:
+    server = StandinServer(StandinConfig(rate_limit_every=2, retry_after=7))
+    with server.running() as url, HttpTransport(base_url=url) as http:
+        http.request("GET", "/rest/collections")
+        with pytest.raises(RateLimitError) as limited:
+            http.request("GET", "/rest/collections")
+
+    assert limited.value.retry_after == 7
+    assert server.stats.rate_limited == 1
+
+
+async def test_async_client_streams_concurrently_from_standin(mock_auth_token: str) -> None:
+    config = StandinConfig(events=20, interval=0.001, jitter=0.002, seed=1)
+    async with StandinServer(config) as server:
+        async with AsyncPerplexityClient(api_base=server.url, auth_token=mock_auth_token) as client:
+            entries = await asyncio.gather(
+                *(client.new_conversation().ask(f"q{i}") for i in range(20))
+            )
+
+    assert len({entry.backend_uuid for entry in entries}) == 20
+    assert server.stats.streams == 20
+    assert len(server.store.threads) == 20
@@ -0,0 +1,766 @@
+"""Tests for SSE decoding and streaming utilities."""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock, IteratorStream
+
+from pplx_sdk.core.exceptions import SlowConsumerError, StreamingError, StreamTimeoutError
+from pplx_sdk.domain.models import StreamChunk
+from pplx_sdk.shared import codec
+from pplx_sdk.shared.retry import RetryConfig
+from pplx_sdk.streaming.broadcast import AsyncStreamBroadcast, StreamBroadcast
+from pplx_sdk.streaming.checkpoint import (
+    CheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+    StreamCheckpoint,
+)
+from pplx_sdk.streaming.coalesce import StreamCoalescer
+from pplx_sdk.streaming.deltas import DeltaCoalescing, acoalesce_deltas
+from pplx_sdk.streaming.manager import AsyncStreamManager, StreamManager
+from pplx_sdk.streaming.parser import (
+    aiter_sse_events,
+    iter_sse_events,
+    parse_sse_data,
+    parse_sse_line,
+)
+from pplx_sdk.transport.replay import ReplayTracker
+from pplx_sdk.transport.sse import AsyncSSETransport, SSETransport
+from pplx_sdk.transport.sse_decoder import SSEDecoder, SSEEvent
+from pplx_sdk.transport.timeouts import StreamTimeouts, stream_timeout_error
+
+
+def decode(chunks: list[bytes], end_marker: bytes | None = b"[end]") -> list[SSEEvent]:
+    return list(iter_sse_events(chunks, end_marker=end_marker))
+
+
+STREAM = (
+    b"event: query_progress\r\n"
+    b'data: {"status": "searching"}\r\n'
+    b"\r\n"
+    b": keep-alive\n"
+    b"id: 7\n"
+    b"event: answer_chunk\r"
+    b'data: {"text":\r'
+    b'data: "hi"}\r'
+    b"\r"
+    b"retry: 2500\n"
+    b"data\n"
+    b"\n"
+)
+
+
+def test_decoder_single_chunk() -> None:
+    decoder = SSEDecoder()
+    events = decoder.feed(STREAM)
+
+    assert events == [
+        SSEEvent(event="query_progress", data=b'{"status": "searching"}', id=""),
+        SSEEvent(event="answer_chunk", data=b'{"text":\n"hi"}', id="7"),
+        SSEEvent(event="message", data=b"", id="7"),
+    ]
+    assert decoder.retry == 2500
+    assert decoder.last_event_id == "7"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13])
+def test_decoder_arbitrary_chunk_boundaries(size: int) -> None:
+    chunks = [STREAM[i : i + size] for i in range(0, len(STREAM), size)]
+    assert decode(chunks) == SSEDecoder().feed(STREAM)
+
+
+LF_STREAM = (
+    b"event: answer_chunk\ndata: a\n\n"
+    b"event: answer_chunk\ndata: b\n\n"
+    b"event: \ndata: c\n\n"
+    b"data: d\n\n"
+    b"event: final_response\ndata:e\n\n"
+    b"\n"
+    b"id: 3\nevent: final_response\ndata: f\ndata: g\n\n"
+)
+
+
+@pytest.mark.parametrize("size", [1, 7, 16, 31, len(LF_STREAM)])
+def test_decoder_lf_fast_paths(size: int) -> None:
+    chunks = [LF_STREAM[i : i + size] for i in range(0, len(LF_STREAM), size)]
+    assert decode(chunks) == [
+        SSEEvent(event="answer_chunk", data=b"a"),
+        SSEEvent(event="answer_chunk", data=b"b"),
+        SSEEvent(event="message", data=b"c"),
+        SSEEvent(event="message", data=b"d"),
+        SSEEvent(event="final_response", data=b"e"),
+        SSEEvent(event="final_response", data=b"f\ng", id="3"),
+    ]
+
+
+def test_decoder_crlf_split_across_chunks() -> None:
+    events = decode([b"data: a\r", b"\ndata: b\r", b"\n\r", b"\n"])
+    assert events == [SSEEvent(event="message", data=b"a\nb")]
+
+
+def test_decoder_event_without_data_is_not_dispatched() -> None:
+    events = decode([b"event: answer_started\n\ndata: x\n\n"])
+    # The event type is reset by the empty dispatch
+    assert events == [SSEEvent(event="message", data=b"x")]
+
+
+def test_decoder_field_rules() -> None:
+    events = decode(
+        [
+            b"data:no-space\n",
+            b"data:  two-spaces\n",
+            b"id: bad\0id\n",
+            b"retry: 10s\n",
+            b"unknown: ignored\n",
+            b"\n",
+        ]
+    )
+    assert events == [SSEEvent(event="message", data=b"no-space\n two-spaces")]
+
+
+def test_decoder_strips_leading_bom() -> None:
+    events = decode([b"\xef\xbb", b"\xbfdata: x\n\n"])
+    assert events == [SSEEvent(event="message", data=b"x")]
+
+
+def test_decoder_end_marker_flushes_pending_event() -> None:
+    events = decode([b"event: final_response\ndata: {}\n: [end]\ndata: ignored\n\n"])
+    assert events == [SSEEvent(event="final_response", data=b"{}")]
+
+
+def test_decoder_without_end_marker() -> None:
+    events = decode([b": [end]\ndata: x\n\n"], end_marker=None)
+    assert events == [SSEEvent(event="message", data=b"x")]
+
+
+def test_decoder_flush_keeps_unterminated_event() -> None:
+    events = decode([b'event: final_response\ndata: {"ok": true}'])
+    assert events == [SSEEvent(event="final_response", data=b'{"ok": true}')]
+
+
+async def test_aiter_sse_events() -> None:
+    async def chunks():
+        for i in range(0, len(STREAM), 4):
+            yield STREAM[i : i + 4]
+
+    events = [event async for event in aiter_sse_events(chunks())]
+    assert events == SSEDecoder().feed(STREAM)
+
+
+def test_parse_sse_data_accepts_bytes() -> None:
+    assert parse_sse_data(b'{"text": "hi"}') == {"text": "hi"}
+    assert parse_sse_data(b"plain") == {"text": "plain"}
+    assert parse_sse_data("plain") == {"text": "plain"}
+
+
+def test_parse_sse_line() -> None:
+    assert parse_sse_line("event: answer_chunk") == ("event", "answer_chunk")
+    assert parse_sse_line(": [end]") == ("comment", "[end]")
+    assert parse_sse_line("") == (None, None)
+
+
+class FlakyTransport:
+    """Transport stand-in failing each attempt after one chunk."""
+
+    def __init__(self, errors: list[Exception]) -> None:
+        self.errors = errors
+        self.calls: list[dict[str, Any]] = []
+
+    def stream(self, **kwargs: Any) -> Iterator[StreamChunk]:
+        self.calls.append(kwargs)
+        attempt = len(self.calls)
+        yield StreamChunk(type="answer_chunk", text=f"part {attempt}", cursor=f"c{attempt}")
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+def test_stream_manager_retries_idle_timeout_within_deadline() -> None:
+    """Test idle timeouts reconnect, with the total deadline shared."""
+    transport = FlakyTransport([stream_timeout_error("idle", 0.5)])
+    manager = StreamManager(transport, retry_backoff_ms=1)  # type: ignore[arg-type]
+    timeouts = StreamTimeouts(total=60.0, idle=0.5)
+
+    chunks = list(manager.stream(query="q", context_uuid="c", frontend_uuid="f", timeouts=timeouts))
+
+    assert [chunk.type for chunk in chunks] == ["answer_chunk", "error", "answer_chunk"]
+    first, second = (call["timeouts"] for call in transport.calls)
+    assert first.idle == second.idle == 0.5
+    assert 59.0 < second.total < first.total <= 60.0
+    assert transport.calls[1]["cursor"] == "c1"
+
+
+def test_stream_manager_does_not_retry_total_deadline() -> None:
+    """Test the total deadline is final."""
+    transport = FlakyTransport([stream_timeout_error("total", 0.2)])
+    manager = StreamManager(transport, retry_backoff_ms=1)  # type: ignore[arg-type]
+
+    with pytest.raises(StreamTimeoutError) as exc_info:
+        list(
+            manager.stream_with_timeout(
+                query="q", context_uuid="c", frontend_uuid="f", timeout_ms=200
+            )
+        )
+
+    assert exc_info.value.kind == "total"
+    assert len(transport.calls) == 1
+    assert transport.calls[0]["timeouts"].total <= 0.2
+
+
+def test_stream_manager_backoff_respects_deadline() -> None:
+    """Test a backoff that would outlast the deadline ends the stream."""
+    transport = FlakyTransport([stream_timeout_error("idle", 0.1)])
+    manager = StreamManager(  # type: ignore[arg-type]
+        transport, retry_backoff_ms=5000, timeouts=StreamTimeouts(total=1.0, idle=0.1)
+    )
+
+    with pytest.raises(StreamTimeoutError, match="total deadline of 1s"):
+        list(manager.stream(query="q", context_uuid="c", frontend_uuid="f"))
+    assert len(transport.calls) == 1
+
+
+def test_stream_manager_uses_retry_config_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test reconnect delays follow RetryConfig, capped at max_backoff_ms."""
+    sleeps: list[float] = []
+    monkeypatch.setattr("pplx_sdk.streaming.manager.time.sleep", sleeps.append)
+    transport = FlakyTransport([ConnectionError("reset")] * 3)
+    config = RetryConfig(initial_backoff_ms=100, max_backoff_ms=300, jitter=False)
+    manager = StreamManager(transport, retry_config=config)  # type: ignore[arg-type]
+
+    chunks = list(manager.stream(query="q", context_uuid="c", frontend_uuid="f"))
+
+    assert sleeps == [0.1, 0.2, 0.3]
+    assert [chunk.data["backoff_seconds"] for chunk in chunks if chunk.type == "error"] == sleeps
+
+
+class AsyncFlakyTransport(FlakyTransport):
+    """Async transport stand-in failing each attempt after one chunk."""
+
+    async def stream(self, **kwargs: Any) -> AsyncIterator[StreamChunk]:  # type: ignore[override]
+        for chunk in super().stream(**kwargs):
+            yield chunk
+
+
+async def test_async_stream_manager_backs_off_without_blocking() -> None:
+    """Test the async manager reconnects with jittered, non-blocking sleeps."""
+    transport = AsyncFlakyTransport([ConnectionError("reset"), ConnectionError("reset")])
+    manager = AsyncStreamManager(transport, retry_backoff_ms=50)  # type: ignore[arg-type]
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    chunks = [
+        chunk async for chunk in manager.stream(query="q", context_uuid="c", frontend_uuid="f")
+    ]
+    task.cancel()
+
+    assert [chunk.text for chunk in chunks if chunk.type == "answer_chunk"] == [
+        "part 1",
+        "part 2",
+        "part 3",
+    ]
+    backoffs = [chunk.data["backoff_seconds"] for chunk in chunks if chunk.type == "error"]
+    assert 0.0375 <= backoffs[0] <= 0.0625
+    assert 0.075 <= backoffs[1] <= 0.125
+    assert ticks >= 10
+    assert [call["cursor"] for call in transport.calls] == [None, "c1", "c2"]
+
+
+async def test_async_stream_manager_gives_up_after_max_retries() -> None:
+    """Test the last error propagates once retries are exhausted."""
+    transport = AsyncFlakyTransport([ConnectionError("reset")] * 3)
+    manager = AsyncStreamManager(  # type: ignore[arg-type]
+        transport, retry_config=RetryConfig(max_retries=2, initial_backoff_ms=1)
+    )
+
+    with pytest.raises(ConnectionError):
+        async for _ in manager.stream_with_timeout(query="q", context_uuid="c", frontend_uuid="f"):
+            pass
+    assert len(transport.calls) == 3
+
+
+def test_sqlite_checkpoint_store_survives_reopen(tmp_path: Path) -> None:
+    """Test checkpoints persist in the SQLite file."""
+    path = tmp_path / "checkpoints.db"
+    store = SQLiteCheckpointStore(path)
+    checkpoint = StreamCheckpoint(
+        frontend_uuid="f-1",
+        request={"query": "q", "sources": ["web"]},
+        cursor="c7",
+        resume_entry_uuids=["b-1"],
+        events=7,
+    )
+    store.save(checkpoint)
+    store.close()
+
+    reopened = SQLiteCheckpointStore(path)
+    assert isinstance(reopened, CheckpointStore)
+    assert reopened.load("f-1") == checkpoint
+    reopened.delete("f-1")
+    assert reopened.load("f-1") is None
+    reopened.close()
+
+
+class ScriptedTransport:
+    """Transport stand-in streaming numbered chunks, optionally failing."""
+
+    def __init__(self, chunks: int, fail: bool) -> None:
+        self.chunks = chunks
+        self.fail = fail
+        self.calls: list[dict[str, Any]] = []
+
+    def stream(self, **kwargs: Any) -> Iterator[StreamChunk]:
+        self.calls.append(kwargs)
+        start = int((kwargs.get("cursor") or "c0")[1:])
+        for i in range(start + 1, start + self.chunks + 1):
+            yield StreamChunk(type="answer_chunk", text=f"t{i}", cursor=f"c{i}", backend_uuid="b-1")
+        if self.fail:
+            raise ConnectionError("process died")
+
+
+class RecordingStore(SQLiteCheckpointStore):
+    """SQLite store remembering the cursor of every save."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.saved_cursors: list[str | None] = []
+
+    def save(self, checkpoint: StreamCheckpoint) -> None:
+        self.saved_cursors.append(checkpoint.cursor)
+        super().save(checkpoint)
+
+
+def test_stream_manager_checkpoints_and_resumes_after_restart(tmp_path: Path) -> None:
+    """Test a failed stream is resumed from its checkpoint by a new manager."""
+    store = RecordingStore(tmp_path / "checkpoints.db")
+    transport = ScriptedTransport(chunks=5, fail=True)
+    manager = StreamManager(  # type: ignore[arg-type]
+        transport, max_retries=0, checkpoint_store=store, checkpoint_every=2
+    )
+
+    with pytest.raises(ConnectionError):
+        for _ in manager.stream(
+            query="q", context_uuid="ctx", frontend_uuid="f-1", events=frozenset({"answer_chunk"})
+        ):
+            pass
+
+    # Every second event, then once more when the stream failed
+    assert store.saved_cursors == ["c2", "c4", "c5"]
+    checkpoint = store.load("f-1")
+    assert checkpoint is not None
+    assert (checkpoint.cursor, checkpoint.events) == ("c5", 5)
+    assert checkpoint.request["events"] == ["answer_chunk"]
+
+    # A new process resumes without the original arguments
+    resumed = ScriptedTransport(chunks=2, fail=False)
+    restarted = StreamManager(resumed, checkpoint_store=store)  # type: ignore[arg-type]
+    texts = [chunk.text for chunk in restarted.resume("f-1")]
+
+    assert texts == ["t6", "t7"]
+    call = resumed.calls[0]
+    assert (call["query"], call["context_uuid"], call["cursor"]) == ("q", "ctx", "c5")
+    assert call["resume_entry_uuids"] == ["b-1"]
+    assert store.load("f-1") is None
+
+
+def test_stream_manager_resume_without_checkpoint() -> None:
+    """Test resuming an unknown stream fails clearly."""
+    manager = StreamManager(  # type: ignore[arg-type]
+        ScriptedTransport(1, False), checkpoint_store=MemoryCheckpointStore()
+    )
+
+    with pytest.raises(StreamingError, match="No checkpoint for stream f-9"):
+        list(manager.resume("f-9"))
+
+
+async def test_async_stream_manager_checkpoints_on_interval() -> None:
+    """Test the time threshold saves checkpoints between event thresholds."""
+    store = MemoryCheckpointStore()
+    transport = AsyncFlakyTransport([ConnectionError("reset")])
+    manager = AsyncStreamManager(  # type: ignore[arg-type]
+        transport,
+        max_retries=0,
+        checkpoint_store=store,
+        checkpoint_every=1000,
+        checkpoint_interval_ms=0,
+    )
+
+    with pytest.raises(ConnectionError):
+        async for _ in manager.stream(query="q", context_uuid="c", frontend_uuid="f-2"):
+            pass
+
+    checkpoint = store.load("f-2")
+    assert checkpoint is not None
+    assert checkpoint.cursor == "c1"
+
+    resumed = [chunk.text async for chunk in manager.resume("f-2")]
+    assert resumed == ["part 2"]
+    assert transport.calls[1]["cursor"] == "c1"
+    assert store.load("f-2") is None
+
+
+class ThreadRecordingStore(MemoryCheckpointStore):
+    """Memory store that records which thread each call runs on."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads: list[int] = []
+
+    def save(self, checkpoint: StreamCheckpoint) -> None:
+        self.threads.append(threading.get_ident())
+        super().save(checkpoint)
+
+    def load(self, frontend_uuid: str) -> StreamCheckpoint | None:
+        self.threads.append(threading.get_ident())
+        return super().load(frontend_uuid)
+
+    def delete(self, frontend_uuid: str) -> None:
+        self.threads.append(threading.get_ident())
+        super().delete(frontend_uuid)
+
+
+async def test_async_stream_manager_store_calls_leave_the_event_loop() -> None:
+    """Test checkpoint saves, loads and deletes run in worker threads."""
+    store = ThreadRecordingStore()
+    transport = AsyncFlakyTransport([ConnectionError("reset")])
+    manager = AsyncStreamManager(  # type: ignore[arg-type]
+        transport,
+        max_retries=0,
+        checkpoint_store=store,
+        checkpoint_every=1,
+    )
+
+    with pytest.raises(ConnectionError):
+        async for _ in manager.stream(query="q", context_uuid="c", frontend_uuid="f-3"):
+            pass
+    assert [chunk.text async for chunk in manager.resume("f-3")] == ["part 2"]
+
+    assert len(store.threads) >= 3
+    assert threading.get_ident() not in store.threads
+
+
+def answer_events(first: int, last: int) -> list[bytes]:
+    """SSE frames for answer chunks ``first``..``last`` with cursors."""
+    return [
+        f'event: answer_chunk\ndata: {{"text": "t{i}", "cursor": "c{i}"}}\n\n'.encode()
+        for i in range(first, last + 1)
+    ]
+
+
+def dropped_after(frames: list[bytes]) -> Iterator[bytes]:
+    """Serve frames, then fail like a dropped connection."""
+    yield from frames
+    raise httpx.ReadError("connection reset")
+
+
+@pytest.mark.parametrize(
+    ("second_attempt", "replayed"),
+    [(answer_events(1, 5), 3), (answer_events(4, 5), 0)],
+    ids=["server-replays", "server-continues"],
+)
+def test_reconnect_skips_replayed_events(
+    httpx_mock: HTTPXMock,
+    monkeypatch: pytest.MonkeyPatch,
+    second_attempt: list[bytes],
+    replayed: int,
+) -> None:
+    """Test a reconnect yields only the missing tail, after a resumed marker."""
+    url = "https://example.test/sse"
+    httpx_mock.add_response(
+        url=url, method="POST", stream=IteratorStream(dropped_after(answer_events(1, 3)))
+    )
+    httpx_mock.add_response(url=url, method="POST", content=b"".join(second_attempt))
+    decoded: list[bytes | str] = []
+    loads = codec.loads
+
+    def counting_loads(data: bytes | str) -> Any:
+        decoded.append(data)
+        return loads(data)
+
+    monkeypatch.setattr(codec, "loads", counting_loads)
+
+    with httpx.Client() as client:
+        manager = StreamManager(SSETransport(client, url), retry_backoff_ms=1)
+        chunks = list(manager.stream(query="q", context_uuid="ctx", frontend_uuid="f"))
+
+    assert [chunk.type for chunk in chunks] == ["answer_chunk"] * 3 + [
+        "error",
+        "resumed",
+        "answer_chunk",
+        "answer_chunk",
+    ]
+    assert [chunk.text for chunk in chunks if chunk.type == "answer_chunk"] == [
+        "t1",
+        "t2",
+        "t3",
+        "t4",
+        "t5",
+    ]
+    marker = chunks[4]
+    assert marker.data == {"message": "resumed at offset 3", "offset": 3, "replayed": replayed}
+    # Replayed events never reach the JSON decoder
+    assert len(decoded) == 5
+    assert httpx_mock.get_requests()[1].read().count(b'"cursor":"c3"') == 1
+    # The events carry no SSE id, so there is no Last-Event-ID to send
+    assert "Last-Event-ID" not in httpx_mock.get_requests()[1].headers
+
+
+async def test_async_replay_tracker_sends_last_event_id(httpx_mock: HTTPXMock) -> None:
+    """Test the last SSE id is sent on reconnect and replays are dropped."""
+    url = "https://example.test/sse"
+    frames = [b"id: 1\ndata: one\n\n", b"id: 2\ndata: two\n\n", b"id: 3\ndata: three\n\n"]
+    httpx_mock.add_response(url=url, method="POST", content=b"".join(frames[:2]))
+    httpx_mock.add_response(url=url, method="POST", content=b"".join(frames))
+    tracker = ReplayTracker()
+
+    async with httpx.AsyncClient() as client:
+        transport = AsyncSSETransport(client, url)
+        first = [c.text async for c in transport.stream("q", "ctx", "f", replay=tracker)]
+        second = [
+            c.type async for c in transport.stream("q", "ctx", "f", cursor="c", replay=tracker)
+        ]
+
+    assert first == ["one", "two"]
+    assert second == ["resumed", "message"]
+    assert tracker.offset == 3
+    assert httpx_mock.get_requests()[1].headers["Last-Event-ID"] == "2"
+
+
+def accepted(tracker: ReplayTracker, events: Iterable[tuple[str, str]]) -> list[bool]:
+    """Run one attempt of (data, id) events through a tracker."""
+    tracker.begin()
+    return [tracker.accept(SSEEvent("message", data.encode(), id)) for data, id in events]
+
+
+def test_replay_tracker_keeps_new_events_repeating_old_payloads() -> None:
+    tracker = ReplayTracker()
+    accepted(tracker, [("Hello", ""), (",", ""), (" world", "")])
+
+    assert accepted(tracker, [(",", ""), (" world", "")]) == [True, True]
+    assert accepted(tracker, [("Hello", ""), (",", ""), ("!", "")]) == [False, False, True]
+    assert tracker.last_event_id is None
+
+
+def test_replay_tracker_aligns_on_event_ids() -> None:
+    tracker = ReplayTracker()
+    accepted(tracker, [("A", "1"), ("B", "2"), ("A", "3"), ("C", "4")])
+
+    assert accepted(tracker, [("A", "3"), ("C", "4"), ("D", "5")]) == [False, False, True]
+    # An unknown id is new, whatever its payload
+    assert accepted(tracker, [("A", "6"), ("B", "7")]) == [True, True]
+    assert tracker.last_event_id == "7"
+
+
+def texts(chunks: Iterable[StreamChunk]) -> list[str | None]:
+    return [chunk.text for chunk in chunks]
+
+
+async def answer(n: int, fail: bool = False) -> AsyncIterator[StreamChunk]:
+    for i in range(n):
+        yield StreamChunk(type="answer_chunk", text=f"t{i}")
+        await asyncio.sleep(0)
+    if fail:
+        raise StreamingError("upstream dropped")
+
+
+async def test_async_broadcast_replays_to_late_joiners() -> None:
+    """Test every subscriber sees the whole stream and late joiners replay it."""
+    broadcast = AsyncStreamBroadcast(answer(4))
+    first, second = broadcast.subscribe(), broadcast.subscribe()
+
+    assert texts([chunk async for chunk in first]) == ["t0", "t1", "t2", "t3"]
+    assert texts([chunk async for chunk in second]) == ["t0", "t1", "t2", "t3"]
+    assert texts([chunk async for chunk in broadcast.subscribe()]) == ["t0", "t1", "t2", "t3"]
+    assert [chunk async for chunk in broadcast.subscribe(replay=False)] == []
+
+
+async def test_async_broadcast_block_policy_holds_upstream() -> None:
+    """Test a full subscriber holds the upstream until it reads."""
+    broadcast = AsyncStreamBroadcast(answer(5), max_queue=2)
+    fast, slow = broadcast.subscribe(), broadcast.subscribe()
+
+    assert (await anext(fast)).text == "t0"
+    assert (await anext(fast)).text == "t1"
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(anext(fast), 0.05)
+    assert len(broadcast.history) == 2
+
+    assert texts([chunk async for chunk in slow]) == ["t0", "t1", "t2", "t3", "t4"]
+
+
+async def test_async_broadcast_drop_and_disconnect_policies() -> None:
+    """Test slow subscribers lose their oldest chunks or are disconnected."""
+    dropping = AsyncStreamBroadcast(answer(5), max_queue=2, policy="drop")
+    fast, slow = dropping.subscribe(), dropping.subscribe()
+    assert len([chunk async for chunk in fast]) == 5
+    assert dropping.subscribers[0].dropped == 3
+    assert texts([chunk async for chunk in slow]) == ["t3", "t4"]
+
+    disconnecting = AsyncStreamBroadcast(answer(5), max_queue=2, policy="disconnect")
+    fast, slow = disconnecting.subscribe(), disconnecting.subscribe()
+    assert len([chunk async for chunk in fast]) == 5
+    with pytest.raises(SlowConsumerError) as exc_info:
+        await anext(slow)
+    assert exc_info.value.max_queue == 2
+
+
+async def test_async_broadcast_raises_upstream_error_after_chunks() -> None:
+    """Test an upstream error reaches subscribers after the preceding chunks."""
+    async with AsyncStreamBroadcast(answer(2, fail=True)) as broadcast:
+        received: list[StreamChunk] = []
+        with pytest.raises(StreamingError, match="upstream dropped"):
+            async for chunk in broadcast.subscribe():
+                received.append(chunk)
+
+    assert texts(received) == ["t0", "t1"]
+
+
+async def test_async_broadcast_trims_history_past_max_history() -> None:
+    """Test history keeps unread chunks and late joiners replay the newest."""
+    broadcast = AsyncStreamBroadcast(answer(6), max_history=2)
+    fast, slow = broadcast.subscribe(), broadcast.subscribe()
+
+    assert texts([chunk async for chunk in fast]) == ["t0", "t1", "t2", "t3", "t4", "t5"]
+    # The slow subscriber still needs every chunk
+    assert broadcast.trimmed == 0
+    assert texts([await anext(slow) for _ in range(3)]) == ["t0", "t1", "t2"]
+    await slow.aclose()
+
+    late = broadcast.subscribe()
+    assert texts([chunk async for chunk in late]) == ["t4", "t5"]
+    assert broadcast.subscribers == []
+
+    trimming = AsyncStreamBroadcast(answer(6), max_history=2)
+    assert len([chunk async for chunk in trimming.subscribe()]) == 6
+    assert texts(trimming.history) == ["t4", "t5"]
+    assert trimming.trimmed == 4
+
+    with pytest.raises(ValueError, match="max_history"):
+        AsyncStreamBroadcast(answer(1), max_history=-1)
+
+
+def test_stream_broadcast_feeds_subscriber_threads() -> None:
+    """Test a sync upstream fans out to consumers in several threads."""
+    source = (StreamChunk(type="answer_chunk", text=f"t{i}") for i in range(50))
+    results: dict[str, list[str | None]] = {}
+
+    def consume(name: str, subscription: Iterator[StreamChunk]) -> None:
+        results[name] = texts(subscription)
+
+    with StreamBroadcast(source, max_queue=1) as broadcast:
+        threads = [
+            threading.Thread(target=consume, args=(name, broadcast.subscribe()))
+            for name in ("a", "b", "c")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    expected = [f"t{i}" for i in range(50)]
+    assert results == {"a": expected, "b": expected, "c": expected}
+
+
+def test_stream_coalescer_shares_and_stops_upstream() -> None:
+    """Test concurrent callers share one upstream, which stops when all leave."""
+    release = threading.Event()
+    opened: list[int] = []
+    closed: list[int] = []
+
+    def open_stream() -> Iterator[StreamChunk]:
+        opened.append(1)
+        try:
+            for i in range(100):
+                release.wait(timeout=5)
+                yield StreamChunk(type="answer_chunk", text=f"t{i}")
+        finally:
+            closed.append(1)
+
+    coalescer = StreamCoalescer(max_queue=4)
+    first, second = coalescer.stream("q", open_stream), coalescer.stream("q", open_stream)
+    # Generators start on the first read; read in a thread until released
+    results: list[StreamChunk] = []
+
+    def read_first() -> None:
+        results.append(next(first))
+
+    reader = threading.Thread(target=read_first)
+    reader.start()
+    while coalescer.in_flight == 0:
+        time.sleep(0.001)
+    release.set()
+    reader.join(timeout=5)
+
+    assert texts([next(second), next(second)]) == ["t0", "t1"]
+    assert coalescer.coalesced == 1
+    first.close()
+    second.close()
+
+    assert coalescer.in_flight == 0
+    for _ in range(500):
+        if closed:
+            break
+        time.sleep(0.01)
+    assert opened == [1] and closed == [1]
+    assert texts(results) == ["t0"]
+
+
+async def test_coalesce_deltas_flushes_first_then_on_delay() -> None:
+    async def texts() -> AsyncIterator[str]:
+        for text in "abcd":
+            yield text
+        await asyncio.sleep(0.05)
+        yield "e"
+        yield "f"
+
+    coalescing = DeltaCoalescing(max_delay=0.01)
+    assert [t async for t in acoalesce_deltas(texts(), coalescing)] == ["a", "bcd", "ef"]
+
+
+async def test_coalesce_deltas_bounded_by_bytes() -> None:
+    async def texts() -> AsyncIterator[str]:
+        for text in ["ab", "c", "é", "fg", "h"]:
+            yield text
+
+    coalescing = DeltaCoalescing(max_delay=10, max_bytes=4, flush_first=False)
+    assert [t async for t in acoalesce_deltas(texts(), coalescing)] == ["abcé", "fgh"]
+    disabled = DeltaCoalescing(enabled=False)
+    assert [t async for t in acoalesce_deltas(texts(), disabled)] == ["ab", "c", "é", "fg", "h"]
+
+
+async def test_coalesce_deltas_close_cancels_pending_read() -> None:
+    closed = asyncio.Event()
+
+    async def texts() -> AsyncIterator[str]:
+        try:
+            yield "a"
+            yield "b"
+            await asyncio.Event().wait()
+        finally:
+            closed.set()
+
+    merged = acoalesce_deltas(texts(), DeltaCoalescing(max_delay=0.01))
+    # "b" is sent once its delay passes, while the next read is still pending
+    assert [await anext(merged), await anext(merged)] == ["a", "b"]
+    await merged.aclose()
+    assert closed.is_set()
+
+
+def test_delta_coalescing_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert DeltaCoalescing.from_env() == DeltaCoalescing(enabled=False)
+
+    monkeypatch.setenv("PPLX_COALESCE_DELTAS", "1")
+    monkeypatch.setenv("PPLX_COALESCE_DELTAS_MAX_DELAY", "0.05")
+    monkeypatch.setenv("PPLX_COALESCE_DELTAS_FLUSH_FIRST", "false")
+    assert DeltaCoalescing.from_env() == DeltaCoalescing(max_delay=0.05, flush_first=False)
@@ -1,14 +1,30 @@
 """Tests for transport layer (HTTP and SSE)."""
 
+import asyncio
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
+from pplx_sdk.client import AsyncPerplexityClient, PerplexityClient
 from pplx_sdk.core.exceptions import (
     AuthenticationError,
     RateLimitError,
+    StreamTimeoutError,
     TransportError,
 )
+from pplx_sdk.testing.cassette import Cassette, CassetteError, CassettePlayer, CassetteRecorder
+from pplx_sdk.transport.config import TransportConfig
 from pplx_sdk.transport.http import HttpTransport
+from pplx_sdk.transport.pool import AsyncInstrumentedTransport, InstrumentedTransport, pool_stats
+from pplx_sdk.transport.sse import AsyncSSETransport, SSETransport, event_filter
+from pplx_sdk.transport.timeouts import StreamTimeouts
+
+# Pool tests talk to a real local server instead of the httpx mock
+real_network = pytest.mark.httpx_mock(should_mock=lambda request: False)
 
 
 def test_http_transport_initialization(mock_auth_token: str) -> None:
@@ -128,3 +144,258 @@ def test_http_transport_server_error(httpx_mock: HTTPXMock, mock_auth_token: str
         with pytest.raises(TransportError) as exc_info:
             transport.request("GET", "/api/test")
         assert exc_info.value.status_code == 500
+
+
+def test_transport_config_timeouts_and_limits() -> None:
+    """Test per-phase timeouts inherit the overall timeout."""
+    config = TransportConfig(max_connections=5, pool_timeout=1.5)
+
+    timeout = config.timeouts(30.0)
+    assert (timeout.connect, timeout.read, timeout.pool) == (30.0, 30.0, 1.5)
+    assert config.limits().max_connections == 5
+
+
+def test_transport_config_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test config is read from PPLX_* environment variables."""
+    monkeypatch.setenv("PPLX_MAX_CONNECTIONS", "250")
+    monkeypatch.setenv("PPLX_READ_TIMEOUT", "90")
+
+    config = TransportConfig.from_env()
+    assert config.max_connections == 250
+    assert config.read_timeout == 90.0
+    assert config.max_keepalive_connections == 20
+
+
+@real_network
+def test_pool_stats_track_connections(local_url: str) -> None:
+    """Test pool stats report open and idle connections."""
+    with TransportConfig().create_client(base_url=local_url) as client:
+        assert client.get("/").text == "ok"
+        client.get("/")
+
+        stats = pool_stats(client)
+        assert stats is not None
+        assert (stats.connections, stats.idle, stats.in_use) == (1, 1, 0)
+        assert (stats.requests, stats.waiting) == (2, 0)
+        assert stats.pool_wait_max >= stats.pool_wait_avg >= 0.0
+
+
+@real_network
+def test_pool_stats_count_pool_timeouts(local_url: str) -> None:
+    """Test an exhausted pool shows up as in use and as pool timeouts."""
+    config = TransportConfig(max_connections=1, pool_timeout=0.05)
+    with config.create_client(base_url=local_url) as client:
+        with client.stream("GET", "/"):
+            with pytest.raises(httpx.PoolTimeout):
+                client.get("/")
+
+            stats = pool_stats(client)
+            assert stats is not None
+            assert (stats.in_use, stats.pool_timeouts) == (1, 1)
+            assert stats.pool_wait_max >= 0.05
+
+
+def test_transport_config_keeps_environment_proxies(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test configured clients route through env proxies like plain httpx."""
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.test:3128")
+    monkeypatch.setenv("NO_PROXY", "internal.test")
+    monkeypatch.delenv("HTTP_PROXY", raising=False)
+    monkeypatch.delenv("ALL_PROXY", raising=False)
+
+    plain = httpx.Client()
+    sync_client = TransportConfig().create_client()
+    async_client = TransportConfig().create_async_client()
+    for client in (sync_client, async_client):
+        assert [p.pattern for p in client._mounts] == [p.pattern for p in plain._mounts]
+        proxy = client._transport_for_url(httpx.URL("https://www.perplexity.ai/"))
+        assert isinstance(proxy, InstrumentedTransport | AsyncInstrumentedTransport)
+        assert proxy is not client._transport
+        assert client._transport_for_url(httpx.URL("https://internal.test/")) is client._transport
+        stats = pool_stats(client)
+        assert stats is not None and stats.connections == 0
+
+    plain.close()
+    sync_client.close()
+    asyncio.run(async_client.aclose())
+
+
+def test_http_transport_pool_stats(mock_auth_token: str) -> None:
+    """Test HttpTransport exposes pool stats while open."""
+    transport = HttpTransport(auth_token=mock_auth_token, config=TransportConfig())
+    assert transport.pool_stats() is None
+
+    with transport:
+        stats = transport.pool_stats()
+        assert stats is not None
+        assert stats.connections == 0
+
+
+def test_stream_timeouts_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test stream limits are read from the environment."""
+    monkeypatch.setenv("PPLX_STREAM_TOTAL", "120")
+    monkeypatch.setenv("PPLX_STREAM_IDLE", "15.5")
+
+    timeouts = StreamTimeouts.from_env()
+    assert timeouts == StreamTimeouts(total=120.0, idle=15.5)
+    assert timeouts.enabled
+    assert not StreamTimeouts().enabled
+
+
+def _sse_stream(
+    base_url: str, path: str, timeouts: StreamTimeouts, texts: list[str], **kwargs: object
+) -> None:
+    """Consume a stream from the slow SSE server, collecting chunk texts."""
+    with TransportConfig().create_client(base_url=base_url, **kwargs) as client:
+        transport = SSETransport(client, path)
+        try:
+            for chunk in transport.stream(
+                query="q", context_uuid="c", frontend_uuid="f", timeouts=timeouts
+            ):
+                texts.append(chunk.text or "")
+        finally:
+            stats = pool_stats(client)
+            assert stats is not None
+            assert stats.in_use == 0
+
+
+@real_network
+def test_idle_timeout_interrupts_stalled_stream(slow_sse_url: str) -> None:
+    """Test a silent upstream is cut off after the idle timeout."""
+    texts: list[str] = []
+    start = time.monotonic()
+    with pytest.raises(StreamTimeoutError) as exc_info:
+        _sse_stream(slow_sse_url, "/stall", StreamTimeouts(idle=0.2), texts)
+
+    assert exc_info.value.kind == "idle"
+    assert isinstance(exc_info.value, TimeoutError)
+    assert time.monotonic() - start < 1.0
+    assert texts == ["Hi"]
+
+
+@real_network
+def test_total_deadline_cuts_off_trickling_stream(slow_sse_url: str) -> None:
+    """Test keep-alive traffic does not extend the total deadline."""
+    start = time.monotonic()
+    with pytest.raises(StreamTimeoutError) as exc_info:
+        _sse_stream(slow_sse_url, "/trickle", StreamTimeouts(total=0.3, idle=0.2), [])
+
+    assert exc_info.value.kind == "total"
+    assert str(exc_info.value) == "Stream exceeded total deadline of 0.3s"
+    assert 0.3 <= time.monotonic() - start < 1.0
+
+
+@real_network
+def test_first_byte_timeout(slow_sse_url: str) -> None:
+    """Test a response that never starts is cut off after first_byte."""
+    start = time.monotonic()
+    with pytest.raises(StreamTimeoutError) as exc_info:
+        _sse_stream(slow_sse_url, "/slow-start", StreamTimeouts(first_byte=0.2, idle=5.0), [])
+
+    assert exc_info.value.kind == "first_byte"
+    assert time.monotonic() - start < 1.0
+
+
+@real_network
+def test_client_read_timeout_is_not_a_stream_timeout(slow_sse_url: str) -> None:
+    """Test a shorter client read timeout surfaces as the httpx error."""
+    with pytest.raises(httpx.ReadTimeout):
+        _sse_stream(slow_sse_url, "/stall", StreamTimeouts(idle=5.0), [], timeout=0.1)
+
+
+@real_network
+async def test_async_stream_timeouts(slow_sse_url: str) -> None:
+    """Test the async transport enforces idle and total limits per read."""
+    async with TransportConfig().create_async_client(base_url=slow_sse_url) as client:
+        for path, timeouts, kind in [
+            ("/stall", StreamTimeouts(idle=0.2), "idle"),
+            ("/trickle", StreamTimeouts(total=0.3, idle=0.2), "total"),
+            ("/slow-start", StreamTimeouts(first_byte=0.2), "first_byte"),
+        ]:
+            transport = AsyncSSETransport(client, path)
+            texts = []
+            start = time.monotonic()
+            with pytest.raises(StreamTimeoutError) as exc_info:
+                async for chunk in transport.stream(
+                    query="q", context_uuid="c", frontend_uuid="f", timeouts=timeouts
+                ):
+                    texts.append(chunk.text)
+
+            assert exc_info.value.kind == kind
+            assert time.monotonic() - start < 1.0
+            assert texts == ([] if kind == "first_byte" else ["Hi"])
+
+        stats = pool_stats(client)
+        assert stats is not None
+        assert stats.in_use == 0
+
+
+def _paced_upstream(request: httpx.Request) -> httpx.Response:
+    """Upstream answering with three SSE frames 20 ms apart."""
+
+    def body() -> Iterator[bytes]:
+        yield b'event: answer_chunk\ndata: {"text": "Hel'
+        time.sleep(0.02)
+        yield b'lo"}\n\nevent: answer_chunk\ndata: {"text": " world"}\n\n'
+        time.sleep(0.02)
+        yield b'event: final_response\ndata: {"backend_uuid": "b-1", "blocks": []}\n\n'
+
+    return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=body())
+
+
+async def test_cassette_records_and_replays_sse(tmp_path: Path, mock_auth_token: str) -> None:
+    """Test a recorded stream replays offline, paced or as fast as possible."""
+    cassette = Cassette()
+    recorder = CassetteRecorder(cassette, transport=httpx.MockTransport(_paced_upstream))
+    with httpx.Client(transport=recorder) as http:
+        client = PerplexityClient(auth_token=mock_auth_token, http_client=http)
+        recorded = client.new_conversation().ask("hi")
+
+    cassette.save(tmp_path / "ask.cassette")
+    loaded = Cassette.load(tmp_path / "ask.cassette")
+    [interaction] = loaded.interactions
+    assert interaction.method == "POST"
+    assert interaction.url.endswith("/rest/sse/perplexity.ask")
+    assert [data for _, data in interaction.chunks] == [
+        data for _, data in cassette.interactions[0].chunks
+    ]
+    assert interaction.chunks[1][0] >= 0.015
+
+    player = CassettePlayer(loaded, speed=1.0, loop=True)
+    with httpx.Client(transport=httpx.MockTransport(player)) as http:
+        client = PerplexityClient(auth_token=mock_auth_token, http_client=http)
+        start = time.perf_counter()
+        paced = client.new_conversation().ask("hi")
+        assert time.perf_counter() - start >= 0.035
+
+    player.speed = None
+    async with httpx.AsyncClient(transport=httpx.MockTransport(player)) as http:
+        async_client = AsyncPerplexityClient(auth_token=mock_auth_token, http_client=http)
+        start = time.perf_counter()
+        fast = await async_client.new_conversation().ask("hi")
+        assert time.perf_counter() - start < 0.035
+
+    assert recorded.blocks == paced.blocks == fast.blocks
+    assert fast.blocks[0].content == "Hello world"
+    assert player.played == 2
+
+    with pytest.raises(CassetteError):
+        CassettePlayer(loaded)(httpx.Request("GET", "https://www.perplexity.ai/other"))
+
+
+def test_event_filter_predicates() -> None:
+    """Test event_filter keeps, excludes, or passes everything through."""
+    assert event_filter(None, None) is None
+    assert event_filter(None, ()) is None
+
+    keep = event_filter(["answer_chunk", "final_response"], ["final_response"])
+    assert keep is not None
+    assert keep("answer_chunk")
+    assert not keep("final_response")
+    assert not keep("sources")
+
+    drop = event_filter(None, ["sources"])
+    assert drop is not None
+    assert drop("answer_chunk")
+    assert not drop("sources")